@@ -1,60 +1,64 @@
 #!/usr/bin/env bash
-# Build: copy banner ads to public, inject Chatwoot and ad banners into target HTML.
+# Build: build pages, inject Chatwoot and ad banners into target HTML, sync referenced assets into public.
 # Run from repo root. Ensure public/ exists (e.g. extract new template into public/ first).
+# Builders are incremental (manifests in .build/); pass --force to rebuild every page.
+# --jobs N (or -j N) renders pages in N worker processes; 0 means one per CPU core.
+# --profile prints per-stage time, CPU, files and memory and writes .build/build-trace.json;
+# --cprofile also writes a cProfile dump per stage to .build/profile/.
 set -e
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 cd "$SCRIPT_DIR"
-mkdir -p public
-# Copy banner ads from source to public
-mkdir -p public/banner-ads
-cp -r source/banner_ads/* public/banner-ads/ 2>/dev/null || true
-# Copy favicon if present
-if [ -f source/favicon.png ]; then cp source/favicon.png public/favicon.png; fi
-# Copy content scaffold from source to public (pictures, videos only; articles are built from md)
-mkdir -p public/articles public/pictures public/videos
-cp -r source/pictures/* public/pictures/ 2>/dev/null || true
-cp -r source/videos/* public/videos/ 2>/dev/null || true
-# Build glossary from 100-term markdown and 10 new articles from numbered markdown (no dates)
-python3 scripts/build_glossary.py
-python3 scripts/build_articles.py
-python3 integrations/chatwoot/add_chatwoot.py
-python3 integrations/add_ad_banners.py
-# Clean URLs: move .html pages into path/index.html so URLs are /faq/, /articles/slug/, etc.
-# Only copy when the source is real content (not a redirect stub), so we never overwrite with a stub.
-is_redirect_stub() { [ -f "$1" ] && [ "$(wc -c < "$1")" -lt 600 ] && grep -q 'content="0;url=' "$1" 2>/dev/null; }
-mkdir -p public/faq public/glossary
-for page in faq glossary; do
-  if [ -f "public/${page}.html" ] && ! is_redirect_stub "public/${page}.html"; then
-    cp "public/${page}.html" "public/${page}/index.html" && rm "public/${page}.html"
-  fi
+BUILD_ARGS=()
+PROFILE=()
+while [ $# -gt 0 ]; do
+  case "$1" in
+    --force) BUILD_ARGS+=(--force) ;;
+    --jobs|-j) BUILD_ARGS+=(--jobs "$2"); shift ;;
+    --jobs=*) BUILD_ARGS+=(--jobs "${1#--jobs=}") ;;
+    --profile) [ ${#PROFILE[@]} -gt 0 ] || PROFILE=(run) ;;
+    --cprofile) PROFILE=(run --cprofile) ;;
+    *) echo "Unknown option: $1" >&2; exit 1 ;;
+  esac
+  shift
 done
-ARTICLE_SLUGS="why-use-vpn secure-browsing-tips vpn-for-streaming vpn-for-travel vpn-vs-proxy vpn-privacy-101 vpn-on-ios vpn-on-android vpn-for-movie-streaming vpn-for-steam-and-pc-gaming vpn-for-video-games-consoles-mobile vpn-for-corporate-work vpns-for-traders vpn-for-web3 advanced-vpn-privacy-and-protocols"
-for slug in $ARTICLE_SLUGS; do
-  if [ -f "public/articles/${slug}.html" ] && ! is_redirect_stub "public/articles/${slug}.html"; then
-    mkdir -p "public/articles/${slug}"
-    cp "public/articles/${slug}.html" "public/articles/${slug}/index.html" && rm "public/articles/${slug}.html"
+# stage NAME SCRIPT [ARGS...]: run a Python build stage, recorded by scripts/build_trace.py with --profile
+stage() {
+  local name="$1"; shift
+  if [ ${#PROFILE[@]} -gt 0 ]; then
+    python3 scripts/build_trace.py "${PROFILE[@]}" "$name" "$@"
+  else
+    python3 "$@"
   fi
-done
-# Redirect stubs for old .html URLs (meta refresh + link for crawlers and no-JS users)
-write_redirect() {
-  local file="$1"
-  local path="$2"
-  local label="$3"
-  printf '%s\n' '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><meta http-equiv="refresh" content="0;url='"$path"'"><title>Redirect</title></head><body><p>Redirecting to <a href="'"$path"'">'"$label"'</a>.</p></body></html>' > "$file"
 }
-write_redirect "public/faq.html" "/faq/" "FAQ"
-write_redirect "public/glossary.html" "/glossary/" "Glossary"
-for slug in $ARTICLE_SLUGS; do
-  write_redirect "public/articles/${slug}.html" "/articles/${slug}/" "Article"
-done
-# Glossary term pages: move glossary/<slug>.html to glossary/<slug>/index.html and add redirect stub
-for f in public/glossary/*.html; do
-  [ -f "$f" ] || continue
-  basename="${f%.html}"
-  basename="${basename##*/}"
-  [ "$basename" != "index" ] || continue
-  mkdir -p "public/glossary/$basename"
-  mv "$f" "public/glossary/$basename/index.html"
-  write_redirect "public/glossary/$basename.html" "/glossary/$basename/" "Term"
-done
+if [ ${#PROFILE[@]} -gt 0 ]; then python3 scripts/build_trace.py start; fi
+mkdir -p public
+mkdir -p public/articles
+# Build glossary from 100-term markdown and 10 new articles from numbered markdown (no dates)
+stage glossary scripts/build_glossary.py "${BUILD_ARGS[@]}"
+stage articles scripts/build_articles.py "${BUILD_ARGS[@]}"
+stage chatwoot integrations/chatwoot/add_chatwoot.py
+stage banners integrations/add_ad_banners.py
+# Sync the favicon and the banner ads, pictures and videos the pages reference from source (only new
+# or changed files; unreferenced ones and files deleted from source are removed from public/)
+stage assets scripts/sync_assets.py
+# Clean URLs: builders already write path/index.html; move hand-maintained faq.html and
+# articles/<slug>.html there too, and write redirect stubs for every old .html URL
+stage clean_urls scripts/clean_urls.py
+# Sharded client-side search index from the builders' manifests (public/search/)
+stage search scripts/build_search.py
+# Purge unused Tailwind rules into a hashed stylesheet and inline each page's above-the-fold CSS
+stage purge_css scripts/purge_css.py
+# Content-hashed copies of the assets pages reference, and pages pointed at them
+stage fingerprint scripts/fingerprint_assets.py "${BUILD_ARGS[@]}"
+# Minify every HTML page in place (collapse whitespace, drop comments and needless quotes)
+stage minify scripts/minify_html.py "${BUILD_ARGS[@]}"
+# Record builder pages as left by the stages above, so the next build can tell them from hand edits
+stage manifests scripts/build_manifest.py
+# Broken internal links, redirect chains and orphan pages in the final pages (report only)
+stage links scripts/check_links.py "${BUILD_ARGS[@]}"
+# Sitemap from the builders' manifests plus hand-maintained pages (rewritten every run, no duplicates)
+stage sitemap scripts/build_sitemap.py
+# Precompressed .gz/.br sidecars for HTML/CSS/XML/SVG (last, so they cover every file above)
+stage compress scripts/compress_public.py "${BUILD_ARGS[@]}"
+if [ ${#PROFILE[@]} -gt 0 ]; then python3 scripts/build_trace.py report; fi
 echo "Build complete."
@@ -1,59 +1,82 @@
 #!/usr/bin/env python3
-"""Inject 728x90 top/bottom ad banners into target HTML pages. Run from repo root."""
-# Edit TOP_BANNER and BOTTOM_BANNER (href, src) to use your own ad URL and image filename.
+"""Inject 728x90 top/bottom ad banners into target HTML pages. Run from repo root.
+Pages produced by scripts/build_*.py get their banners at render time (integrations/page_hooks.py)
+and are skipped here; this only handles hand-maintained pages. The banner's width and height
+come from the media index (scripts/media_index.py)."""
+# Edit BANNER_HREF and BANNER_IMG to use your own ad URL and image filename.
+import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from clean_urls import is_redirect_stub  # noqa: E402
+from media_index import dimensions  # noqa: E402
+
 PUBLIC = ROOT / "public"
+BANNER_HREF = "https://gdfn.com"
+BANNER_IMG = "gdfn.com-728x90-xyz.gif"
+BANNER_SOURCE = ROOT / "source" / "banner_ads" / BANNER_IMG
+# Used when the banner is not in source/banner_ads
+BANNER_SIZE = (728, 90)
 # For pages in public/articles/, banner path is ../banner-ads/
-BANNER_PREFIX = "../banner-ads/"
-TOP_BANNER = f'''      <div class="ad-banner ad-banner-top w-full bg-neutral-900/80 border-y border-neutral-800 py-3">
-        <div class="container px-4 mx-auto max-w-4xl">
-          <a href="https://gdfn.com" target="_blank" rel="noopener noreferrer" class="block rounded-lg overflow-hidden border border-neutral-700 shadow-lg hover:border-neutral-600 transition-colors" aria-label="Advertisement">
-            <img src="{BANNER_PREFIX}gdfn.com-728x90-xyz.gif" width="728" height="90" alt="Advertisement" class="w-full h-auto block"/>
-          </a>
-        </div>
-      </div>
-'''
-BOTTOM_BANNER = f'''      <div class="ad-banner ad-banner-bottom w-full bg-neutral-900/80 border-y border-neutral-800 py-3">
-        <div class="container px-4 mx-auto max-w-4xl">
-          <a href="https://gdfn.com" target="_blank" rel="noopener noreferrer" class="block rounded-lg overflow-hidden border border-neutral-700 shadow-lg hover:border-neutral-600 transition-colors" aria-label="Advertisement">
-            <img src="{BANNER_PREFIX}gdfn.com-728x90-xyz.gif" width="728" height="90" alt="Advertisement" class="w-full h-auto block"/>
-          </a>
-        </div>
-      </div>
-'''
+BANNER_PREFIX = "../"
+
+
+def banner_html(position: str, prefix: str, indent: str = "") -> str:
+    """Banner block for position "top" or "bottom"; prefix is the page's relative path to the site root."""
+    width, height = dimensions(f"banner-ads/{BANNER_IMG}") or BANNER_SIZE
+    lines = [
+        f'<div class="ad-banner ad-banner-{position} w-full bg-neutral-900/80 border-y border-neutral-800 py-3">',
+        '  <div class="container px-4 mx-auto max-w-4xl">',
+        f'    <a href="{BANNER_HREF}" target="_blank" rel="noopener noreferrer" class="block rounded-lg overflow-hidden border border-neutral-700 shadow-lg hover:border-neutral-600 transition-colors" aria-label="Advertisement">',
+        f'      <img src="{prefix}banner-ads/{BANNER_IMG}" width="{width}" height="{height}" alt="Advertisement" class="w-full h-auto block"/>',
+        "    </a>",
+        "  </div>",
+        "</div>",
+    ]
+    return "".join(indent + line + "\n" for line in lines)
+
+
+TOP_ANCHOR = "      </nav>\n      <section"
+BOTTOM_ANCHOR = "      </footer>\n    </div>\n    <script type=\"text/javascript\" src="
 
 
 def add_to_file(path: Path) -> bool:
     text = path.read_text(encoding="utf-8")
-    changed = False
+    original = text
     if "ad-banner-top" not in text:
-        text = text.replace("      </nav>\n      <section", TOP_BANNER.rstrip() + "\n      <section")
-        changed = True
+        if TOP_ANCHOR in text:
+            top = banner_html("top", BANNER_PREFIX, "      ")
+            text = text.replace(TOP_ANCHOR, "      </nav>\n" + top + "      <section")
+        else:
+            print(f"Could not place top banner in {path}")
     if "ad-banner-bottom" not in text:
-        text = text.replace(
-            "      </footer>\n    </div>\n    <script type=\"text/javascript\" src=",
-            "      </footer>\n" + BOTTOM_BANNER + "    </div>\n    <script type=\"text/javascript\" src=",
-        )
-        changed = True
-    if changed:
-        path.write_text(text, encoding="utf-8")
-        print(f"Updated {path}")
-    return changed
+        if BOTTOM_ANCHOR in text:
+            bottom = banner_html("bottom", BANNER_PREFIX, "      ")
+            text = text.replace(
+                BOTTOM_ANCHOR,
+                "      </footer>\n" + bottom + "    </div>\n    <script type=\"text/javascript\" src=",
+            )
+        else:
+            print(f"Could not place bottom banner in {path}")
+    if text == original:
+        return False
+    path.write_text(text, encoding="utf-8")
+    print(f"Updated {path}")
+    return True
 
 
 def main():
+    from build_manifest import built_outputs
+
+    skip = built_outputs()
     count = 0
     for subdir in ("articles",):
         for f in (PUBLIC / subdir).glob("*.html"):
-            if add_to_file(f):
-                count += 1
-    # Glossary index and term pages (templates already include banners; skip if present)
-    if (PUBLIC / "glossary.html").exists() and add_to_file(PUBLIC / "glossary.html"):
-        count += 1
-    if (PUBLIC / "glossary").is_dir():
-        for f in (PUBLIC / "glossary").glob("*.html"):
+            if f.resolve() in skip or is_redirect_stub(f):
+                continue
             if add_to_file(f):
                 count += 1
     print(f"Ad banners: {count} file(s) updated.")
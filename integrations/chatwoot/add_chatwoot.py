@@ -1,15 +1,29 @@
 #!/usr/bin/env python3
-"""Inject Chatwoot widget script into target HTML pages. Run from repo root."""
+"""Inject Chatwoot widget script into target HTML pages. Run from repo root.
+Pages produced by scripts/build_*.py get the widget at render time (integrations/page_hooks.py)
+and are skipped here; this only handles hand-maintained pages."""
+import sys
+from functools import lru_cache
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent.parent  # repo root
 PUBLIC = ROOT / "public"
 SNIPPET_PATH = Path(__file__).resolve().parent / "snippet.html"
+ANCHOR = "</script>\n</body>"
 
 
-def _load_snippet() -> str:
+@lru_cache(maxsize=1)
+def load_snippet() -> str:
+    """snippet.html contents (stripped), or "" if the file is missing. Read once per process."""
     if SNIPPET_PATH.exists():
-        return "\n    " + SNIPPET_PATH.read_text(encoding="utf-8").strip().replace("\n", "\n    ")
+        return SNIPPET_PATH.read_text(encoding="utf-8").strip()
+    return ""
+
+
+def _load_snippet() -> str:
+    snippet = load_snippet()
+    if snippet:
+        return "\n    " + snippet.replace("\n", "\n    ")
     return ""
 
 
@@ -20,23 +34,26 @@ def add_to_file(path: Path) -> bool:
     snippet = _load_snippet()
     if not snippet:
         return False
-    text = text.replace("</script>\n</body>", "</script>" + snippet + "\n</body>")
+    if ANCHOR not in text:
+        print(f"Could not place Chatwoot snippet in {path}")
+        return False
+    text = text.replace(ANCHOR, "</script>" + snippet + "\n</body>")
     path.write_text(text, encoding="utf-8")
     print(f"Updated {path}")
     return True
 
 
 def main():
+    sys.path.insert(0, str(ROOT / "scripts"))
+    from build_manifest import built_outputs
+    from clean_urls import is_redirect_stub
+
+    skip = built_outputs()
     count = 0
     for subdir in ("articles",):
         for f in (PUBLIC / subdir).glob("*.html"):
-            if add_to_file(f):
-                count += 1
-    # Glossary index and term pages
-    if (PUBLIC / "glossary.html").exists() and add_to_file(PUBLIC / "glossary.html"):
-        count += 1
-    if (PUBLIC / "glossary").is_dir():
-        for f in (PUBLIC / "glossary").glob("*.html"):
+            if f.resolve() in skip or is_redirect_stub(f):
+                continue
             if add_to_file(f):
                 count += 1
     print(f"Chatwoot: {count} file(s) updated.")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Render-time hooks for integrations (Chatwoot widget, 728x90 ad banners).
+Page builders put <!--slot:NAME--> markers, each on its own line, in their templates and call
+apply_hooks() on every page they render, so snippets are filled in memory in one pass and each
+file is written once. apply_hooks() reports registered slots that had no marker on the page;
+builders store that in their manifest. Run this file to print the coverage report."""
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from integrations.add_ad_banners import BANNER_SOURCE, banner_html  # noqa: E402
+from integrations.chatwoot.add_chatwoot import SNIPPET_PATH, load_snippet  # noqa: E402
+
+SLOT_RE = re.compile(r"^([ \t]*)<!--slot:([a-z_]+)-->\n", re.MULTILINE)
+# Files whose content ends up in slots; builders fold them into their manifest keys
+HOOK_SOURCES = (
+    Path(__file__).resolve(),
+    ROOT / "integrations" / "add_ad_banners.py",
+    BANNER_SOURCE,  # its size is in the banner markup
+    SNIPPET_PATH,
+)
+
+
+class Page(NamedTuple):
+    """Page being rendered: path relative to public/ and relative prefix to the site root (e.g. "../../")."""
+    path: str
+    prefix: str
+
+
+_PROVIDERS: dict[str, Callable[[Page], str]] = {}
+
+
+def register(slot: str, provider: Callable[[Page], str]) -> None:
+    """Fill <!--slot:{slot}--> with provider(page). Providers return unindented markup;
+    apply_hooks() indents it to the marker's column."""
+    _PROVIDERS[slot] = provider
+
+
+register("ad_top", lambda page: banner_html("top", page.prefix))
+register("ad_bottom", lambda page: banner_html("bottom", page.prefix))
+register("body_end", lambda page: load_snippet())
+
+
+def apply_hooks(html: str, page: Page) -> tuple[str, list[str]]:
+    """Fill every slot marker in html. Returns (html, registered slots with no marker on the page)."""
+    placed: set[str] = set()
+
+    def fill(m: re.Match) -> str:
+        indent, name = m.group(1), m.group(2)
+        placed.add(name)
+        provider = _PROVIDERS.get(name)
+        text = provider(page) if provider is not None else ""
+        return "".join(indent + line + "\n" if line else "\n" for line in text.splitlines())
+
+    html = SLOT_RE.sub(fill, html)
+    missing = [name for name in _PROVIDERS if name not in placed]
+    return html, missing
+
+
+def coverage_lines(missing_by_page: dict[str, list[str]]) -> list[str]:
+    """Human-readable report lines for pages with slots that could not be placed."""
+    return [f"  {page}: no slot for {', '.join(slots)}" for page, slots in sorted(missing_by_page.items()) if slots]
+
+
+def main():
+    """Print slot coverage for every page recorded in the builders' manifests (.build/*.json)."""
+    missing_by_page: dict[str, list[str]] = {}
+    pages = 0
+    for path in sorted((ROOT / ".build").glob("*.json")):
+        try:
+            entries = json.loads(path.read_text(encoding="utf-8")).get("entries", {})
+        except (OSError, ValueError):
+            continue
+        for rel, entry in entries.items():
+            if "slots_missing" not in entry:
+                continue
+            pages += 1
+            missing_by_page[rel] = entry["slots_missing"]
+    lines = coverage_lines(missing_by_page)
+    print(f"Hooks: {pages} rendered page(s), {len(lines)} with unplaced slots.")
+    for line in lines:
+        print(line)
+    sys.exit(1 if lines else 0)
+
+
+if __name__ == "__main__":
+    main()
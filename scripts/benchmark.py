@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""Benchmark the glossary and article builders on synthetic corpora. Run from repo root.
+Generates a glossary of N terms (definitions cross-reference other terms, skewed towards a few hub
+terms the way "VPN" and "Encryption" are) and N markdown articles, then times each build phase by
+calling the builders' own functions: parse, index (term matcher and mention index), linkify,
+related, render, inject (page hooks), write and sitemap. Pages are written to a temporary directory,
+never to public/. A second, traced pass records each phase's peak Python heap (tracemalloc).
+Results go to .build/benchmark.json (--output). --baseline FILE compares against an earlier results
+file and exits with status 1 if a phase got slower or bigger than the thresholds allow;
+--save-baseline FILE stores this run as the new baseline."""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import build_articles  # noqa: E402
+import build_glossary  # noqa: E402
+from build_manifest import MANIFEST_DIR, write_atomic  # noqa: E402
+from build_sitemap import SitemapWriter  # noqa: E402
+from integrations.page_hooks import Page, apply_hooks  # noqa: E402
+from term_linker import TermLinker  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+OUTPUT = MANIFEST_DIR / "benchmark.json"
+RESULTS_VERSION = 1
+QUICK_GLOSSARY = (1000,)
+QUICK_ARTICLES = (100,)
+FULL_GLOSSARY = (1000, 10_000, 100_000)
+FULL_ARTICLES = (100, 10_000)
+# Regression thresholds (fraction over baseline) and the noise floor below which time is not compared
+TIME_THRESHOLD = 0.25
+MEMORY_THRESHOLD = 0.10
+MIN_SECONDS = 0.05
+
+TERM_WORDS = (
+    "Access", "Address", "Agent", "Attack", "Authentication", "Bandwidth", "Block", "Browser", "Certificate",
+    "Cipher", "Client", "Cloud", "Connection", "Cookie", "Data", "Device", "DNS", "Domain", "Encryption",
+    "Endpoint", "Exit", "Filter", "Firewall", "Gateway", "Handshake", "Hash", "Header", "Host", "IP", "Key",
+    "Kill", "Latency", "Leak", "Log", "Mesh", "Network", "Node", "Obfuscation", "Packet", "Peer", "Port",
+    "Privacy", "Protocol", "Proxy", "Relay", "Router", "Routing", "Server", "Session", "Split", "Switch",
+    "TLS", "Token", "Traffic", "Tunnel", "UDP", "VPN", "Wi-Fi", "WireGuard", "Zero-Trust",
+)
+FILLER_WORDS = (
+    "a", "and", "at", "because", "before", "between", "by", "can", "data", "each", "every", "for", "from",
+    "helps", "in", "is", "it", "keeps", "less", "makes", "more", "most", "of", "on", "only", "or", "over",
+    "protects", "requests", "sends", "so", "that", "the", "through", "to", "traffic", "uses", "when",
+    "which", "with", "without", "your",
+)
+
+
+def synthetic_glossary(n: int, rng: random.Random) -> str:
+    """Glossary markdown in the source format (## N. Term) with n unique terms. Each definition
+    mentions 2–6 other terms, half of them drawn from the first few percent (hub terms)."""
+    names: list[str] = []
+    seen: set[str] = set()
+    while len(names) < n:
+        name = " ".join(rng.sample(TERM_WORDS, rng.choice((1, 2, 2, 3))))
+        if name.lower() in seen:
+            name = f"{name} {len(names)}"
+        seen.add(name.lower())
+        names.append(name)
+    sections = ["# VPN Glossary\n"]
+    for i, name in enumerate(names):
+        words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(30, 70))]
+        for _ in range(rng.randint(2, 6)):
+            j = int(n * rng.random() ** 3) if rng.random() < 0.5 else rng.randrange(n)
+            words.insert(rng.randrange(len(words) + 1), names[j])
+        sections.append(f"## {i + 1}. {name}\n\n{' '.join(words).capitalize()}.\n")
+    return "\n".join(sections)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(FILLER_WORDS) for _ in range(words))
+    return text.capitalize() + "."
+
+
+def synthetic_article(i: int, rng: random.Random) -> str:
+    """About 1,200 words of markdown with the structure of our articles: title, ## sections,
+    paragraphs with bold and links, and a list."""
+    lines = [f"# Synthetic article {i}: {' '.join(rng.sample(TERM_WORDS, 3))}", ""]
+    for section in range(6):
+        lines += [f"## {' '.join(rng.sample(TERM_WORDS, 2))} {section + 1}", ""]
+        for _ in range(3):
+            para = [_sentence(rng, rng.randint(8, 20)) for _ in range(4)]
+            para[1] = f"**{para[1]}**"
+            para[2] = f"See [{rng.choice(TERM_WORDS)}](https://vpnsurf.com/glossary/) for more. {para[2]}"
+            lines += [" ".join(para), ""]
+        if section % 2:
+            lines += [f"- {_sentence(rng, rng.randint(5, 12))}" for _ in range(4)] + [""]
+    return "\n".join(lines)
+
+
+class Phases:
+    """Times named phases; with trace=True also records the traced heap peak during each one."""
+
+    def __init__(self, trace: bool):
+        self.trace = trace
+        self.seconds: dict[str, float] = {}
+        self.peak_kib: dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        if self.trace:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        yield
+        self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+        if self.trace:
+            peak = tracemalloc.get_traced_memory()[1] // 1024
+            self.peak_kib[name] = max(self.peak_kib.get(name, 0), peak)
+
+
+def run_glossary(source: Path, out: Path, phases: Phases) -> int:
+    """The build_glossary.py pipeline, phase by phase, without the manifest (every page is built)."""
+    with phases.phase("parse"):
+        terms_with_slugs = build_glossary.ensure_unique_slugs(build_glossary.parse_terms(source))
+        term_to_slug = {t: s for t, _, s in terms_with_slugs}
+        by_letter: dict[str, list[tuple[str, str, str]]] = {}
+        for term, raw_def, slug in terms_with_slugs:
+            by_letter.setdefault(build_glossary.first_letter(term), []).append((term, raw_def, slug))
+        for group in by_letter.values():
+            group.sort(key=lambda x: x[0].lower())
+    with phases.phase("index"):
+        linker = TermLinker(sorted((t for t, _, _ in terms_with_slugs), key=lambda x: -len(x)))
+        mentions = build_glossary.build_mention_index(terms_with_slugs, by_letter, linker)
+    with phases.phase("linkify"):
+        linked = [build_glossary.linkify_definition(raw_def, term, linker, term_to_slug)
+                  for term, raw_def, _ in terms_with_slugs]
+    with phases.phase("related"):
+        related = [build_glossary.related_terms(i, terms_with_slugs, mentions) for i in range(len(terms_with_slugs))]
+    with phases.phase("render"):
+        if len(terms_with_slugs) > build_glossary.INDEX_SHARD_AT:  # as build_glossary.py --index auto
+            letters = build_glossary.sorted_letters(by_letter)
+            counts = {c: len(by_letter[c]) for c in letters}
+            pages = [(build_glossary.INDEX_PAGE, build_glossary.build_landing_html(letters, counts))]
+            for letter, n, count, chunk in build_glossary.letter_pages(by_letter, build_glossary.INDEX_PAGE_SIZE):
+                html = build_glossary.build_letter_page_html(letter, n, count, chunk, letters)
+                pages.append((build_glossary.letter_page(letter, n), html))
+        else:
+            pages = [(build_glossary.INDEX_PAGE, build_glossary.build_index_html(terms_with_slugs, by_letter))]
+        for (term, raw_def, slug), definition_linked, rel in zip(terms_with_slugs, linked, related):
+            html = build_glossary.term_page_html(term, slug, raw_def, definition_linked, rel, term_to_slug)
+            pages.append((build_glossary.term_page(slug), html))
+    with phases.phase("inject"):
+        pages = [(page, apply_hooks(html, page)[0]) for page, html in pages]
+    with phases.phase("write"):
+        for page, html in pages:
+            write_atomic(out / page.path, html)
+    with phases.phase("sitemap"):
+        writer = SitemapWriter(out, build_glossary.BASE)
+        for page, _ in pages:
+            writer.add(f"{build_glossary.BASE}/{page.path[:-len('index.html')]}", None)
+        writer.close()
+    return len(pages)
+
+
+def run_articles(md_files: list[Path], out: Path, phases: Phases) -> int:
+    """The build_articles.py pipeline (markdown to page), phase by phase, without hero images."""
+    with phases.phase("parse"):
+        parsed = [build_articles.parse_article(path) for path in md_files]
+    with phases.phase("related"):
+        infos = [build_articles.read_article(path) for path in md_files]
+        picks = build_articles.related_articles([build_articles.article_terms(title, body_md)
+                                                 for _, title, _, body_md in infos])
+    with phases.phase("render"):
+        pages = []
+        for i, (title, excerpt, body_html) in enumerate(parsed):
+            slug = f"synthetic-{i}"
+            related = [(f"synthetic-{j}", parsed[j][0]) for j in picks[i]]
+            html = build_articles.build_article_html(slug, title, excerpt, body_html, "hero.png", None, related)
+            pages.append((Page(build_articles.page_path(slug), "../../"), html))
+    with phases.phase("inject"):
+        pages = [(page, apply_hooks(html, page)[0]) for page, html in pages]
+    with phases.phase("write"):
+        for page, html in pages:
+            write_atomic(out / page.path, html)
+    with phases.phase("sitemap"):
+        writer = SitemapWriter(out, "https://vpnsurf.com")
+        for page, _ in pages:
+            writer.add(f"https://vpnsurf.com/{page.path[:-len('index.html')]}", None)
+        writer.close()
+    return len(pages)
+
+
+def run_case(kind: str, size: int, seed: int, repeat: int, memory: bool) -> dict:
+    """Generate the corpus once, then time repeat runs (best per phase) and one traced run."""
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory(prefix="vpnsurf-bench-") as tmp:
+        work = Path(tmp)
+        if kind == "glossary":
+            source = work / "glossary.md"
+            source.write_text(synthetic_glossary(size, rng), encoding="utf-8")
+            run = lambda out, phases: run_glossary(source, out, phases)  # noqa: E731
+        else:
+            md_dir = work / "md"
+            md_dir.mkdir()
+            md_files = []
+            for i in range(size):
+                path = md_dir / f"{i:05d}.md"
+                path.write_text(synthetic_article(i, rng), encoding="utf-8")
+                md_files.append(path)
+            run = lambda out, phases: run_articles(md_files, out, phases)  # noqa: E731
+        best: dict[str, float] = {}
+        for attempt in range(repeat):
+            phases = Phases(trace=False)
+            pages = run(work / f"out-{attempt}", phases)
+            for name, seconds in phases.seconds.items():
+                best[name] = min(best.get(name, seconds), seconds)
+        peaks: dict[str, int] = {}
+        if memory:
+            traced = Phases(trace=True)
+            tracemalloc.start()
+            try:
+                run(work / "out-traced", traced)
+            finally:
+                tracemalloc.stop()
+            peaks = traced.peak_kib
+    return {
+        "pages": pages,
+        "phases": {name: {"seconds": round(s, 4), **({"peak_kib": peaks[name]} if name in peaks else {})}
+                   for name, s in best.items()},
+        "total_seconds": round(sum(best.values()), 4),
+        "peak_kib": max(peaks.values()) if peaks else None,
+    }
+
+
+def compare(results: dict, baseline: dict, time_threshold: float, memory_threshold: float) -> list[str]:
+    """Regression messages for phases slower or bigger than the baseline allows (cases and phases
+    missing from either side are skipped)."""
+    problems = []
+    for case, result in sorted(results["cases"].items()):
+        old_case = baseline.get("cases", {}).get(case)
+        if old_case is None:
+            continue
+        for name, now in result["phases"].items():
+            old = old_case["phases"].get(name)
+            if old is None:
+                continue
+            if (now["seconds"] > old["seconds"] * (1 + time_threshold)
+                    and now["seconds"] - old["seconds"] > MIN_SECONDS):
+                problems.append(f"{case} {name}: {old['seconds']:.3f}s -> {now['seconds']:.3f}s")
+            if "peak_kib" in now and "peak_kib" in old and now["peak_kib"] > old["peak_kib"] * (1 + memory_threshold):
+                problems.append(f"{case} {name}: peak {old['peak_kib']} KiB -> {now['peak_kib']} KiB")
+    return problems
+
+
+def _sizes(text: str) -> tuple[int, ...]:
+    return tuple(int(s) for s in text.split(",") if s.strip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the site builders on synthetic corpora.")
+    parser.add_argument("--glossary", type=_sizes, default=QUICK_GLOSSARY,
+                        help="comma-separated glossary sizes in terms (default 1000; empty to skip)")
+    parser.add_argument("--articles", type=_sizes, default=QUICK_ARTICLES,
+                        help="comma-separated article counts (default 100; empty to skip)")
+    parser.add_argument("--full", action="store_true", help="glossary 1k/10k/100k terms and 100/10k articles")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per case; the best time per phase is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced pass (peak memory)")
+    parser.add_argument("--seed", type=int, default=1, help="corpus generator seed")
+    parser.add_argument("--output", type=Path, default=OUTPUT, help=f"results file (default {OUTPUT.relative_to(ROOT)})")
+    parser.add_argument("--baseline", type=Path, help="results file to compare against; exit 1 on regression")
+    parser.add_argument("--save-baseline", type=Path, help="also write this run's results to this file")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD,
+                        help=f"allowed slowdown per phase as a fraction (default {TIME_THRESHOLD})")
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD,
+                        help=f"allowed peak memory growth per phase as a fraction (default {MEMORY_THRESHOLD})")
+    args = parser.parse_args()
+    if args.full:
+        args.glossary, args.articles = FULL_GLOSSARY, FULL_ARTICLES
+    results = {
+        "version": RESULTS_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "markdown": getattr(build_articles.markdown, "__version__", "minimal"),
+            "numpy": getattr(build_articles.np, "__version__", "none"),
+            "seed": args.seed,
+        },
+        "cases": {},
+    }
+    for kind, sizes in (("glossary", args.glossary), ("articles", args.articles)):
+        for size in sizes:
+            case = f"{kind}-{size}"
+            result = run_case(kind, size, args.seed, max(1, args.repeat), not args.no_memory)
+            results["cases"][case] = result
+            peak = f", peak {result['peak_kib'] // 1024} MiB" if result["peak_kib"] is not None else ""
+            print(f"{case}: {result['pages']} page(s) in {result['total_seconds']:.2f}s{peak}")
+            for name, phase in result["phases"].items():
+                mem = f"  {phase['peak_kib'] // 1024:>5} MiB" if "peak_kib" in phase else ""
+                print(f"  {name:<8} {phase['seconds']:>8.3f}s{mem}")
+    text = json.dumps(results, indent=1, sort_keys=True)
+    write_atomic(args.output, text)
+    print(f"Results written to {args.output}")
+    if args.save_baseline:
+        write_atomic(args.save_baseline, text)
+        print(f"Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        problems = compare(results, baseline, args.time_threshold, args.memory_threshold)
+        for line in problems:
+            print(f"  regression: {line}")
+        print(f"{len(problems)} regression(s) against {args.baseline}.")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,170 @@
 #!/usr/bin/env python3
-"""Convert 10 numbered source markdown articles to public/articles/<slug>.html.
-Run from repo root. No dates on blog posts. Only generates the 10 new slugs; does not overwrite existing 5."""
+"""Convert source markdown articles to public/articles/<slug>/index.html (URL /articles/<slug>/).
+Run from repo root. No dates on blog posts. An article is any source/articles/*.md that starts with
+front matter giving its slug and hero image (see discover_articles); pages for slugs no longer
+claimed by a source file are removed. Hand-made pages in public/articles/ are never touched.
+Each article gets a related-articles section (TF-IDF cosine similarity, NumPy matrix products when
+available), and the blog listing (articles/index.html, articles/page/<n>/) is generated in the same run.
+Incremental: articles whose markdown, hero image and template are unchanged are not re-parsed (--force rebuilds all).
+Converted markdown is cached on disk by content (.build/cache/markdown, LRU-bounded), so a template
+change or --force re-renders pages without re-running Markdown on unchanged articles (--no-cache skips it).
+--jobs N parses and renders articles in N worker processes (0 = one per core); output is identical to --jobs 1."""
+import argparse
+import html as html_lib
+import inspect
+import json
+import math
+import os
 import re
+import sys
+from collections import Counter
 from pathlib import Path
+from urllib.parse import unquote
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from build_cache import DiskCache  # noqa: E402
+from build_images import SOURCE_DIR as PICTURES_DIR, build_variants, picture_html  # noqa: E402
+from build_manifest import BuildManifest, code_hash, content_hash  # noqa: E402
+from build_parallel import map_chunks  # noqa: E402
+from layout import render_page  # noqa: E402
+from media_index import media_index, use_index  # noqa: E402
+from clean_urls import is_redirect_stub  # noqa: E402
+from fingerprint_assets import HASHED_RE  # noqa: E402
+from integrations.page_hooks import HOOK_SOURCES, Page, apply_hooks, coverage_lines  # noqa: E402
 
 try:
     import markdown
+    from markdown.extensions import Extension
+    from markdown.treeprocessors import Treeprocessor
 except ImportError:
     markdown = None  # fallback to minimal conversion
+MD_VERSION = getattr(markdown, "__version__", "none") if markdown is not None else "minimal"
+try:
+    import numpy as np
+except ImportError:
+    np = None  # related articles via sparse dot products in pure Python (same results)
 
 ROOT = Path(__file__).resolve().parent.parent
 SOURCE_DIR = ROOT / "source" / "articles"
-OUT_DIR = ROOT / "public" / "articles"
-PICTURES = ("vpnsurf.com-120.gif", "vpnsurf.com-121.png", "vpnsurf.com-122.png", "vpnsurf.com-123.png",
-            "vpnsurf.com-124.gif", "vpnsurf.com-125.gif", "vpnsurf.com-126.gif", "vpnsurf.com-128.png",
-            "vpnsurf.com-129.gif", "vpnsurf.com-130.gif")
-
-# Filename prefix (e.g. 01-vpn-privacy-101-...) -> URL slug
-SLUG_MAP = {
-    "01-vpn-privacy-101": "vpn-privacy-101",
-    "02-vpn-on-ios": "vpn-on-ios",
-    "03-vpn-on-android": "vpn-on-android",
-    "04-vpn-for-movie-streaming": "vpn-for-movie-streaming",
-    "05-vpn-for-steam-and-pc-gaming": "vpn-for-steam-and-pc-gaming",
-    "06-vpn-for-video-games-on-consoles": "vpn-for-video-games-consoles-mobile",
-    "07-vpn-for-corporate-work": "vpn-for-corporate-work",
-    "08-vpns-for-traders": "vpns-for-traders",
-    "09-vpn-for-web3": "vpn-for-web3",
-    "10-advanced-vpn-privacy-and-protocols": "advanced-vpn-privacy-and-protocols",
+PUBLIC = ROOT / "public"
+# Hero is full width of the article card: max-w-3xl minus padding
+HERO_CLASS = "w-full h-64 md:h-80 object-cover rounded-lg"
+HERO_SIZES = "(min-width: 768px) 680px, 100vw"
+H2_RE = re.compile(r"<h2[^>]*>(.*?)</h2>", re.DOTALL)
+# Classes for markdown output, set by TailwindTreeprocessor (and minimal_md_to_html without Markdown)
+ELEMENT_CLASSES = {
+    "strong": "text-white",
+    "a": "text-cyan-400 hover:underline transition-colors duration-200",
+    "h2": "text-xl font-medium text-white mt-8 mb-2",
 }
+FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+# Elements whose content is running text: newlines become spaces, spaces between inline tags are kept
+TEXT_BLOCKS = {"p", "li", "dt", "dd", "td", "th", "h1", "h2", "h3", "h4", "h5", "h6", "figcaption"}
+# Converted article bodies kept in .build/cache/markdown (least recently used evicted past this)
+MD_CACHE_BYTES = 64 * 1024 * 1024
+# Related articles: how many per page, and the most widespread terms kept in the TF-IDF vectors
+# (terms in a single article cannot relate two articles and are dropped before the cap)
+RELATED_CAP = 4
+RELATED_MAX_TERMS = 4096
+# Similarity rows per matrix product, bounding the N x N scores held at once
+RELATED_BATCH = 512
+# Scores are rounded before ranking so NumPy and pure Python order ties the same way
+RELATED_DIGITS = 6
+TERM_RE = re.compile(r"[a-z][a-z0-9]+")
+MD_LINK_TARGET_RE = re.compile(r"\]\([^)]*\)")
+STOPWORDS = frozenset(
+    "about after also and any are because been before being both but can could does doesn each for from "
+    "get has have how into its it’s just like more most much not one only other our out over same should "
+    "some such than that the their them then there these they this those through too use used uses using "
+    "very was way what when where which while who will with without you your".split()
+)
+# Blog listing: articles/index.html, then articles/page/<n>/index.html
+LISTING_PAGE_SIZE = 24
+LISTING_CARD_CLASS = "w-full h-full object-cover rounded-lg border border-neutral-800"
+LISTING_CARD_SIZES = "(min-width: 768px) 360px, 100vw"
+# Hand-made article pages in public/articles/ are listed from their markup, which an earlier build
+# may already have minified (unquoted attributes) and fingerprinted (pictures/x.<hash>.png)
+H1_RE = re.compile(r"<h1[^>]*>(.*?)</h1>", re.DOTALL)
+META_RE = re.compile(
+    r"""<meta (?:name|property)=["']?(description|article:section)["']? content=(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+))"""
+)
+HERO_IMG_RE = re.compile(r"""<img[^>]*\ssrc=["']?(?:\.\./)+pictures/([^"'\s>]+)""")
+ALPINE_SCRIPT = '    <script type="text/javascript" src="https://cdn.jsdelivr.net/npm/alpinejs@3.13.3/dist/cdn.min.js" defer></script>\n'
+
+# Article metadata block at the top of a source file: "---", key: value lines, "---"
+FRONT_MATTER_FENCE = "---"
+FRONT_MATTER_KEYS = {"slug", "hero", "title", "description", "category", "summary"}
+SLUG_RE = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+
+
+def split_front_matter(text: str) -> tuple[dict[str, str] | None, str]:
+    """(front matter, rest of text); None when the text has no front matter block.
+    Raises ValueError on a malformed block."""
+    lines = text.split("\n")
+    if not lines or lines[0].strip() != FRONT_MATTER_FENCE:
+        return None, text
+    meta: dict[str, str] = {}
+    for n, line in enumerate(lines[1:], 2):
+        if line.strip() == FRONT_MATTER_FENCE:
+            return meta, "\n".join(lines[n:])
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        key, sep, value = line.partition(":")
+        key, value = key.strip(), value.strip()
+        if not sep or key not in FRONT_MATTER_KEYS:
+            raise ValueError(f"line {n}: expected one of {', '.join(sorted(FRONT_MATTER_KEYS))} as 'key: value'")
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        meta[key] = value
+    raise ValueError(f"front matter not closed with {FRONT_MATTER_FENCE}")
 
 
-def slug_from_filename(name: str) -> str | None:
-    """Map 01-xxx.md, 02-xxx.md, ... to slug. Returns None if not a numbered article."""
-    if not name.endswith(".md") or name.startswith("."):
-        return None
-    base = name[:-3]  # strip .md
-    for prefix, slug in SLUG_MAP.items():
-        if base == prefix or base.startswith(prefix + "-"):
-            return slug
-    return None
+def read_front_matter(md_path: Path) -> dict[str, str] | None:
+    """Front matter of a source file, reading only as far as the closing fence."""
+    head = []
+    with md_path.open(encoding="utf-8") as fh:
+        for n, line in enumerate(fh):
+            head.append(line.rstrip("\n"))
+            if n == 0 and line.strip() != FRONT_MATTER_FENCE:
+                return None
+            if n > 0 and line.strip() == FRONT_MATTER_FENCE:
+                break
+    return split_front_matter("\n".join(head))[0]
+
+
+def discover_articles(source_dir: Path) -> list[tuple[Path, str, str]]:
+    """(md_path, slug, hero image) for every *.md in source_dir with front matter, in file name order.
+    Files without front matter (the glossary, notes) are not articles. Exits listing every problem
+    (missing or invalid slug, missing hero, two files claiming one slug) so they can be fixed in one go."""
+    registry: dict[str, Path] = {}
+    articles: list[tuple[Path, str, str]] = []
+    errors: list[str] = []
+    names = sorted(entry.name for entry in os.scandir(source_dir)
+                   if entry.name.endswith(".md") and not entry.name.startswith(".") and entry.is_file())
+    for name in names:
+        md_path = source_dir / name
+        try:
+            meta = read_front_matter(md_path)
+        except ValueError as exc:
+            errors.append(f"{name}: {exc}")
+            continue
+        if meta is None:
+            continue
+        slug, hero = meta.get("slug", ""), meta.get("hero", "")
+        if not SLUG_RE.match(slug):
+            errors.append(f"{name}: slug {slug!r} must be lowercase letters, digits and single hyphens")
+        elif slug in registry:
+            errors.append(f"{name}: slug {slug!r} is already used by {registry[slug].name}")
+        else:
+            registry[slug] = md_path
+        if not hero:
+            errors.append(f"{name}: no hero image")
+        elif not (PICTURES_DIR / hero).is_file():
+            errors.append(f"{name}: hero {hero!r} not found in {PICTURES_DIR.relative_to(ROOT)}")
+        articles.append((md_path, slug, hero))
+    if errors:
+        raise SystemExit("Article front matter errors:\n  " + "\n  ".join(errors))
+    return articles
 
 
 def minimal_md_to_html(text: str) -> str:
@@ -58,7 +183,7 @@ def minimal_md_to_html(text: str) -> str:
             if current_para:
                 out.append("<p>" + " ".join(current_para) + "</p>")
                 current_para = []
-            out.append(f"<h2 class=\"text-xl font-medium text-white mt-8 mb-2\">{_escape(line[3:].strip())}</h2>")
+            out.append(f"<h2 class=\"{ELEMENT_CLASSES['h2']}\">{_escape(line[3:].strip())}</h2>")
         elif line.strip() == "":
             if current_para:
                 out.append("<p>" + " ".join(current_para) + "</p>")
@@ -67,10 +192,7 @@ def minimal_md_to_html(text: str) -> str:
             current_para.append(_bold_and_escape(line.strip()))
     if current_para:
         out.append("<p>" + " ".join(current_para) + "</p>")
-    html = "\n".join(out)
-    html = re.sub(r"<strong>", r'<strong class="text-white">', html)
-    html = re.sub(r"<a ", r'<a class="text-cyan-400 hover:underline transition-colors duration-200" ', html)
-    return html
+    return "\n".join(out)
 
 
 def _escape(s: str) -> str:
@@ -78,18 +200,33 @@ def _escape(s: str) -> str:
 
 
 def _bold_and_escape(s: str) -> str:
-    """Replace **x** with <strong class="text-white">x</strong> and escape."""
+    """Replace **x** with <strong class="...">x</strong> and escape."""
     s = _escape(s)
-    s = re.sub(r"\*\*(.+?)\*\*", r'<strong class="text-white">\1</strong>', s)
+    s = re.sub(r"\*\*(.+?)\*\*", rf'<strong class="{ELEMENT_CLASSES["strong"]}">\1</strong>', s)
     return s
 
 
 def normalize_body_md(text: str) -> str:
     """Join line-wrapped paragraphs so output HTML has one flowing paragraph per block.
-    Preserves blank lines (paragraph breaks), headings, and list structure."""
+    Preserves blank lines (paragraph breaks), headings, and list structure; fenced and indented
+    code blocks are kept verbatim."""
     blocks = text.split("\n\n")
     out = []
+    fence = None  # opening ``` or ~~~ while inside a fenced code block
     for block in blocks:
+        if fence is not None or FENCE_RE.match(block.lstrip("\n")):
+            block = block.strip("\n")
+            for line in block.split("\n"):
+                m = FENCE_RE.match(line)
+                if m and fence is None:
+                    fence = m.group(1)
+                elif m and line.strip().startswith(fence[0] * len(fence)) and not line.strip(fence[0]).strip():
+                    fence = None
+            out.append(block)
+            continue
+        if block.lstrip("\n").startswith(("    ", "\t")):
+            out.append(block.strip("\n"))
+            continue
         block = block.strip()
         if not block:
             continue
@@ -120,36 +257,100 @@ def normalize_body_md(text: str) -> str:
     return "\n\n".join(out)
 
 
+class TailwindTreeprocessor(Treeprocessor if markdown is not None else object):
+    """Applies our classes and whitespace policy to the element tree in one walk, so the HTML is
+    final when it is serialized. Newlines inside paragraphs, list items and headings become spaces
+    and paragraphs are trimmed; whitespace-only text between block elements is dropped, while
+    spaces between inline elements are kept. <pre> blocks are left exactly as written."""
+
+    def run(self, root) -> None:
+        self._walk(root, inline=False)
+
+    def _walk(self, el, inline: bool) -> None:
+        cls = ELEMENT_CLASSES.get(el.tag)
+        if cls is not None:
+            current = el.get("class")
+            attrib = dict(el.attrib)
+            el.attrib.clear()
+            el.set("class", f"{cls} {current}" if current else cls)
+            attrib.pop("class", None)
+            el.attrib.update(attrib)
+        if el.tag == "pre":
+            return
+        inline = inline or el.tag in TEXT_BLOCKS
+        el.text = self._space(el.text, inline)
+        for child in el:
+            self._walk(child, inline)
+            child.tail = self._space(child.tail, inline)
+        if el.tag == "p":
+            if el.text:
+                el.text = el.text.lstrip()
+            if len(el) and el[-1].tail:
+                el[-1].tail = el[-1].tail.rstrip()
+            elif not len(el) and el.text:
+                el.text = el.text.rstrip()
+
+    @staticmethod
+    def _space(text: str | None, inline: bool) -> str | None:
+        if not text:
+            return text
+        if inline:
+            return text.replace("\n", " ")
+        return text if text.strip() else None
+
+
+class TailwindExtension(Extension if markdown is not None else object):
+    def extendMarkdown(self, md) -> None:
+        # After attr_list (8) and abbr (7) have set their attributes, before unescaping (0)
+        md.treeprocessors.register(TailwindTreeprocessor(md), "tailwind", 5)
+
+
+_MD = None
+
+
 def md_to_html(text: str) -> str:
     """Convert markdown body to HTML with Tailwind-friendly classes."""
+    global _MD
     if markdown is not None:
-        html = markdown.markdown(
-            text,
-            extensions=["extra"],
-            output_format="html5",
-        )
-        html = re.sub(r"<strong>", r'<strong class="text-white">', html)
-        html = re.sub(r"<a ", r'<a class="text-cyan-400 hover:underline transition-colors duration-200" ', html)
-        html = re.sub(r"<h2>", r'<h2 class="text-xl font-medium text-white mt-8 mb-2">', html)
-        # Collapse newlines inside <p>...</p> so paragraphs render as single blocks
-        html = re.sub(
-            r"<p([^>]*)>(.*?)</p>",
-            lambda m: "<p" + m.group(1) + ">" + m.group(2).replace("\n", " ").strip() + "</p>",
-            html,
-            flags=re.DOTALL,
-        )
-        # Remove newline/space right after opening <p> and before closing </p>
-        html = re.sub(r"(<p[^>]*>)\s+", r"\1", html)
-        html = re.sub(r"\s+</p>", r"</p>", html)
-        # Remove newlines/space between tags
-        html = re.sub(r">\s+<", "><", html)
-        return html
+        if _MD is None:
+            _MD = markdown.Markdown(extensions=["extra", TailwindExtension()], output_format="html5")
+        return _MD.reset().convert(text)
     return minimal_md_to_html(text)
 
 
-def parse_article(md_path: Path) -> tuple[str, str, str]:
-    """Return (title, excerpt, body_html). First # line = title; rest = body. No dates."""
-    text = md_path.read_text(encoding="utf-8")
+# Source of the converter, so editing md_to_html or its helpers invalidates every cached body
+MD_CONVERTER = content_hash(
+    *(inspect.getsource(f) for f in (md_to_html, minimal_md_to_html, _escape, _bold_and_escape, TailwindTreeprocessor)),
+    json.dumps([ELEMENT_CLASSES, sorted(TEXT_BLOCKS)]),
+)
+# Set per process by _init_worker; None (e.g. when imported by scripts/benchmark.py) converts every time
+_MD_CACHE: DiskCache | None = None
+
+
+def _init_worker(cache: DiskCache | None, media: dict[str, dict]) -> None:
+    global _MD_CACHE
+    _MD_CACHE = cache
+    use_index(media)
+
+
+def render_markdown(body_md: str) -> str:
+    """md_to_html, served from the on-disk cache when the same normalized markdown was converted
+    before by the same converter code and Markdown version."""
+    if _MD_CACHE is None:
+        return md_to_html(body_md)
+    key = content_hash(MD_CONVERTER, MD_VERSION, body_md)
+    html = _MD_CACHE.get(key)
+    if html is None:
+        html = md_to_html(body_md)
+        _MD_CACHE.put(key, html)
+    return html
+
+
+def read_article(md_path: Path) -> tuple[dict[str, str], str, str, str]:
+    """(front matter, title, excerpt, normalized body markdown). First # line = title; rest = body.
+    Front matter title and description, when set, replace the # line and the first paragraph."""
+    meta, text = split_front_matter(md_path.read_text(encoding="utf-8"))
+    meta = meta or {}
     lines = text.split("\n")
     title = ""
     body_lines = []
@@ -169,55 +370,29 @@ def parse_article(md_path: Path) -> tuple[str, str, str]:
         if line:
             excerpt = line[:160] + ("…" if len(line) > 160 else "")
             break
-    body_html = md_to_html(body_md)
-    return title, excerpt, body_html
+    return meta, meta.get("title") or title, meta.get("description") or excerpt, body_md
+
+
+def parse_article(md_path: Path) -> tuple[str, str, str]:
+    """Return (title, excerpt, body_html). No dates."""
+    _, title, excerpt, body_md = read_article(md_path)
+    return title, excerpt, render_markdown(body_md)
+
 
+def page_path(slug: str) -> str:
+    """Output location of an article under public/ (its clean URL's index.html)."""
+    return f"articles/{slug}/index.html"
 
-def build_article_html(slug: str, title: str, excerpt: str, body_html: str, hero_img: str) -> str:
-    """Full article page HTML (same structure as why-use-vpn). No date."""
+
+def build_article_html(slug: str, title: str, excerpt: str, body_html: str, hero_img: str,
+                       hero_record: dict | None = None, related: list[tuple[str, str]] = (),
+                       category: str = "") -> str:
+    """Full article page HTML (same structure as why-use-vpn). No date.
+    hero_record is the hero's build_images index entry, for a responsive <picture>; related is
+    [(slug, title)] for the related-articles section; category is the listing label."""
     title_esc = title.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
     excerpt_esc = excerpt.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <title>{title_esc} — VPNsurf.com Blog</title>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1, shrink-to-fit=no">
-    <meta name="description" content="{excerpt_esc}">
-    <link rel="canonical" href="https://vpnsurf.com/articles/{slug}/">
-    <link rel="preconnect" href="https://fonts.gstatic.com">
-    <link href="https://fonts.cdnfonts.com/css/inter?styles=135009,135005,135007,135002,135000" rel="stylesheet" />
-    <link rel="stylesheet" href="../../css/tailwind/tailwind.min.css">
-    <link rel="icon" type="image/png" sizes="32x32" href="../../favicon.png">
-    <script src="https://cdn.jsdelivr.net/npm/alpinejs@3.13.3/dist/cdn.min.js" defer></script>
-</head>
-<body class="antialiased bg-body text-body font-body">
-    <div class="">
-      <section class="bg-gradient-to-r from-neutral-950 via-neutral-900 to-neutral-950" x-data="{{ mobileNavOpen: false }}">
-        <div class="container px-4 mx-auto">
-          <nav class="flex justify-between items-center py-8">
-            <a href="../../" class="text-xl font-semibold text-transparent bg-clip-text bg-gradient-to-r from-gray-100 to-gray-300">VPNsurf.com</a>
-            <div class="lg:hidden">
-              <button x-on:click="mobileNavOpen = !mobileNavOpen" class="block hover:text-white text-neutral-300 focus:outline-none transition-colors duration-200">
-                <svg xmlns="http://www.w3.org/2000/svg" class="h-6 w-6" fill="currentColor" viewbox="0 0 20 20"><path d="M0 3h20v2H0V3zm0 6h20v2H0V9zm0 6h20v2H0v-2z"></path></svg>
-              </button>
-            </div>
-            <ul class="hidden lg:flex ml-auto mr-8 items-center w-auto space-x-8">
-              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../../">Home</a></li>
-              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../">Blog</a></li>
-              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../../faq/">FAQ</a></li>
-              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../../glossary/">Glossary</a></li>
-            </ul>
-            <a class="hidden lg:block px-4 py-2 text-sm font-semibold text-neutral-950 bg-white hover:bg-neutral-100 rounded-full transition-all duration-200 hover:shadow-lg" href="#">Get Started</a>
-          </nav>
-          <div class="ad-banner ad-banner-top w-full bg-neutral-900/80 border-y border-neutral-800 py-3">
-            <div class="container px-4 mx-auto max-w-4xl">
-          <a href="https://gdfn.com" target="_blank" rel="noopener noreferrer" class="block rounded-lg overflow-hidden border border-neutral-700 shadow-lg hover:border-neutral-600 transition-colors" aria-label="Advertisement">
-            <img src="../../banner-ads/gdfn.com-728x90-xyz.gif" width="728" height="90" alt="Advertisement" class="w-full h-auto block"/>
-          </a>
-            </div>
-          </div>
-          <section class="pt-12 pb-20">
+    content = f'''          <section class="pt-12 pb-20">
             <div class="max-w-3xl mx-auto">
               <a href="../" class="inline-flex items-center text-sm text-neutral-400 hover:text-white transition-colors duration-200 mb-6">← Back to Blog</a>
               <article class="relative">
@@ -229,7 +404,7 @@ def build_article_html(slug: str, title: str, excerpt: str, body_html: str, hero
                       <p class="text-lg text-neutral-400">{excerpt_esc}</p>
                     </header>
                     <figure class="mb-10 rounded-xl overflow-hidden border border-neutral-800 p-1 bg-neutral-900">
-                      <img src="../../pictures/{hero_img}" alt="{title_esc}" class="w-full h-64 md:h-80 object-cover rounded-lg"/>
+                      {picture_html(hero_img, hero_record, "../../", title_esc, HERO_CLASS, HERO_SIZES, eager=True)}
                     </figure>
                     <div class="article-body text-neutral-300 space-y-6 text-lg leading-relaxed [&_p]:leading-[1.75] [&_h2]:mt-10 [&_h2]:mb-3 [&_h2]:first:mt-0">
 {body_html}
@@ -237,95 +412,297 @@ def build_article_html(slug: str, title: str, excerpt: str, body_html: str, hero
                   </div>
                 </div>
               </article>
-            </div>
+{related_html(related)}            </div>
           </section>
-        </div>
-        <div :class="{{'block': mobileNavOpen, 'hidden': !mobileNavOpen}}" class="hidden fixed top-0 left-0 bottom-0 w-5/6 max-w-sm z-50">
-          <div x-on:click="mobileNavOpen = !mobileNavOpen" class="fixed inset-0 bg-neutral-950 opacity-75 filter blur-3xl"></div>
-          <nav class="relative flex flex-col py-6 px-6 w-full h-full bg-neutral-900 border-r border-neutral-800 overflow-y-auto">
-            <div class="flex items-center mb-12">
-              <a href="../../" class="mr-auto text-lg font-semibold text-white">VPNsurf.com</a>
-              <button x-on:click="mobileNavOpen = !mobileNavOpen"><svg xmlns="http://www.w3.org/2000/svg" class="h-6 w-6 text-neutral-400" fill="none" viewbox="0 0 24 24" stroke="currentColor"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12"></path></svg></button>
-            </div>
-            <ul>
-              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="../../">Home</a></li>
-              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="../">Blog</a></li>
-              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="../../faq/">FAQ</a></li>
-              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="../../glossary/">Glossary</a></li>
-            </ul>
-          </nav>
-        </div>
-      </section>
-
-      <footer class="py-20 bg-gradient-to-r from-neutral-950 via-neutral-900 to-neutral-950">
-        <div class="container px-4 mx-auto">
-          <div class="flex flex-wrap -mx-4 mb-8 lg:mb-16">
-            <div class="w-full lg:w-1/3 px-4 mb-12 lg:mb-0">
-              <a class="flex items-center text-white text-xl leading-none font-semibold" href="../../"><span class="text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-300 to-gray-100">VPNsurf.com</span></a>
-              <p class="mt-5 mb-6 max-w-xs text-neutral-300 leading-relaxed">Private, fast VPN for everyday browsing. No logs, no hassle.</p>
-              <div class="text-sm text-neutral-300 space-y-2">
-                <p><a href="mailto:info@vpnsurf.com" class="hover:text-white transition-colors duration-200">info@vpnsurf.com</a></p>
-                <p><a href="tel:+18552892773" class="hover:text-white transition-colors duration-200">1-855-289-2773</a></p>
-                <p><a href="tel:+18552892773" class="hover:text-white transition-colors duration-200">1-855-BUY-ASSET</a></p>
-              </div>
+'''
+    head_extra = ""
+    if category:
+        head_extra = f'    <meta property="article:section" content="{html_lib.escape(category)}">\n'
+    return render_page(
+        page_path(slug),
+        title=f"{title_esc} — VPNsurf.com Blog",
+        description=excerpt_esc,
+        canonical=f"https://vpnsurf.com/articles/{slug}/",
+        head_extra=head_extra,
+        content=content,
+        scripts=ALPINE_SCRIPT,
+    )
+
+
+def search_doc(title: str, excerpt: str, body_html: str) -> dict:
+    """Search document for an article (title and ## headings), recorded in the manifest for
+    scripts/build_search.py."""
+    headings = [html_lib.unescape(re.sub(r"<[^>]+>", "", h)) for h in H2_RE.findall(body_html)]
+    return {"title": title, "headings": headings, "excerpt": excerpt, "kind": "Article"}
+
+
+def article_terms(title: str, body_md: str) -> list[str]:
+    """Lowercase words of an article for its TF-IDF vector (link targets and stopwords left out)."""
+    text = MD_LINK_TARGET_RE.sub("]", f"{title}\n{body_md}").lower()
+    return [t for t in TERM_RE.findall(text) if t not in STOPWORDS]
+
+
+def _ranked(scores: list[tuple[int, float]], cap: int) -> list[int]:
+    """Indices of the cap best positive scores, best first; equal scores keep article order."""
+    ranked = sorted((-round(score, RELATED_DIGITS), j) for j, score in scores if score > 0)
+    return [j for _, j in ranked[:cap]]
+
+
+def _similar_numpy(rows: list[list[tuple[int, float]]], width: int, cap: int) -> list[list[int]]:
+    x = np.zeros((len(rows), width))
+    for i, row in enumerate(rows):
+        if row:
+            cols, weights = zip(*row)
+            x[i, list(cols)] = weights
+    k = min(cap, len(rows) - 1)
+    out: list[list[int]] = []
+    for start in range(0, len(rows), RELATED_BATCH):
+        block = x[start:start + RELATED_BATCH] @ x.T
+        block[np.arange(len(block)), np.arange(start, start + len(block))] = 0.0
+        # k-th best score per row; everything at or above it (ties included) is ranked exactly
+        kth = np.partition(block, block.shape[1] - k, axis=1)[:, -k]
+        for row, threshold in zip(block, kth):
+            cols = np.nonzero(row >= threshold)[0]
+            out.append(_ranked(list(zip(cols.tolist(), row[cols].tolist())), cap))
+    return out
+
+
+def _similar_python(rows: list[list[tuple[int, float]]], cap: int) -> list[list[int]]:
+    postings: dict[int, list[tuple[int, float]]] = {}
+    for i, row in enumerate(rows):
+        for col, weight in row:
+            postings.setdefault(col, []).append((i, weight))
+    out = []
+    for i, row in enumerate(rows):
+        scores: dict[int, float] = {}
+        for col, weight in row:
+            for j, other in postings[col]:
+                if j != i:
+                    scores[j] = scores.get(j, 0.0) + weight * other
+        out.append(_ranked(list(scores.items()), cap))
+    return out
+
+
+def related_articles(docs: list[list[str]], cap: int = RELATED_CAP) -> list[list[int]]:
+    """For each article's terms, the indices of up to cap other articles with the most similar
+    TF-IDF vectors (cosine), best first. With NumPy all similarities come from batched matrix
+    products; without it from an inverted index over the same sparse vectors."""
+    if len(docs) < 2:
+        return [[] for _ in docs]
+    counts = [Counter(doc) for doc in docs]
+    df = Counter(term for c in counts for term in c)
+    vocab_terms = sorted((t for t, n in df.items() if n > 1), key=lambda t: (-df[t], t))[:RELATED_MAX_TERMS]
+    vocab = {t: i for i, t in enumerate(vocab_terms)}
+    idf = [math.log((1 + len(docs)) / (1 + df[t])) + 1 for t in vocab_terms]
+    rows = []
+    for c in counts:
+        row = sorted((vocab[t], (1 + math.log(n)) * idf[vocab[t]]) for t, n in c.items() if t in vocab)
+        norm = math.sqrt(sum(w * w for _, w in row)) or 1.0
+        rows.append([(col, w / norm) for col, w in row])
+    if np is not None:
+        return _similar_numpy(rows, len(vocab), cap)
+    return _similar_python(rows, cap)
+
+
+def related_html(related: list[tuple[str, str]]) -> str:
+    """Related-articles section for an article page; related is [(slug, title)]."""
+    if not related:
+        return ""
+    items = "\n".join(
+        f'                  <li><a href="../{slug}/" class="text-cyan-400 hover:underline">{html_lib.escape(title)}</a></li>'
+        for slug, title in related
+    )
+    return f'''              <section class="mt-12 pt-8 border-t border-neutral-800">
+                <h2 class="text-lg font-semibold text-white mb-3">Related articles</h2>
+                <ul class="space-y-2 text-neutral-300">
+{items}
+                </ul>
+              </section>
+'''
+
+
+def handmade_cards(claimed: set[str]) -> list[dict]:
+    """Listing cards for article pages in public/articles/<slug>/index.html that no source file
+    builds (claimed: rel paths this builder owns), read from their h1, description, section meta
+    and first picture."""
+    cards = []
+    for index in sorted((PUBLIC / "articles").glob("*/index.html")):
+        rel = index.relative_to(PUBLIC).as_posix()
+        if rel in claimed:
+            continue
+        page = index.read_text(encoding="utf-8")
+        h1 = H1_RE.search(page)
+        if h1 is None:
+            continue
+        meta = {name: "".join(values) for name, *values in META_RE.findall(page)}
+        hero = HERO_IMG_RE.search(page)
+        cards.append({
+            "slug": index.parent.name,
+            "title": html_lib.unescape(re.sub(r"<[^>]+>", "", h1.group(1)).strip()),
+            "summary": html_lib.unescape(meta.get("description", "")),
+            "category": html_lib.unescape(meta.get("article:section", "")),
+            "hero": HASHED_RE.sub(r"\1\2", unquote(hero.group(1))) if hero else "",
+        })
+    return cards
+
+
+def listing_page(n: int) -> Page:
+    """Page n (from 1) of the blog listing."""
+    return Page("articles/index.html", "../") if n == 1 else Page(f"articles/page/{n}/index.html", "../../../")
+
+
+def build_listing_html(n: int, pages: int, cards: list[dict], images: dict[str, dict]) -> str:
+    """Blog listing page n of pages: a card per article, with previous/next links."""
+    here = listing_page(n)
+    root = here.prefix
+    items = []
+    for i, card in enumerate(cards):
+        title_esc = html_lib.escape(card["title"])
+        picture = ""
+        if card["hero"]:
+            picture = f'''
+                    <div class="relative h-48 mb-6">
+                      {picture_html(card["hero"], images.get(card["hero"]), root, title_esc, LISTING_CARD_CLASS, LISTING_CARD_SIZES, eager=n == 1 and i < 2)}
+                    </div>'''
+        category = ""
+        if card["category"]:
+            category = f'''
+                    <span class="text-xs font-medium text-neutral-400">{html_lib.escape(card["category"])}</span>'''
+        items.append(f'''              <div class="w-full md:w-1/2 px-4 mb-12">
+                <a href="{root}articles/{card["slug"]}/" class="block p-1 border border-white border-opacity-20 rounded-2xl group">
+                  <div class="bg-gradient-to-t from-neutral-900 to-cyan-950/30 border border-white border-opacity-20 p-8 pb-10 rounded-xl">{picture}{category}
+                    <h2 class="mb-2 mt-2 text-xl font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-200 to-gray-300 group-hover:from-white transition-colors">{title_esc}</h2>
+                    <p class="mb-4 text-neutral-300 leading-relaxed text-sm">{html_lib.escape(card["summary"])}</p>
+                    <span class="inline-flex items-center text-sm font-semibold text-white">Read more <svg class="ml-1 w-4 h-4 group-hover:translate-x-1 transition-transform" fill="none" viewbox="0 0 24 24" stroke="currentColor"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 5l7 7-7 7"></path></svg></span>
+                  </div>
+                </a>
+              </div>''')
+    nav_links = []
+    head_links = []
+    for label, rel, target in (("← Newer", "prev", n - 1), ("Older →", "next", n + 1)):
+        if 1 <= target <= pages:
+            url = listing_page(target).path.removesuffix("index.html")
+            nav_links.append(f'<a href="{root}{url}" rel="{rel}" class="text-cyan-400 hover:underline">{label}</a>')
+            head_links.append(f'    <link rel="{rel}" href="https://vpnsurf.com/{url}">\n')
+    pager = ""
+    if pages > 1:
+        pager = (f'            <nav class="flex gap-6 px-4 text-sm text-neutral-400" aria-label="Pages">'
+                 f'<span>Page {n} of {pages}</span>{"".join(nav_links)}</nav>\n')
+    page_note = f" (page {n} of {pages})" if n > 1 else ""
+    items_html = "\n".join(items)
+    content = f'''          <section class="pt-8 pb-16">
+            <div class="max-w-3xl mx-auto mb-12">
+              <h1 class="text-3xl md:text-4xl font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 to-gray-300 mb-4">Blog{page_note}</h1>
+              <p class="text-neutral-400">VPN guides, privacy tips, and security advice—everything you need to browse safely and stream without borders.</p>
             </div>
-            <div class="w-full lg:w-2/3 px-4">
-              <div class="flex flex-wrap justify-between">
-                <div class="w-1/2 lg:w-1/4 mb-8 lg:mb-0">
-                  <h3 class="mb-6 text-lg font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-200 to-gray-300">Site</h3>
-                  <ul class="text-sm">
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../../">Home</a></li>
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../">Blog</a></li>
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../../faq/">FAQ</a></li>
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../../glossary/">Glossary</a></li>
-                  </ul>
-                </div>
-                <div class="w-1/2 lg:w-1/4 mb-8 lg:mb-0">
-                  <h3 class="mb-6 text-lg font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-200 to-gray-300">Legal</h3>
-                  <ul class="text-sm">
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="#">Privacy</a></li>
-                    <li><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="#">Terms</a></li>
-                  </ul>
-                </div>
-              </div>
+            <div class="flex flex-wrap -mx-4">
+{items_html}
             </div>
-          </div>
-          <div class="border-t border-neutral-700 pt-8">
-            <p class="lg:text-center text-sm text-neutral-400">© VPNsurf.com. All rights reserved.</p>
-          </div>
-        </div>
-      </footer>
-      <div class="ad-banner ad-banner-bottom w-full bg-neutral-900/80 border-y border-neutral-800 py-3">
-        <div class="container px-4 mx-auto max-w-4xl">
-          <a href="https://gdfn.com" target="_blank" rel="noopener noreferrer" class="block rounded-lg overflow-hidden border border-neutral-700 shadow-lg hover:border-neutral-600 transition-colors" aria-label="Advertisement">
-            <img src="../../banner-ads/gdfn.com-728x90-xyz.gif" width="728" height="90" alt="Advertisement" class="w-full h-auto block"/>
-          </a>
-        </div>
-      </div>
-    </div>
-    <script type="text/javascript" src="https://cdn.jsdelivr.net/npm/alpinejs@3.13.3/dist/cdn.min.js" defer></script>
-</body>
-</html>
+{pager}          </section>
 '''
+    return render_page(
+        here.path,
+        title=f"Blog{page_note} — VPN guides, privacy tips, and security advice | VPNsurf.com",
+        description="Read VPNsurf.com’s blog: why use a VPN, streaming and travel guides, secure browsing tips, and privacy advice.",
+        canonical=f"https://vpnsurf.com/{here.path.removesuffix('index.html')}",
+        head_extra="".join(head_links),
+        content=content,
+        scripts=ALPINE_SCRIPT,
+    )
+
+
+def render_article_chunk(
+    chunk: list[tuple[Path, str, str, dict | None, list[tuple[str, str]]]],
+) -> list[tuple[str, list[str], dict]]:
+    """Parse and render a chunk of (md_path, slug, hero_img, hero_record, related). Returns [(html, slots
+    not placed, search document)] in the same order; integrations are filled in by page hooks before the
+    page is written."""
+    out = []
+    for md_path, slug, hero_img, hero_record, related in chunk:
+        meta, title, excerpt, body_md = read_article(md_path)
+        body_html = render_markdown(body_md)
+        html = build_article_html(slug, title, excerpt, body_html, hero_img, hero_record, related, meta.get("category", ""))
+        out.append((*apply_hooks(html, Page(page_path(slug), "../../")), search_doc(title, excerpt, body_html)))
+    return out
 
 
 def main() -> None:
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-    # Only process 01- through 10- *.md (exclude glossary and README)
-    md_files = sorted(SOURCE_DIR.glob("*.md"))
-    generated = []
-    for i, md_path in enumerate(md_files):
-        slug = slug_from_filename(md_path.name)
-        if slug is None:
+    parser = argparse.ArgumentParser(description="Build article pages from numbered markdown.")
+    parser.add_argument("--force", action="store_true", help="ignore the build manifest and rebuild every page")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="worker processes for articles (0 = all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="convert markdown without the on-disk cache")
+    args = parser.parse_args()
+    manifest = BuildManifest("articles", force=args.force)
+    here = Path(__file__)
+    code = code_hash(here, here.with_name("build_images.py"), here.with_name("layout.py"), *HOOK_SOURCES)
+    articles = discover_articles(SOURCE_DIR)
+    # One read of every article (front matter, title, excerpt, body) for related articles and the listing
+    infos = [read_article(md_path) for md_path, _, _ in articles]
+    related_idx = related_articles([article_terms(title, body_md) for _, title, _, body_md in infos])
+    claimed = {page_path(slug) for _, slug, _ in articles}
+    handmade = handmade_cards(claimed | set(manifest.entries))
+    # Hero variants first; a re-encoded hero changes its record and so rebuilds the page
+    heroes = {hero_img for _, _, hero_img in articles} | {card["hero"] for card in handmade if card["hero"]}
+    images = build_variants(sorted(heroes), args.jobs, args.force)
+    pending: list[tuple[Path, str, str, dict | None, list[tuple[str, str]]]] = []
+    keys: list[str] = []
+    for (md_path, slug, hero_img), picks in zip(articles, related_idx):
+        hero_record = images.get(hero_img)
+        related = [(articles[j][1], infos[j][1]) for j in picks]
+        key = content_hash(code, MD_VERSION, md_path.read_bytes(), slug, hero_img, json.dumps(hero_record, sort_keys=True),
+                           json.dumps(related))
+        if manifest.is_fresh(PUBLIC / page_path(slug), key):
             continue
-        title, excerpt, body_html = parse_article(md_path)
-        hero_img = PICTURES[i % len(PICTURES)]
-        html = build_article_html(slug, title, excerpt, body_html, hero_img)
-        out_path = OUT_DIR / f"{slug}.html"
-        out_path.write_text(html, encoding="utf-8")
-        generated.append((slug, title, excerpt, hero_img))
+        pending.append((md_path, slug, hero_img, hero_record, related))
+        keys.append(key)
+    missing_by_page: dict[str, list[str]] = {}
+    cache = None if args.no_cache else DiskCache("markdown", MD_CACHE_BYTES)
+    # Workers read the parent's media index (banner hooks need image dimensions) and never refresh it
+    rendered = map_chunks(render_article_chunk, pending, args.jobs, _init_worker, (cache, media_index()))
+    for (_, slug, _, _, _), key, (html, missing, doc) in zip(pending, keys, rendered):
+        out_path = PUBLIC / page_path(slug)
+        manifest.write_text(out_path, key, html, url=f"/articles/{slug}/", slots_missing=missing, search=doc)
+        missing_by_page[page_path(slug)] = missing
         print(f"Wrote {out_path}")
-    print(f"Generated {len(generated)} article(s).")
+    articles_written = manifest.written
+    # Blog listing: hand-made pages, then articles in file order
+    cards = handmade + [
+        {"slug": slug, "title": title, "summary": meta.get("summary") or excerpt,
+         "category": meta.get("category", ""), "hero": hero_img}
+        for (_, slug, hero_img), (meta, title, excerpt, _) in zip(articles, infos)
+    ]
+    pages = max(1, -(-len(cards) // LISTING_PAGE_SIZE))
+    for n in range(1, pages + 1):
+        page = listing_page(n)
+        chunk = cards[(n - 1) * LISTING_PAGE_SIZE:n * LISTING_PAGE_SIZE]
+        key = content_hash(code, json.dumps([n, pages, chunk, [images.get(c["hero"]) for c in chunk]], sort_keys=True))
+        out_path = PUBLIC / page.path
+        if manifest.is_fresh(out_path, key):
+            continue
+        html, missing = apply_hooks(build_listing_html(n, pages, chunk, images), page)
+        manifest.write_text(out_path, key, html, url="/" + page.path.removesuffix("index.html"),
+                            slots_missing=missing, stub=False)
+        missing_by_page[page.path] = missing
+    # Pages whose source was deleted or changed slug (with their redirect stub) and surplus listing pages
+    removed = 0
+    for path in manifest.unclaimed():
+        path.unlink(missing_ok=True)
+        stub = path.parent.with_suffix(".html")
+        if stub.exists() and is_redirect_stub(stub):
+            stub.unlink()
+        for parent in path.parents:
+            if parent == PUBLIC / "articles" or any(parent.iterdir()):
+                break
+            parent.rmdir()
+        removed += 1
+    manifest.save()
+    print(f"Generated {articles_written} article(s) and {manifest.written - articles_written} of {pages} listing "
+          f"page(s), {manifest.skipped} unchanged, {removed} removed.")
+    if cache is not None and pending:
+        kept, size, evicted = cache.prune()
+        print(f"Markdown cache: {kept} entries, {size // 1024} KiB, {evicted} evicted.")
+    for line in coverage_lines(missing_by_page):
+        print(line)
 
 
 if __name__ == "__main__":
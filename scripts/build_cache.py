@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Content-addressed on-disk cache for pure, expensive conversions (markdown to HTML).
+Entries live in .build/cache/<name>/<key[:2]>/<key>, where the key is a hash of everything the
+output depends on, so a stale entry can never be returned and nothing needs invalidating.
+A hit refreshes the entry's mtime; prune() evicts least recently used entries until the cache
+fits its byte budget. Safe to share between worker processes (writes are atomic renames)."""
+import os
+from pathlib import Path
+
+from build_manifest import MANIFEST_DIR, write_atomic
+
+CACHE_DIR = MANIFEST_DIR / "cache"
+
+
+class DiskCache:
+    """Text values by hex key under CACHE_DIR/name, at most max_bytes after prune()."""
+
+    def __init__(self, name: str, max_bytes: int):
+        self.dir = CACHE_DIR / name
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.dir / key[:2] / key
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+            os.utime(path)  # most recently used
+        except FileNotFoundError:
+            return None
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        write_atomic(self._path(key), text)
+
+    def prune(self) -> tuple[int, int, int]:
+        """Evict least recently used entries until the cache fits max_bytes.
+        Returns (entries kept, bytes kept, entries evicted)."""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.dir):
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                st = path.stat()
+                entries.append((st.st_mtime_ns, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        return len(entries) - evicted, total, evicted
@@ -1,19 +1,134 @@
 #!/usr/bin/env python3
-"""Build public/glossary.html (index with A–Z) and public/glossary/<slug>.html (per-term pages).
-Run from repo root. No dates. Updates sitemap with term URLs."""
+"""Build public/glossary/index.html (index with A–Z) and public/glossary/<slug>/index.html (per-term
+pages), written straight to their clean URLs (/glossary/, /glossary/<slug>/). Run from repo root. No dates. Term URLs are recorded in the build manifest for scripts/build_sitemap.py.
+Incremental: only pages whose inputs changed since the last build are re-rendered (--force rebuilds all).
+Pages of renamed or deleted terms are removed together with their redirect stub.
+--jobs N renders term pages in N worker processes (0 = one per core); output is identical to --jobs 1.
+Above INDEX_SHARD_AT terms (or with --index sharded) the index becomes an A–Z landing page plus
+glossary/letter/<l>/[<n>/]index.html pages and <n>.json fragments the landing page loads on demand."""
+import argparse
 import html
 import json
 import re
+import sys
 from pathlib import Path
+from typing import NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from build_manifest import BuildManifest, code_hash, content_hash  # noqa: E402
+from build_parallel import map_chunks  # noqa: E402
+from clean_urls import is_redirect_stub  # noqa: E402
+from integrations.page_hooks import HOOK_SOURCES, Page, apply_hooks, coverage_lines  # noqa: E402
+from layout import render_page  # noqa: E402
+from media_index import media_index, use_index  # noqa: E402
+from term_linker import TermLinker  # noqa: E402
 
 ROOT = Path(__file__).resolve().parent.parent
 SOURCE = ROOT / "source" / "articles" / "vpnsurf_vpn_glossary_100_terms.md"
 PUBLIC = ROOT / "public"
-OUT_INDEX = PUBLIC / "glossary.html"
-OUT_GLOSSARY_DIR = PUBLIC / "glossary"
-SITEMAP = PUBLIC / "sitemap.xml"
 BASE = "https://vpnsurf.com"
 RELATED_CAP = 10
+# Characters of the definition shown under a search result
+SEARCH_EXCERPT = 120
+# --related weighted: score per occurrence in the definition, per back-reference, per shared definition
+RELATED_WEIGHT_MENTION = 3.0
+RELATED_WEIGHT_BACKLINK = 2.0
+RELATED_WEIGHT_COMENTION = 0.5
+# Output locations under public/, for layout links and page hooks
+INDEX_PAGE = Page("glossary/index.html", "../")
+OUT_INDEX = PUBLIC / INDEX_PAGE.path
+# Search loader written by scripts/build_search.py
+SEARCH_SCRIPT = '    <script src="../search/search.js" defer></script>\n'
+# --index auto: one page with every term up to this many terms, sharded by letter above it
+INDEX_SHARD_AT = 1000
+# Terms per letter page and per fragment in the sharded index (--index-page-size)
+INDEX_PAGE_SIZE = 250
+LETTER_DIR = "glossary/letter"
+LETTER_LINK_CLASS = "inline-block w-8 h-8 text-center leading-8 rounded hover:bg-neutral-700 text-neutral-300 font-medium"
+TERM_LIST_CLASS = "space-y-2 text-neutral-300"
+LETTER_HEADING_CLASS = "text-xl font-semibold text-white mb-4 border-b border-neutral-700 pb-2"
+MORE_BUTTON_CLASS = "mt-6 px-4 py-2 rounded-lg border border-neutral-700 text-neutral-300 hover:text-white"
+# Sharded landing page: letter links load glossary/letter/<l>/<n>.json in place instead of navigating.
+# Classes come from data-*-class attributes on the region, which scripts/purge_css.py scans.
+LETTER_LOADER_JS = """    <script>
+(function () {
+  "use strict";
+  var region = document.getElementById("glossary-letter");
+  var fragments = {};
+
+  function load(base, page) {
+    var url = base + page + ".json";
+    return fragments[url] || (fragments[url] = fetch(url).then(function (r) {
+      if (!r.ok) throw new Error(url + ": " + r.status);
+      return r.json();
+    }));
+  }
+
+  function show(link, page) {
+    load(link.getAttribute("data-letter"), page).then(function (data) {
+      var list = region.querySelector("ul");
+      if (page === 1 || !list) {
+        region.textContent = "";
+        var heading = document.createElement("h2");
+        heading.className = region.getAttribute("data-heading-class") || "";
+        heading.textContent = data.letter;
+        list = document.createElement("ul");
+        list.className = region.getAttribute("data-list-class") || "";
+        region.appendChild(heading);
+        region.appendChild(list);
+      }
+      data.terms.forEach(function (t) {
+        var li = document.createElement("li");
+        var a = document.createElement("a");
+        a.href = "./" + t[1] + "/";
+        a.className = region.getAttribute("data-link-class") || "";
+        a.textContent = t[0];
+        li.appendChild(a);
+        list.appendChild(li);
+      });
+      var more = region.querySelector("button");
+      if (more) region.removeChild(more);
+      if (page < data.pages) {
+        more = document.createElement("button");
+        more.type = "button";
+        more.className = region.getAttribute("data-more-class") || "";
+        more.textContent = "Show more " + data.letter + " terms";
+        more.addEventListener("click", function () { show(link, page + 1); });
+        region.appendChild(more);
+      }
+    }).catch(function () { location.href = link.href; });
+  }
+
+  Array.prototype.forEach.call(document.querySelectorAll("[data-letter]"), function (link) {
+    link.addEventListener("click", function (event) {
+      event.preventDefault();
+      history.replaceState(null, "", "#" + link.id);
+      show(link, 1);
+    });
+    if (location.hash === "#" + link.id) show(link, 1);
+  });
+})();
+    </script>
+"""
+
+
+def term_page(slug: str) -> Page:
+    return Page(f"glossary/{slug}/index.html", "../../")
+
+
+def letter_slug(letter: str) -> str:
+    """URL segment for a letter of the sharded index: a-z and 0-9, "other" for #, u<hex> otherwise."""
+    if letter == "#":
+        return "other"
+    return letter.lower() if letter.isascii() else f"u{ord(letter):x}"
+
+
+def letter_page(letter: str, page: int) -> Page:
+    """Page n of a letter in the sharded index: glossary/letter/<l>/ then glossary/letter/<l>/<n>/."""
+    if page == 1:
+        return Page(f"{LETTER_DIR}/{letter_slug(letter)}/index.html", "../../../")
+    return Page(f"{LETTER_DIR}/{letter_slug(letter)}/{page}/index.html", "../../../../")
+
 
 # Strip this line from definitions (and variants)
 VPNSURF_LINE_RE = re.compile(
@@ -71,32 +186,13 @@ def first_letter(term: str) -> str:
 def linkify_definition(
     raw_definition: str,
     current_term: str,
-    term_names_by_len: list[str],
+    linker: TermLinker,
     term_to_slug: dict[str, str],
 ) -> str:
-    """Replace other term names in raw_definition with links (longest-first, no overlap)."""
-    other_terms = [t for t in term_names_by_len if t != current_term]
-    if not other_terms:
-        return html.escape(raw_definition)
-    # Collect all matches (start, end, term_name), longest first per position
-    intervals: list[tuple[int, int, str]] = []
-    for term in other_terms:
-        slug = term_to_slug.get(term)
-        if not slug:
-            continue
-        # Word-boundary match so "Port" does not match inside "important" or "airports"
-        pattern = r"\b" + re.escape(term) + r"\b"
-        for m in re.finditer(pattern, raw_definition, re.IGNORECASE):
-            intervals.append((m.start(), m.end(), term))
-    # Sort by start, then by length descending so longer wins
-    intervals.sort(key=lambda x: (x[0], -(x[1] - x[0])))
-    # Drop overlaps: keep only if no kept interval contains this one
-    kept: list[tuple[int, int, str]] = []
-    for s, e, t in intervals:
-        if any(k[0] <= s and k[1] >= e for k in kept):
-            continue
-        kept.append((s, e, t))
-    kept.sort(key=lambda x: x[0])
+    """Replace other term names in raw_definition with links (longest-first, no overlap).
+    linker is built once per build over all term names; one pass over the definition."""
+    # Word-boundary matches only, so "Port" does not match inside "important" or "airports"
+    kept = [(s, e, t) for s, e, t in linker.find(raw_definition, exclude=current_term) if t in term_to_slug]
     # Build output
     parts: list[str] = []
     pos = 0
@@ -109,30 +205,91 @@ def linkify_definition(
     return "".join(parts)
 
 
-def related_terms(
-    current_term: str,
-    current_slug: str,
-    letter: str,
+class MentionIndex(NamedTuple):
+    """Who-mentions-whom across all definitions, computed once per build. Positions index terms_with_slugs."""
+    mentions: list[dict[int, int]]  # term -> {term mentioned in its definition: occurrences}
+    mentioned_by: list[list[int]]  # term -> terms whose definitions mention it
+    letter_of: list[str]
+    letter_groups: dict[str, list[int]]  # letter -> terms in by_letter (index page) order
+
+
+def build_mention_index(
     terms_with_slugs: list[tuple[str, str, str]],
     by_letter: dict[str, list[tuple[str, str, str]]],
-    raw_definition: str,
+    linker: TermLinker,
+) -> MentionIndex:
+    """One linker pass per definition. A mention is any whole-word occurrence, including ones
+    inside a longer linked term (so "VPN" counts inside "VPN server", as it always has)."""
+    positions_by_name: dict[str, list[int]] = {}
+    for i, (term, _, _) in enumerate(terms_with_slugs):
+        positions_by_name.setdefault(term, []).append(i)
+    mentions: list[dict[int, int]] = []
+    mentioned_by: list[list[int]] = [[] for _ in terms_with_slugs]
+    for i, (_, raw_def, _) in enumerate(terms_with_slugs):
+        counts: dict[int, int] = {}
+        for _, _, idx in linker.matches(raw_def):
+            for j in positions_by_name.get(linker.terms[idx], ()):
+                counts[j] = counts.get(j, 0) + 1
+        mentions.append(counts)
+        for j in counts:
+            mentioned_by[j].append(i)
+    position_by_slug = {slug: i for i, (_, _, slug) in enumerate(terms_with_slugs)}
+    letter_of = [first_letter(term) for term, _, _ in terms_with_slugs]
+    letter_groups = {
+        letter: [position_by_slug[slug] for _, _, slug in group] for letter, group in by_letter.items()
+    }
+    return MentionIndex(mentions, mentioned_by, letter_of, letter_groups)
+
+
+def _weighted_candidates(i: int, index: MentionIndex) -> list[int]:
+    """Terms connected to term i by mentions, best first: mentioned in its definition (per occurrence),
+    mentioning it back, and co-mentioned with it in other definitions."""
+    scores: dict[int, float] = {}
+    for j, count in index.mentions[i].items():
+        scores[j] = scores.get(j, 0) + RELATED_WEIGHT_MENTION * count
+    for j in index.mentioned_by[i]:
+        scores[j] = scores.get(j, 0) + RELATED_WEIGHT_BACKLINK
+        # Terms sharing a definition with term i
+        for k in index.mentions[j]:
+            scores[k] = scores.get(k, 0) + RELATED_WEIGHT_COMENTION
+    scores.pop(i, None)
+    return sorted(scores, key=lambda j: (-scores[j], j))
+
+
+def related_terms(
+    i: int,
+    terms_with_slugs: list[tuple[str, str, str]],
+    index: MentionIndex,
+    weighted: bool = False,
 ) -> list[tuple[str, str]]:
-    """Same-letter + in-definition, dedupe by slug, cap at RELATED_CAP. Return [(term, slug)]."""
+    """Same-letter + in-definition, dedupe by slug, cap at RELATED_CAP. Return [(term, slug)].
+    weighted=True ranks mention-connected terms first and fills up with same-letter neighbors."""
     related: list[tuple[str, str]] = []
-    seen_slugs: set[str] = {current_slug}
-    # Same letter first
-    for t, _, slug in by_letter.get(letter, []):
-        if slug != current_slug and slug not in seen_slugs:
-            related.append((t, slug))
-            seen_slugs.add(slug)
-    # Then in-definition (term names that appear as whole words in raw_definition)
-    for t, _, slug in terms_with_slugs:
-        if slug in seen_slugs:
-            continue
-        if re.search(r"\b" + re.escape(t) + r"\b", raw_definition, re.IGNORECASE):
-            related.append((t, slug))
-            seen_slugs.add(slug)
-    return related[:RELATED_CAP]
+    seen_slugs: set[str] = {terms_with_slugs[i][2]}
+
+    def add(positions) -> None:
+        for j in positions:
+            if len(related) >= RELATED_CAP:
+                return
+            t, _, slug = terms_with_slugs[j]
+            if slug not in seen_slugs:
+                related.append((t, slug))
+                seen_slugs.add(slug)
+
+    if weighted:
+        add(_weighted_candidates(i, index))
+        add(index.letter_groups[index.letter_of[i]])
+    else:
+        # Same letter first, then terms named in the definition (in glossary order)
+        add(index.letter_groups[index.letter_of[i]])
+        add(sorted(index.mentions[i]))
+    return related
+
+
+def sorted_letters(by_letter: dict[str, list[tuple[str, str, str]]]) -> list[str]:
+    """Index order: # first, then the rest sorted."""
+    letters = sorted(c for c in by_letter.keys() if c != "#")
+    return ["#"] + letters if "#" in by_letter else letters
 
 
 def build_index_html(
@@ -140,13 +297,8 @@ def build_index_html(
     by_letter: dict[str, list[tuple[str, str, str]]],
 ) -> str:
     """Main glossary index with A–Z strip and term links."""
-    letters = sorted(c for c in by_letter.keys() if c != "#")
-    if "#" in by_letter:
-        letters = ["#"] + letters
-    letter_links = " ".join(
-        f'<a href="#letter-{c}" class="inline-block w-8 h-8 text-center leading-8 rounded hover:bg-neutral-700 text-neutral-300 font-medium">{c}</a>'
-        for c in letters
-    )
+    letters = sorted_letters(by_letter)
+    letter_links = " ".join(f'<a href="#letter-{c}" class="{LETTER_LINK_CLASS}">{c}</a>' for c in letters)
     sections = []
     for letter in letters:
         group = by_letter[letter]
@@ -155,58 +307,18 @@ def build_index_html(
             term_esc = html.escape(term)
             terms_html.append(f'<li><a href="./{slug}/" class="text-cyan-400 hover:underline">{term_esc}</a></li>')
         section = f'''              <section id="letter-{letter}" class="mb-12">
-                <h2 class="text-xl font-semibold text-white mb-4 border-b border-neutral-700 pb-2">{letter}</h2>
-                <ul class="space-y-2 text-neutral-300">
+                <h2 class="{LETTER_HEADING_CLASS}">{letter}</h2>
+                <ul class="{TERM_LIST_CLASS}">
 {chr(10).join(terms_html)}
                 </ul>
               </section>'''
         sections.append(section)
 
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <title>VPN &amp; Security Glossary — VPNsurf.com</title>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1, shrink-to-fit=no">
-    <meta name="description" content="100+ VPN and security terms defined: encryption, kill switch, no-logs, WireGuard, DNS leak, and more. Browse by letter or term.">
-    <link rel="canonical" href="{BASE}/glossary/">
-    <link rel="preconnect" href="https://fonts.gstatic.com">
-    <link href="https://fonts.cdnfonts.com/css/inter?styles=135009,135005,135007,135002,135000" rel="stylesheet" />
-    <link rel="stylesheet" href="../css/tailwind/tailwind.min.css">
-    <link rel="icon" type="image/png" sizes="32x32" href="../favicon.png">
-    <script src="https://cdn.jsdelivr.net/npm/alpinejs@3.13.3/dist/cdn.min.js" defer></script>
-</head>
-<body class="antialiased bg-body text-body font-body">
-    <div class="">
-      <section class="bg-gradient-to-r from-neutral-950 via-neutral-900 to-neutral-950" x-data="{{ mobileNavOpen: false }}">
-        <div class="container px-4 mx-auto">
-          <nav class="flex justify-between items-center py-8">
-            <a href="../" class="text-xl font-semibold text-transparent bg-clip-text bg-gradient-to-r from-gray-100 to-gray-300">VPNsurf.com</a>
-            <div class="lg:hidden">
-              <button x-on:click="mobileNavOpen = !mobileNavOpen" class="block hover:text-white text-neutral-300 focus:outline-none transition-colors duration-200">
-                <svg xmlns="http://www.w3.org/2000/svg" class="h-6 w-6" fill="currentColor" viewbox="0 0 20 20"><path d="M0 3h20v2H0V3zm0 6h20v2H0V9zm0 6h20v2H0v-2z"></path></svg>
-              </button>
-            </div>
-            <ul class="hidden lg:flex ml-auto mr-8 items-center w-auto space-x-8">
-              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../">Home</a></li>
-              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../articles/">Blog</a></li>
-              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../faq/">FAQ</a></li>
-              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="./">Glossary</a></li>
-            </ul>
-            <a class="hidden lg:block px-4 py-2 text-sm font-semibold text-neutral-950 bg-white hover:bg-neutral-100 rounded-full transition-all duration-200 hover:shadow-lg" href="#">Get Started</a>
-          </nav>
-          <div class="ad-banner ad-banner-top w-full bg-neutral-900/80 border-y border-neutral-800 py-3">
-            <div class="container px-4 mx-auto max-w-4xl">
-              <a href="https://gdfn.com" target="_blank" rel="noopener noreferrer" class="block rounded-lg overflow-hidden border border-neutral-700 shadow-lg hover:border-neutral-600 transition-colors" aria-label="Advertisement">
-                <img src="../banner-ads/gdfn.com-728x90-xyz.gif" width="728" height="90" alt="Advertisement" class="w-full h-auto block"/>
-              </a>
-            </div>
-          </div>
-          <section class="pt-8 pb-20">
+    content = f'''          <section class="pt-8 pb-20">
             <div class="max-w-3xl mx-auto">
               <h1 class="text-3xl md:text-4xl font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 to-gray-300 mb-2">VPN &amp; security glossary</h1>
               <p class="text-neutral-400 mb-6">Short definitions for terms we use on VPNsurf.com. Browse by letter or open any term for the full definition and related terms.</p>
-              <nav class="flex flex-wrap gap-1 mb-10" aria-label="Jump to letter">
+{_search_box()}              <nav class="flex flex-wrap gap-1 mb-10" aria-label="Jump to letter">
                 {letter_links}
               </nav>
               <div class="space-y-0">
@@ -215,73 +327,160 @@ def build_index_html(
               <p class="mt-12 text-neutral-400 text-sm"><a href="../" class="text-cyan-400 hover:underline">← Back to home</a></p>
             </div>
           </section>
-        </div>
-        <div :class="{{'block': mobileNavOpen, 'hidden': !mobileNavOpen}}" class="hidden fixed top-0 left-0 bottom-0 w-5/6 max-w-sm z-50">
-          <div x-on:click="mobileNavOpen = !mobileNavOpen" class="fixed inset-0 bg-neutral-950 opacity-75 filter blur-3xl"></div>
-          <nav class="relative flex flex-col py-6 px-6 w-full h-full bg-neutral-900 border-r border-neutral-800 overflow-y-auto">
-            <div class="flex items-center mb-12">
-              <a href="../" class="mr-auto text-lg font-semibold text-white">VPNsurf.com</a>
-              <button x-on:click="mobileNavOpen = !mobileNavOpen"><svg xmlns="http://www.w3.org/2000/svg" class="h-6 w-6 text-neutral-400" fill="none" viewbox="0 0 24 24" stroke="currentColor"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12"></path></svg></button>
-            </div>
-            <ul>
-              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="../">Home</a></li>
-              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="../articles/">Blog</a></li>
-              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="../faq/">FAQ</a></li>
-              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="./">Glossary</a></li>
-            </ul>
-          </nav>
-        </div>
-      </section>
-
-      <div class="ad-banner ad-banner-bottom w-full bg-neutral-900/80 border-y border-neutral-800 py-3">
-        <div class="container px-4 mx-auto max-w-4xl">
-          <a href="https://gdfn.com" target="_blank" rel="noopener noreferrer" class="block rounded-lg overflow-hidden border border-neutral-700 shadow-lg hover:border-neutral-600 transition-colors" aria-label="Advertisement">
-            <img src="../banner-ads/gdfn.com-728x90-xyz.gif" width="728" height="90" alt="Advertisement" class="w-full h-auto block"/>
-          </a>
-        </div>
-      </div>
-      <footer class="py-20 bg-gradient-to-r from-neutral-950 via-neutral-900 to-neutral-950">
-        <div class="container px-4 mx-auto">
-          <div class="flex flex-wrap -mx-4 mb-8 lg:mb-16">
-            <div class="w-full lg:w-1/3 px-4 mb-12 lg:mb-0">
-              <a class="flex items-center text-white text-xl leading-none font-semibold" href="../"><span class="text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-300 to-gray-100">VPNsurf.com</span></a>
-              <p class="mt-5 mb-6 max-w-xs text-neutral-300 leading-relaxed">Private, fast VPN for everyday browsing. No logs, no hassle.</p>
-              <div class="text-sm text-neutral-300 space-y-2">
-                <p><a href="mailto:info@vpnsurf.com" class="hover:text-white transition-colors duration-200">info@vpnsurf.com</a></p>
-                <p><a href="tel:+18552892773" class="hover:text-white transition-colors duration-200">1-855-289-2773</a></p>
-                <p><a href="tel:+18552892773" class="hover:text-white transition-colors duration-200">1-855-BUY-ASSET</a></p>
+'''
+    return render_page(
+        INDEX_PAGE.path,
+        title="VPN &amp; Security Glossary — VPNsurf.com",
+        description="100+ VPN and security terms defined: encryption, kill switch, no-logs, WireGuard, DNS leak, and more. Browse by letter or term.",
+        canonical=f"{BASE}/glossary/",
+        content=content,
+        scripts=SEARCH_SCRIPT,
+    )
+
+
+def _search_box() -> str:
+    return '''              <div class="mb-10">
+                <input type="search" data-search aria-controls="search-results" aria-label="Search the glossary and blog" placeholder="Search terms and articles…" autocomplete="off" class="w-full px-4 py-3 rounded-lg bg-neutral-900 border border-neutral-700 text-white focus:outline-none">
+                <ul id="search-results" class="mt-4 space-y-2 text-neutral-300" aria-live="polite" data-link-class="text-cyan-400 hover:underline" data-kind-class="text-neutral-400 text-sm"></ul>
               </div>
+'''
+
+
+def build_landing_html(letters: list[str], counts: dict[str, int]) -> str:
+    """Sharded glossary index: search and an A–Z strip only, so its size does not grow with the
+    glossary. Each letter links to its static letter page (for crawlers and without JS); with JS the
+    letter's terms are fetched from glossary/letter/<l>/<n>.json and shown in place, a page at a time."""
+    letter_links = " ".join(
+        f'<a href="letter/{letter_slug(c)}/" id="letter-{letter_slug(c)}" data-letter="letter/{letter_slug(c)}/" '
+        f'title="{counts[c]} term{"s" if counts[c] != 1 else ""}" class="{LETTER_LINK_CLASS}">{html.escape(c)}</a>'
+        for c in letters
+    )
+    total = sum(counts.values())
+    content = f'''          <section class="pt-8 pb-20">
+            <div class="max-w-3xl mx-auto">
+              <h1 class="text-3xl md:text-4xl font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 to-gray-300 mb-2">VPN &amp; security glossary</h1>
+              <p class="text-neutral-400 mb-6">Short definitions for terms we use on VPNsurf.com. Search, or browse {total:,} terms by letter and open any term for the full definition and related terms.</p>
+{_search_box()}              <nav class="flex flex-wrap gap-1 mb-10" aria-label="Browse by letter">
+                {letter_links}
+              </nav>
+              <div id="glossary-letter" aria-live="polite" data-heading-class="{LETTER_HEADING_CLASS}" data-list-class="{TERM_LIST_CLASS}"
+                   data-link-class="text-cyan-400 hover:underline" data-more-class="{MORE_BUTTON_CLASS}"></div>
+              <p class="mt-12 text-neutral-400 text-sm"><a href="../" class="text-cyan-400 hover:underline">← Back to home</a></p>
             </div>
-            <div class="w-full lg:w-2/3 px-4">
-              <div class="flex flex-wrap justify-between">
-                <div class="w-1/2 lg:w-1/4 mb-8 lg:mb-0">
-                  <h3 class="mb-6 text-lg font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-200 to-gray-300">Site</h3>
-                  <ul class="text-sm">
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../">Home</a></li>
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../articles/">Blog</a></li>
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../faq/">FAQ</a></li>
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="./">Glossary</a></li>
-                  </ul>
-                </div>
-                <div class="w-1/2 lg:w-1/4 mb-8 lg:mb-0">
-                  <h3 class="mb-6 text-lg font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-200 to-gray-300">Legal</h3>
-                  <ul class="text-sm">
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="#">Privacy</a></li>
-                    <li><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="#">Terms</a></li>
-                  </ul>
-                </div>
-              </div>
+          </section>
+'''
+    return render_page(
+        INDEX_PAGE.path,
+        title="VPN &amp; Security Glossary — VPNsurf.com",
+        description=f"{total:,} VPN and security terms defined: encryption, kill switch, no-logs, WireGuard, DNS leak, and more. Browse by letter or term.",
+        canonical=f"{BASE}/glossary/",
+        content=content,
+        scripts=SEARCH_SCRIPT + LETTER_LOADER_JS,
+    )
+
+
+def build_letter_page_html(
+    letter: str,
+    page: int,
+    pages: int,
+    terms: list[tuple[str, str]],
+    letters: list[str],
+) -> str:
+    """Static page n of a letter in the sharded index: every term on it as a plain link, with
+    previous/next links so crawlers reach every term page without running the loader."""
+    here = letter_page(letter, page)
+    root = here.prefix
+    current = ' aria-current="page"'
+    letter_links = " ".join(
+        f'<a href="{root}{LETTER_DIR}/{letter_slug(c)}/" class="{LETTER_LINK_CLASS}"'
+        f'{current if c == letter else ""}>{html.escape(c)}</a>'
+        for c in letters
+    )
+    terms_html = "\n".join(
+        f'<li><a href="{root}glossary/{slug}/" class="text-cyan-400 hover:underline">{html.escape(t)}</a></li>' for t, slug in terms
+    )
+    nav_links = []
+    head_links = []
+    for label, rel, target in (("← Previous", "prev", page - 1), ("Next →", "next", page + 1)):
+        if 1 <= target <= pages:
+            url = f"{root}{LETTER_DIR}/{letter_slug(letter)}/" + (f"{target}/" if target > 1 else "")
+            nav_links.append(f'<a href="{url}" rel="{rel}" class="text-cyan-400 hover:underline">{label}</a>')
+            head_links.append(f'    <link rel="{rel}" href="{BASE}/{letter_page(letter, target).path.removesuffix("index.html")}">\n')
+    pager = ""
+    if pages > 1:
+        pager = (f'              <nav class="flex gap-6 mt-10 text-sm text-neutral-400" aria-label="Pages">'
+                 f'<span>Page {page} of {pages}</span>{"".join(nav_links)}</nav>\n')
+    letter_esc = html.escape(letter)
+    page_note = f" (page {page} of {pages})" if pages > 1 else ""
+    content = f'''          <section class="pt-8 pb-20">
+            <div class="max-w-3xl mx-auto">
+              <p class="text-neutral-400 text-sm mb-4"><a href="{root}" class="text-cyan-400 hover:underline">Home</a> → <a href="{root}glossary/" class="text-cyan-400 hover:underline">Glossary</a> → <span class="text-white">{letter_esc}</span></p>
+              <h1 class="text-3xl md:text-4xl font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 to-gray-300 mb-6">Glossary: {letter_esc}{page_note}</h1>
+              <nav class="flex flex-wrap gap-1 mb-10" aria-label="Browse by letter">
+                {letter_links}
+              </nav>
+              <ul class="{TERM_LIST_CLASS}">
+{terms_html}
+              </ul>
+{pager}              <p class="mt-12 text-neutral-400 text-sm"><a href="{root}glossary/" class="text-cyan-400 hover:underline">← Back to glossary</a></p>
             </div>
-          </div>
-          <div class="border-t border-neutral-700 pt-8">
-            <p class="lg:text-center text-sm text-neutral-400">© VPNsurf.com. All rights reserved.</p>
-          </div>
-        </div>
-      </footer>
-    </div>
-</body>
-</html>
+          </section>
 '''
+    return render_page(
+        here.path,
+        title=f"Glossary: {letter_esc}{page_note} — VPNsurf.com",
+        description=f"VPN and security terms starting with {letter_esc}{page_note}.",
+        canonical=f"{BASE}/{here.path.removesuffix('index.html')}",
+        head_extra="".join(head_links),
+        content=content,
+    )
+
+
+def letter_pages(by_letter: dict[str, list[tuple[str, str, str]]], page_size: int):
+    """(letter, page number, page count, [(term, slug)]) for every page of the sharded index."""
+    for letter in sorted_letters(by_letter):
+        terms = [(t, slug) for t, _, slug in by_letter[letter]]
+        pages = max(1, -(-len(terms) // page_size))
+        for n in range(1, pages + 1):
+            yield letter, n, pages, terms[(n - 1) * page_size:n * page_size]
+
+
+def write_sharded_index(
+    manifest: BuildManifest,
+    by_letter: dict[str, list[tuple[str, str, str]]],
+    code: str,
+    page_size: int,
+    missing_by_page: dict[str, list[str]],
+) -> None:
+    """Landing page plus, per letter, static pages and JSON fragments of page_size terms each."""
+    letters = sorted_letters(by_letter)
+    counts = {c: len(by_letter[c]) for c in letters}
+    landing_key = content_hash(code, "sharded", json.dumps([[c, letter_slug(c), counts[c]] for c in letters]))
+    if not manifest.is_fresh(OUT_INDEX, landing_key):
+        landing, missing = apply_hooks(build_landing_html(letters, counts), INDEX_PAGE)
+        manifest.write_text(OUT_INDEX, landing_key, landing, url="/glossary/", slots_missing=missing)
+        missing_by_page[INDEX_PAGE.path] = missing
+    for letter, n, pages, chunk in letter_pages(by_letter, page_size):
+        key = content_hash(code, json.dumps([letter, n, pages, chunk, letters]))
+        page = letter_page(letter, n)
+        out = PUBLIC / page.path
+        if not manifest.is_fresh(out, key):
+            page_html, missing = apply_hooks(build_letter_page_html(letter, n, pages, chunk, letters), page)
+            manifest.write_text(out, key, page_html, url="/" + page.path.removesuffix("index.html"),
+                                slots_missing=missing, stub=False)
+            missing_by_page[page.path] = missing
+        fragment = PUBLIC / LETTER_DIR / letter_slug(letter) / f"{n}.json"
+        if not manifest.is_fresh(fragment, key):
+            data = {"letter": letter, "page": n, "pages": pages, "terms": chunk}
+            manifest.write_text(fragment, key, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+
+
+def search_doc(term: str, raw_definition: str) -> dict:
+    """Search document for a term page, recorded in the manifest for scripts/build_search.py."""
+    excerpt = raw_definition if len(raw_definition) <= SEARCH_EXCERPT else (
+        raw_definition[:SEARCH_EXCERPT].rsplit(" ", 1)[0] + "…"
+    )
+    return {"title": term, "excerpt": excerpt, "kind": "Glossary"}
 
 
 def term_page_html(
@@ -319,50 +518,7 @@ def term_page_html(
         "inDefinedTermSet": {"@type": "DefinedTermSet", "name": "VPN & Security Glossary", "url": f"{BASE}/glossary/"},
     }
     schema_json = json.dumps(schema_ld, ensure_ascii=False)
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <title>{title_esc}</title>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1, shrink-to-fit=no">
-    <meta name="description" content="{meta_desc}">
-    <link rel="canonical" href="{BASE}/glossary/{slug}/">
-    <link rel="preconnect" href="https://fonts.gstatic.com">
-    <link href="https://fonts.cdnfonts.com/css/inter?styles=135009,135005,135007,135002,135000" rel="stylesheet" />
-    <link rel="stylesheet" href="../../css/tailwind/tailwind.min.css">
-    <link rel="icon" type="image/png" sizes="32x32" href="../../favicon.png">
-    <script src="https://cdn.jsdelivr.net/npm/alpinejs@3.13.3/dist/cdn.min.js" defer></script>
-    <script type="application/ld+json">
-{schema_json}
-    </script>
-</head>
-<body class="antialiased bg-body text-body font-body">
-    <div class="">
-      <section class="bg-gradient-to-r from-neutral-950 via-neutral-900 to-neutral-950" x-data="{{ mobileNavOpen: false }}">
-        <div class="container px-4 mx-auto">
-          <nav class="flex justify-between items-center py-8">
-            <a href="../../" class="text-xl font-semibold text-transparent bg-clip-text bg-gradient-to-r from-gray-100 to-gray-300">VPNsurf.com</a>
-            <div class="lg:hidden">
-              <button x-on:click="mobileNavOpen = !mobileNavOpen" class="block hover:text-white text-neutral-300 focus:outline-none transition-colors duration-200">
-                <svg xmlns="http://www.w3.org/2000/svg" class="h-6 w-6" fill="currentColor" viewbox="0 0 20 20"><path d="M0 3h20v2H0V3zm0 6h20v2H0V9zm0 6h20v2H0v-2z"></path></svg>
-              </button>
-            </div>
-            <ul class="hidden lg:flex ml-auto mr-8 items-center w-auto space-x-8">
-              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../../">Home</a></li>
-              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../../articles/">Blog</a></li>
-              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../../faq/">FAQ</a></li>
-              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../">Glossary</a></li>
-            </ul>
-            <a class="hidden lg:block px-4 py-2 text-sm font-semibold text-neutral-950 bg-white hover:bg-neutral-100 rounded-full transition-all duration-200 hover:shadow-lg" href="#">Get Started</a>
-          </nav>
-          <div class="ad-banner ad-banner-top w-full bg-neutral-900/80 border-y border-neutral-800 py-3">
-            <div class="container px-4 mx-auto max-w-4xl">
-              <a href="https://gdfn.com" target="_blank" rel="noopener noreferrer" class="block rounded-lg overflow-hidden border border-neutral-700 shadow-lg hover:border-neutral-600 transition-colors" aria-label="Advertisement">
-                <img src="../../banner-ads/gdfn.com-728x90-xyz.gif" width="728" height="90" alt="Advertisement" class="w-full h-auto block"/>
-              </a>
-            </div>
-          </div>
-          <section class="pt-8 pb-20">
+    content = f'''          <section class="pt-8 pb-20">
             <div class="max-w-3xl mx-auto">
               <p class="text-neutral-400 text-sm mb-4"><a href="../../" class="text-cyan-400 hover:underline">Home</a> → <a href="../" class="text-cyan-400 hover:underline">Glossary</a> → <span class="text-white">{term_esc}</span></p>
               <h1 class="text-3xl md:text-4xl font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 to-gray-300 mb-6">{term_esc}</h1>
@@ -373,96 +529,62 @@ def term_page_html(
               <p class="mt-10 text-neutral-400 text-sm"><a href="../" class="text-cyan-400 hover:underline">← Back to glossary</a></p>
             </div>
           </section>
-        </div>
-        <div :class="{{'block': mobileNavOpen, 'hidden': !mobileNavOpen}}" class="hidden fixed top-0 left-0 bottom-0 w-5/6 max-w-sm z-50">
-          <div x-on:click="mobileNavOpen = !mobileNavOpen" class="fixed inset-0 bg-neutral-950 opacity-75 filter blur-3xl"></div>
-          <nav class="relative flex flex-col py-6 px-6 w-full h-full bg-neutral-900 border-r border-neutral-800 overflow-y-auto">
-            <div class="flex items-center mb-12">
-              <a href="../../" class="mr-auto text-lg font-semibold text-white">VPNsurf.com</a>
-              <button x-on:click="mobileNavOpen = !mobileNavOpen"><svg xmlns="http://www.w3.org/2000/svg" class="h-6 w-6 text-neutral-400" fill="none" viewbox="0 0 24 24" stroke="currentColor"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12"></path></svg></button>
-            </div>
-            <ul>
-              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="../../">Home</a></li>
-              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="../../articles/">Blog</a></li>
-              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="../../faq/">FAQ</a></li>
-              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="../">Glossary</a></li>
-            </ul>
-          </nav>
-        </div>
-      </section>
-
-      <div class="ad-banner ad-banner-bottom w-full bg-neutral-900/80 border-y border-neutral-800 py-3">
-        <div class="container px-4 mx-auto max-w-4xl">
-          <a href="https://gdfn.com" target="_blank" rel="noopener noreferrer" class="block rounded-lg overflow-hidden border border-neutral-700 shadow-lg hover:border-neutral-600 transition-colors" aria-label="Advertisement">
-            <img src="../../banner-ads/gdfn.com-728x90-xyz.gif" width="728" height="90" alt="Advertisement" class="w-full h-auto block"/>
-          </a>
-        </div>
-      </div>
-      <footer class="py-20 bg-gradient-to-r from-neutral-950 via-neutral-900 to-neutral-950">
-        <div class="container px-4 mx-auto">
-          <div class="flex flex-wrap -mx-4 mb-8 lg:mb-16">
-            <div class="w-full lg:w-1/3 px-4 mb-12 lg:mb-0">
-              <a class="flex items-center text-white text-xl leading-none font-semibold" href="../../"><span class="text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-300 to-gray-100">VPNsurf.com</span></a>
-              <p class="mt-5 mb-6 max-w-xs text-neutral-300 leading-relaxed">Private, fast VPN for everyday browsing. No logs, no hassle.</p>
-              <div class="text-sm text-neutral-300 space-y-2">
-                <p><a href="mailto:info@vpnsurf.com" class="hover:text-white transition-colors duration-200">info@vpnsurf.com</a></p>
-                <p><a href="tel:+18552892773" class="hover:text-white transition-colors duration-200">1-855-289-2773</a></p>
-                <p><a href="tel:+18552892773" class="hover:text-white transition-colors duration-200">1-855-BUY-ASSET</a></p>
-              </div>
-            </div>
-            <div class="w-full lg:w-2/3 px-4">
-              <div class="flex flex-wrap justify-between">
-                <div class="w-1/2 lg:w-1/4 mb-8 lg:mb-0">
-                  <h3 class="mb-6 text-lg font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-200 to-gray-300">Site</h3>
-                  <ul class="text-sm">
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../../">Home</a></li>
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../../articles/">Blog</a></li>
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../../faq/">FAQ</a></li>
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="../">Glossary</a></li>
-                  </ul>
-                </div>
-                <div class="w-1/2 lg:w-1/4 mb-8 lg:mb-0">
-                  <h3 class="mb-6 text-lg font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-200 to-gray-300">Legal</h3>
-                  <ul class="text-sm">
-                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="#">Privacy</a></li>
-                    <li><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="#">Terms</a></li>
-                  </ul>
-                </div>
-              </div>
-            </div>
-          </div>
-          <div class="border-t border-neutral-700 pt-8">
-            <p class="lg:text-center text-sm text-neutral-400">© VPNsurf.com. All rights reserved.</p>
-          </div>
-        </div>
-      </footer>
-    </div>
-</body>
-</html>
 '''
+    return render_page(
+        term_page(slug).path,
+        title=title_esc,
+        description=meta_desc,
+        canonical=f"{BASE}/glossary/{slug}/",
+        head_extra=f'    <script type="application/ld+json">\n{schema_json}\n    </script>\n',
+        content=content,
+    )
 
 
-def update_sitemap(slugs: list[str]) -> None:
-    """Insert glossary term URLs after the glossary/ line in sitemap.xml."""
-    if not SITEMAP.exists():
-        return
-    text = SITEMAP.read_text(encoding="utf-8")
-    marker = "<url><loc>https://vpnsurf.com/glossary/</loc></url>"
-    if marker not in text:
-        return
-    lines = text.split("\n")
-    new_lines = []
-    inserted = False
-    for line in lines:
-        new_lines.append(line)
-        if marker in line and not inserted:
-            for s in slugs:
-                new_lines.append(f"  <url><loc>{BASE}/glossary/{s}/</loc></url>")
-            inserted = True
-    SITEMAP.write_text("\n".join(new_lines), encoding="utf-8")
+# Per-build state shared with term-page workers (set once per process by _init_worker)
+_WORKER: dict = {}
+
+
+def _init_worker(state: dict) -> None:
+    _WORKER.clear()
+    _WORKER.update(state)
+    use_index(state["media"])
+
+
+def render_term_chunk(chunk: list[int]) -> list[tuple[str, str, str | None, list[str]]]:
+    """Linkify, relate and render a chunk of term positions. Returns [(slug, key, html, slots not placed)];
+    html is None when the page's inputs match the key it was last built from."""
+    out = []
+    for i in chunk:
+        term, raw_def, slug = _WORKER["terms_with_slugs"][i]
+        definition_linked = linkify_definition(raw_def, term, _WORKER["linker"], _WORKER["term_to_slug"])
+        related = related_terms(i, _WORKER["terms_with_slugs"], _WORKER["mentions"], _WORKER["weighted"])
+        # Key on the rendered inputs: a renamed or re-slugged term changes definition_linked/related
+        # of every page that links to it, so exactly those pages are rebuilt.
+        key = content_hash(_WORKER["code"], term, slug, raw_def, definition_linked, json.dumps(related))
+        if _WORKER["built_keys"].get(slug) == key:
+            out.append((slug, key, None, []))
+            continue
+        page = term_page_html(term, slug, raw_def, definition_linked, related, _WORKER["term_to_slug"])
+        out.append((slug, key, *apply_hooks(page, term_page(slug))))
+    return out
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Build glossary index and term pages.")
+    parser.add_argument("--force", action="store_true", help="ignore the build manifest and rebuild every page")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="worker processes for term pages (0 = all cores)")
+    parser.add_argument(
+        "--related", choices=("letter", "weighted"), default="letter",
+        help="related terms: same letter then in-definition (default), or ranked by mention weights",
+    )
+    parser.add_argument(
+        "--index", choices=("auto", "single", "sharded"), default="auto",
+        help=f"index page: every term on one page, or an A–Z landing page with per-letter pages "
+             f"(auto: sharded above {INDEX_SHARD_AT} terms)",
+    )
+    parser.add_argument("--index-page-size", type=int, default=INDEX_PAGE_SIZE,
+                        help=f"terms per letter page in the sharded index (default {INDEX_PAGE_SIZE})")
+    args = parser.parse_args()
     if not SOURCE.exists():
         print(f"Glossary source not found: {SOURCE}")
         return
@@ -477,26 +599,72 @@ def main() -> None:
     for letter in by_letter:
         by_letter[letter].sort(key=lambda x: x[0].lower())
 
-    OUT_INDEX.parent.mkdir(parents=True, exist_ok=True)
-    OUT_GLOSSARY_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = BuildManifest("glossary", force=args.force)
+    code = code_hash(Path(__file__), Path(__file__).with_name("layout.py"), *HOOK_SOURCES)
+    missing_by_page: dict[str, list[str]] = {}
 
-    index_html = build_index_html(terms_with_slugs, by_letter)
-    OUT_INDEX.write_text(index_html, encoding="utf-8")
-    print(f"Wrote index to {OUT_INDEX}")
+    sharded = args.index == "sharded" or (args.index == "auto" and len(terms_with_slugs) > INDEX_SHARD_AT)
+    if sharded:
+        write_sharded_index(manifest, by_letter, code, max(1, args.index_page_size), missing_by_page)
+        print(f"Sharded index: {len(by_letter)} letter(s), up to {max(1, args.index_page_size)} terms per page")
+    else:
+        # The index only depends on term names and slugs, not on definitions
+        index_key = content_hash(code, json.dumps(
+            sorted((letter, [(t, s) for t, _, s in group]) for letter, group in by_letter.items())
+        ))
+        if manifest.is_fresh(OUT_INDEX, index_key):
+            print(f"Index unchanged: {OUT_INDEX}")
+        else:
+            index_html, missing = apply_hooks(build_index_html(terms_with_slugs, by_letter), INDEX_PAGE)
+            manifest.write_text(OUT_INDEX, index_key, index_html, url="/glossary/", slots_missing=missing)
+            missing_by_page[INDEX_PAGE.path] = missing
+            print(f"Wrote index to {OUT_INDEX}")
 
-    for term, raw_def, slug in terms_with_slugs:
-        definition_linked = linkify_definition(
-            raw_def, term, term_names_by_len, term_to_slug
-        )
-        letter = first_letter(term)
-        related = related_terms(term, slug, letter, terms_with_slugs, by_letter, raw_def)
-        html_out = term_page_html(term, slug, raw_def, definition_linked, related, term_to_slug)
-        out_path = OUT_GLOSSARY_DIR / f"{slug}.html"
-        out_path.write_text(html_out, encoding="utf-8")
-
-    print(f"Wrote {len(terms_with_slugs)} term pages to {OUT_GLOSSARY_DIR}/")
-    update_sitemap([s for _, _, s in terms_with_slugs])
-    print(f"Updated {SITEMAP}")
+    linker = TermLinker(term_names_by_len)
+    state = {
+        "linker": linker,
+        "term_to_slug": term_to_slug,
+        "terms_with_slugs": terms_with_slugs,
+        "mentions": build_mention_index(terms_with_slugs, by_letter, linker),
+        "weighted": args.related == "weighted",
+        "code": code,
+        "built_keys": {slug: manifest.key_for(PUBLIC / term_page(slug).path) for _, _, slug in terms_with_slugs},
+        # Refreshed once here; workers only read it (banner hooks need image dimensions)
+        "media": media_index(),
+    }
+    results = map_chunks(render_term_chunk, range(len(terms_with_slugs)), args.jobs, _init_worker, (state,))
+    for i, ((term, raw_def, _), (slug, key, html_out, missing)) in enumerate(zip(terms_with_slugs, results)):
+        page = term_page(slug)
+        out_path = PUBLIC / page.path
+        if html_out is None:
+            if manifest.is_fresh(out_path, key):
+                continue
+            # Changed or removed since built_keys was taken: render it here, ignoring the stale key
+            _init_worker({**state, "built_keys": {}})
+            [(_, _, html_out, missing)] = render_term_chunk([i])
+        manifest.write_text(out_path, key, html_out, url=f"/glossary/{slug}/", slots_missing=missing,
+                            search=search_doc(term, raw_def))
+        missing_by_page[page.path] = missing
+
+    # Pages of renamed or deleted terms (with their redirect stub), and letter pages and fragments
+    # from an earlier sharded build that this one did not produce
+    removed = 0
+    for path in manifest.unclaimed():
+        path.unlink(missing_ok=True)
+        stub = path.parent.with_suffix(".html")
+        if path.name == "index.html" and stub.exists() and is_redirect_stub(stub):
+            stub.unlink()
+        for parent in path.parents:
+            if parent == PUBLIC / "glossary" or any(parent.iterdir()):
+                break
+            parent.rmdir()
+        removed += 1
+    if removed:
+        print(f"Removed {removed} stale term page(s), letter page(s) and fragment(s)")
+    print(f"Glossary pages: {manifest.summary()}")
+    for line in coverage_lines(missing_by_page):
+        print(line)
+    manifest.save()
 
 
 if __name__ == "__main__":
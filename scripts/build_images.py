@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Build responsive image variants for source/pictures into public/img/. Run from repo root.
+scripts/build_articles.py calls build_variants() for the pictures its pages reference; run this file
+to encode others (default: every picture) for hand-maintained pages. Each picture gets resized AVIF
+and WebP files (animated GIFs: animated WebP only) and a tiny blurred placeholder, indexed in
+.build/images.json by source hash so unchanged pictures are not re-encoded. Needs Pillow; without it
+nothing is encoded and pages keep plain <img> tags.
+--jobs N encodes in N worker processes (0 = one per core)."""
+import argparse
+import base64
+import io
+import json
+import os
+import re
+from pathlib import Path
+
+from build_manifest import MANIFEST_DIR, content_hash
+from build_parallel import map_chunks
+from media_index import dimensions, media_index
+
+try:
+    from PIL import Image, ImageFilter, ImageSequence, features
+except ImportError:
+    Image = None  # variants are optional
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCE_DIR = ROOT / "source" / "pictures"
+OUT_DIR = ROOT / "public" / "img"
+INDEX = MANIFEST_DIR / "images.json"
+# 2: variant names include the source extension
+INDEX_VERSION = 2
+# <variant>.<hash>.<ext> copies belong to scripts/fingerprint_assets.py, which removes its stale ones
+FINGERPRINTED_RE = re.compile(r"^.+\.[0-9a-f]{10}\.[A-Za-z0-9]+$")
+EXTENSIONS = {".gif", ".jpeg", ".jpg", ".png", ".webp"}
+# Variant widths in px; none wider than the source. Article heroes are at most ~700 CSS px wide.
+WIDTHS = (480, 960, 1440)
+WEBP_QUALITY = 75
+AVIF_QUALITY = 50
+PLACEHOLDER_WIDTH = 16
+# Changing any encoder setting re-encodes every picture
+SETTINGS = json.dumps([WIDTHS, WEBP_QUALITY, AVIF_QUALITY, PLACEHOLDER_WIDTH])
+
+
+def load_index() -> dict[str, dict]:
+    """Picture filename -> record ({"key", "width", "height", "placeholder", "variants"}), or {} if never built."""
+    try:
+        data = json.loads(INDEX.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data.get("images", {}) if data.get("version") == INDEX_VERSION else {}
+
+
+def _srcset(files: list[list], prefix: str) -> str:
+    return ", ".join(f"{prefix}img/{name} {width}w" for width, name in files)
+
+
+def picture_html(name: str, record: dict | None, prefix: str, alt: str, cls: str, sizes: str,
+                 eager: bool = False) -> str:
+    """<picture> markup for pictures/{name} with AVIF/WebP srcsets, intrinsic size and placeholder.
+    alt must already be HTML-escaped. record is load_index().get(name); without one this is a
+    plain <img>, with its intrinsic size from the media index when known.
+    eager=True for the page's LCP image (fetched at high priority); otherwise it is lazy-loaded."""
+    loading = 'fetchpriority="high"' if eager else 'loading="lazy"'
+    if record is None:
+        size = dimensions(f"pictures/{name}")
+        dims = f' width="{size[0]}" height="{size[1]}"' if size else ""
+        return f'<img src="{prefix}pictures/{name}"{dims} alt="{alt}" class="{cls}" {loading} decoding="async"/>'
+    sources = "".join(
+        f'<source type="image/{fmt}" srcset="{_srcset(files, prefix)}" sizes="{sizes}">'
+        for fmt, files in record["variants"].items()
+        if files
+    )
+    style = ""
+    if record.get("placeholder"):
+        style = f' style="background-size:cover;background-image:url({record["placeholder"]})"'
+    return (
+        f'<picture>{sources}<img src="{prefix}pictures/{name}" width="{record["width"]}" height="{record["height"]}"'
+        f' alt="{alt}" class="{cls}"{style} {loading} decoding="async"/></picture>'
+    )
+
+
+def _frames(im: "Image.Image", width: int, height: int) -> tuple[list["Image.Image"], list[int]]:
+    frames, durations = [], []
+    for frame in ImageSequence.Iterator(im):
+        frames.append(frame.convert("RGBA").resize((width, height), Image.LANCZOS))
+        durations.append(frame.info.get("duration", im.info.get("duration", 100)))
+    return frames, durations
+
+
+def _encode(im: "Image.Image", fmt: str, width: int, height: int, animated: bool) -> bytes:
+    buf = io.BytesIO()
+    if animated:
+        frames, durations = _frames(im, width, height)
+        frames[0].save(buf, fmt, save_all=True, append_images=frames[1:], duration=durations,
+                       loop=im.info.get("loop", 0), quality=WEBP_QUALITY, method=4)
+        return buf.getvalue()
+    frame = im.convert("RGBA" if _has_alpha(im) else "RGB").resize((width, height), Image.LANCZOS)
+    if fmt == "AVIF":
+        frame.save(buf, fmt, quality=AVIF_QUALITY)
+    else:
+        frame.save(buf, fmt, quality=WEBP_QUALITY, method=6)
+    return buf.getvalue()
+
+
+def _has_alpha(im: "Image.Image") -> bool:
+    return im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+
+
+def _placeholder(im: "Image.Image") -> str:
+    """Blurred PLACEHOLDER_WIDTH px WebP as a data: URI (a few hundred bytes)."""
+    height = max(1, round(im.height * PLACEHOLDER_WIDTH / im.width))
+    small = im.convert("RGB").resize((PLACEHOLDER_WIDTH, height), Image.BILINEAR).filter(ImageFilter.GaussianBlur(1))
+    buf = io.BytesIO()
+    small.save(buf, "WEBP", quality=30)
+    return "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def variant_widths(width: int) -> list[int]:
+    """WIDTHS below the source width, plus the source width capped at the largest."""
+    widths = [w for w in WIDTHS if w < width]
+    top = min(width, WIDTHS[-1])
+    if top not in widths:
+        widths.append(top)
+    return widths
+
+
+def encode_chunk(chunk: list[tuple[str, str]]) -> list[tuple[str, dict, dict[str, bytes]]]:
+    """Encode a chunk of (filename, key). Returns [(filename, record, {variant filename: data})]."""
+    out = []
+    avif = features.check("avif")
+    for name, key in chunk:
+        with Image.open(SOURCE_DIR / name) as im:
+            animated = getattr(im, "n_frames", 1) > 1
+            # x.png and x.gif must not share x-480.webp
+            base = name.rsplit(".", 1)[0] + "-" + Path(name).suffix.lstrip(".").lower()
+            formats = ["WEBP"] if animated or not avif else ["AVIF", "WEBP"]
+            files: dict[str, bytes] = {}
+            variants: dict[str, list] = {}
+            for fmt in formats:
+                ext = fmt.lower()
+                variants[ext] = []
+                for width in variant_widths(im.width):
+                    height = max(1, round(im.height * width / im.width))
+                    filename = f"{base}-{width}.{ext}"
+                    files[filename] = _encode(im, fmt, width, height, animated)
+                    variants[ext].append([width, filename])
+            im.seek(0)
+            record = {
+                "key": key,
+                "width": im.width,
+                "height": im.height,
+                "placeholder": None if _has_alpha(im) else _placeholder(im),
+                "variants": variants,
+            }
+        out.append((name, record, files))
+    return out
+
+
+def _outputs(record: dict) -> list[str]:
+    return [filename for files in record["variants"].values() for _, filename in files]
+
+
+def build_variants(names: list[str], jobs: int = 1, force: bool = False) -> dict[str, dict]:
+    """Encode variants for the given source/pictures filenames unless already current, and return the
+    full index. Entries for other pictures are kept while their source exists. Returns {} without Pillow."""
+    media = media_index()  # also without Pillow: plain <img> fallbacks take their size from it
+    if Image is None:
+        return {}
+    index = load_index()
+    avif = "avif" if features.check("avif") else "no-avif"
+    new_index = {name: rec for name, rec in index.items() if (SOURCE_DIR / name).exists() and name not in names}
+    pending: list[tuple[str, str]] = []
+    for name in names:
+        path = SOURCE_DIR / name
+        if path.suffix.lower() not in EXTENSIONS or not path.exists():
+            continue
+        # Content hash from the media index, so unchanged pictures are not read again
+        key = content_hash(SETTINGS, avif, media[f"pictures/{name}"]["hash"])
+        record = index.get(name)
+        if (not force and record is not None and record.get("key") == key
+                and all((OUT_DIR / f).exists() for f in _outputs(record))):
+            new_index[name] = record
+            continue
+        pending.append((name, key))
+    if not pending and new_index == index:
+        return index
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for name, record, files in map_chunks(encode_chunk, pending, jobs):
+        for filename, data in files.items():
+            # New inode via rename: a fingerprinted hardlink to the old file keeps the old bytes
+            tmp = OUT_DIR / f"{filename}.tmp"
+            tmp.write_bytes(data)
+            os.replace(tmp, OUT_DIR / filename)
+            written += len(data)
+        new_index[name] = record
+        print(f"Encoded {name}: {len(files)} variant(s)")
+    # Drop variants of pictures that were removed or re-encoded at other widths
+    live = {f for record in new_index.values() for f in _outputs(record)}
+    for path in OUT_DIR.iterdir():
+        if path.name not in live and not FINGERPRINTED_RE.match(path.name):
+            path.unlink()
+    MANIFEST_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = INDEX.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps({"version": INDEX_VERSION, "images": new_index}, indent=1, sort_keys=True),
+                   encoding="utf-8")
+    os.replace(tmp, INDEX)
+    print(f"Images: {len(pending)} encoded ({written // 1024} KiB), {len(names) - len(pending)} unchanged.")
+    return new_index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build responsive image variants for source/pictures.")
+    parser.add_argument("names", nargs="*", help="picture filenames (default: every picture in source/pictures)")
+    parser.add_argument("--force", action="store_true", help="re-encode the pictures even if unchanged")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="worker processes for encoding (0 = all cores)")
+    args = parser.parse_args()
+    if Image is None:
+        print("Pillow not installed; skipping image variants (pip install -r scripts/requirements.txt).")
+        return
+    names = args.names or sorted(p.name for p in SOURCE_DIR.iterdir() if p.suffix.lower() in EXTENSIONS)
+    build_variants(names, args.jobs, args.force)
+
+
+if __name__ == "__main__":
+    main()
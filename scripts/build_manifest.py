@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Persistent build manifest for incremental builds.
+Each builder keeps .build/<name>.json mapping every output file to a hash of the inputs
+that produced it (source text, template code, linked data) and a hash of the output itself.
+A page is only re-rendered when its input hash changes, its output file is missing, or the file
+no longer holds what the build left there (hand-edited, reverted). Later stages rewrite builder
+pages in place (CSS purge, fingerprinting, minify), so run this module after them to record the
+final files; freshness checks re-hash a file only when its size or mtime differ from the record."""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MANIFEST_DIR = ROOT / ".build"
+MANIFEST_VERSION = 1
+# Marks builder manifests among the other state files in MANIFEST_DIR (assets.json, sitemap.json, ...)
+MANIFEST_KIND = "pages"
+# NamedTemporaryFile creates files 0600; published files get the usual umask-derived mode instead
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def content_hash(*parts: str | bytes) -> str:
+    """sha256 hex digest of parts. Each part is length-prefixed so ("ab", "c") != ("a", "bc")."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(len(part).to_bytes(8, "big"))
+        h.update(part)
+    return h.hexdigest()
+
+
+def code_hash(*paths: Path) -> str:
+    """Hash of builder/template source files, so a template change invalidates every page it renders.
+    A missing file (e.g. an optional snippet) hashes as empty."""
+    return content_hash(*(p.read_bytes() if p.exists() else b"" for p in paths))
+
+
+def _rel(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Write text via a temporary file and rename, so readers never see a half-written page.
+    The temporary name is unique, so concurrent writers of the same path never share one."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, prefix=path.name + ".",
+                                     suffix=".tmp", delete=False) as f:
+        f.write(text)
+    try:
+        os.chmod(f.name, 0o666 & ~_UMASK)
+        os.replace(f.name, path)
+    except OSError:
+        os.unlink(f.name)
+        raise
+
+
+def _builder_manifests() -> list[tuple[Path, dict]]:
+    """(path, parsed data) of every builder manifest in MANIFEST_DIR, told from other state files there
+    by their "kind" field rather than by version or layout."""
+    found = []
+    for path in sorted(MANIFEST_DIR.glob("*.json")):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if data.get("kind") == MANIFEST_KIND and data.get("version") == MANIFEST_VERSION:
+            found.append((path, data))
+    return found
+
+
+def all_entries() -> dict[str, dict]:
+    """Entries of every builder's manifest, keyed by output path relative to the repo root."""
+    entries: dict[str, dict] = {}
+    for _, data in _builder_manifests():
+        entries.update(data.get("entries", {}))
+    return entries
+
+
+def built_outputs() -> set[Path]:
+    """Every output recorded by any builder's manifest (absolute paths). Post-processing steps use
+    this to leave builder pages alone, since those already had their integrations applied at render time."""
+    return {(ROOT / rel).resolve() for rel in all_entries()}
+
+
+class BuildManifest:
+    """Input/output hashes for one builder. Load at start of main(), call save() at the end.
+
+    Typical use:
+        if manifest.is_fresh(out_path, key):
+            continue
+        manifest.write_text(out_path, key, render(...))
+    """
+
+    def __init__(self, name: str, force: bool = False):
+        self.name = name
+        self.path = MANIFEST_DIR / f"{name}.json"
+        self.entries: dict[str, dict] = {}
+        self._seen: set[str] = set()
+        self.written = 0
+        self.skipped = 0
+        if not force and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if data.get("kind") == MANIFEST_KIND and data.get("version") == MANIFEST_VERSION:
+                self.entries = data.get("entries", {})
+
+    @staticmethod
+    def _intact(out_path: Path, entry: dict) -> bool:
+        """True if out_path still holds the content recorded in entry: as rendered ("hash") or as
+        sealed after post-processing ("final"). Re-hashes only when size or mtime changed, and then
+        records the new stat so the next check is cheap again."""
+        try:
+            st = out_path.stat()
+        except FileNotFoundError:
+            return False
+        if entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+            return True
+        digest = content_hash(out_path.read_bytes())
+        if digest not in (entry.get("hash"), entry.get("final")):
+            return False
+        entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns, final=digest)
+        return True
+
+    def is_fresh(self, out_path: Path, key: str) -> bool:
+        """True if out_path was last built from the same inputs and still holds what the build
+        left there. Marks it as kept."""
+        rel = _rel(out_path)
+        entry = self.entries.get(rel)
+        if entry is None or entry.get("key") != key or not self._intact(out_path, entry):
+            return False
+        self._seen.add(rel)
+        self.skipped += 1
+        return True
+
+    def key_for(self, out_path: Path) -> str | None:
+        """Input key out_path was last built from, or None if unknown or the output is missing or
+        changed. Lets worker processes decide freshness without a copy of the manifest."""
+        entry = self.entries.get(_rel(out_path))
+        if entry is None or not self._intact(out_path, entry):
+            return None
+        return entry.get("key")
+
+    def record(self, out_path: Path, key: str, data: str | bytes, **meta) -> None:
+        """Record that out_path was produced from inputs `key` with content `data`."""
+        rel = _rel(out_path)
+        digest = content_hash(data)
+        st = out_path.stat()
+        self.entries[rel] = {"key": key, "hash": digest, "final": digest, "size": st.st_size,
+                             "mtime_ns": st.st_mtime_ns, **meta}
+        self._seen.add(rel)
+
+    def write_text(self, out_path: Path, key: str, text: str, **meta) -> None:
+        """Write text to out_path (creating its directory; atomic rename) and record it."""
+        write_atomic(out_path, text)
+        self.record(out_path, key, text, **meta)
+        self.written += 1
+
+    def unclaimed(self) -> list[Path]:
+        """Outputs recorded by the previous build that this run has neither written nor kept
+        (absolute paths). Builders whose page set can shrink remove these before save()."""
+        return [ROOT / rel for rel in sorted(self.entries) if rel not in self._seen]
+
+    def save(self) -> None:
+        """Drop entries for outputs not produced this run and write the manifest atomically."""
+        self.entries = {k: v for k, v in self.entries.items() if k in self._seen}
+        self._write()
+
+    def seal(self) -> int:
+        """Record the current size, mtime and hash of every output that later stages rewrote, so the
+        next build knows the post-processed file as intact. Returns the number of entries updated."""
+        updated = 0
+        for rel, entry in self.entries.items():
+            path = ROOT / rel
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            if entry.get("size") != st.st_size or entry.get("mtime_ns") != st.st_mtime_ns:
+                entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns, final=content_hash(path.read_bytes()))
+                updated += 1
+        if updated:
+            self._write()
+        return updated
+
+    def _write(self) -> None:
+        data = {"kind": MANIFEST_KIND, "version": MANIFEST_VERSION, "entries": self.entries}
+        write_atomic(self.path, json.dumps(data, indent=1, sort_keys=True))
+
+    def summary(self) -> str:
+        return f"{self.written} written, {self.skipped} unchanged"
+
+
+def main() -> None:
+    argparse.ArgumentParser(
+        description="Record the final state of every builder output after post-processing.").parse_args()
+    manifests = [BuildManifest(path.stem) for path, _ in _builder_manifests()]
+    sealed = sum(manifest.seal() for manifest in manifests)
+    total = sum(len(manifest.entries) for manifest in manifests)
+    print(f"Manifests: {sealed} of {total} output(s) changed by post-processing, recorded.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Chunked process-pool helper shared by the page builders.
+map_chunks(fn, items, jobs) runs fn over chunks of items and yields results in input order,
+so parallel output is byte-identical to the serial path. jobs=1 runs in-process (no pool)."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Chunks per worker: enough to balance uneven pages without paying pickling overhead per item
+CHUNKS_PER_JOB = 4
+
+
+def resolve_jobs(jobs: int) -> int:
+    """--jobs value to a worker count: 0 means one per CPU core."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def chunked(items: Sequence[T], jobs: int) -> list[Sequence[T]]:
+    """Split items into about jobs * CHUNKS_PER_JOB contiguous chunks."""
+    if not items:
+        return []
+    size = max(1, -(-len(items) // (jobs * CHUNKS_PER_JOB)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def map_chunks(
+    fn: Callable[[Sequence[T]], list[R]],
+    items: Sequence[T],
+    jobs: int,
+    initializer: Callable | None = None,
+    initargs: tuple = (),
+) -> Iterator[R]:
+    """Yield fn(chunk) results, flattened, in the order of items.
+    fn and initializer must be module-level functions so they can be sent to worker processes."""
+    jobs = resolve_jobs(jobs)
+    if jobs == 1 or len(items) <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        yield from fn(items)
+        return
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as pool:
+        for results in pool.map(fn, chunked(items, jobs)):
+            yield from results
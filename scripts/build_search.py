@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Build the client-side search index in public/search/. Run from repo root after the builders.
+The glossary and article builders record a small search document per page in their manifests
+(title, headings, excerpt), so nothing is re-parsed here and skipped pages keep theirs. This turns
+them into an inverted index of title and heading words, sharded by the first two characters of
+each word: <prefix>.<hash>.json holds the words with that prefix, their postings and the
+documents they point to. search/manifest.json maps prefixes to shard files and search/search.js
+fetches only the shards for the words being typed. Shards are named by content hash (cache
+forever); stale ones are removed. Only files whose content changed are rewritten."""
+import hashlib
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+from build_manifest import all_entries, write_atomic
+
+ROOT = Path(__file__).resolve().parent.parent
+PUBLIC = ROOT / "public"
+OUT_DIR = PUBLIC / "search"
+INDEX_VERSION = 1
+PREFIX_LEN = 2
+# Posting weights per field; a word found in several fields keeps the highest
+WEIGHT_TITLE = 3
+WEIGHT_HEADING = 1
+# Not indexed (and dropped from queries by the loader, which reads them from the manifest)
+STOP_WORDS = frozenset((
+    "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is", "it", "of", "on", "or",
+    "the", "to", "vs", "what", "with", "you", "your",
+))
+SHARD_RE = re.compile(r"^[a-z0-9]{2}\.[0-9a-f]{10}\.json$")
+SPLIT_RE = re.compile(r"[^a-z0-9]+")
+
+LOADER_JS = r"""/* Site search loader (generated by scripts/build_search.py). Fetches only the shards for the
+   words in a query. window.siteSearch(query, limit) resolves to [{title, url, excerpt, kind}].
+   Markup: <input data-search aria-controls="ID"> and <ul id="ID"> for the results. */
+(function () {
+  "use strict";
+  var base = document.currentScript.src.replace(/[^\/]*$/, "");
+  var manifest = null;
+  var shards = {};
+
+  function getJSON(url) {
+    return fetch(url).then(function (r) {
+      if (!r.ok) throw new Error(url + ": " + r.status);
+      return r.json();
+    });
+  }
+
+  function loadShard(key) {
+    manifest = manifest || getJSON(base + "manifest.json");
+    return manifest.then(function (m) {
+      var file = m.shards[key];
+      if (!file) return null;
+      return shards[key] || (shards[key] = getJSON(base + file));
+    });
+  }
+
+  // Same normalisation as words() in build_search.py; the last word may be a stop word still being typed
+  function words(text, m) {
+    var all = text.toLowerCase().normalize("NFKD").replace(/[\u0300-\u036f]/g, "").split(/[^a-z0-9]+/)
+      .filter(function (w) { return w.length >= m.prefix; });
+    return all.filter(function (w, i) { return i === all.length - 1 || m.stop.indexOf(w) === -1; });
+  }
+
+  function search(query, limit) {
+    manifest = manifest || getJSON(base + "manifest.json");
+    return manifest.then(function (m) {
+      var terms = words(query, m);
+      return Promise.all(terms.map(function (w) { return loadShard(w.slice(0, m.prefix)); })).then(function (loaded) {
+        var scores = null;
+        var docs = {};
+        terms.forEach(function (word, i) {
+          var shard = loaded[i];
+          var hits = {};
+          if (shard) {
+            for (var token in shard.t) {
+              if (token.lastIndexOf(word, 0) !== 0) continue;
+              var boost = token === word ? 2 : 1;
+              shard.t[token].forEach(function (p) { hits[p[0]] = Math.max(hits[p[0]] || 0, p[1] * boost); });
+            }
+            for (var id in shard.d) docs[id] = shard.d[id];
+          }
+          if (scores === null) {
+            scores = hits;
+            return;
+          }
+          var both = {};
+          for (var id2 in hits) if (id2 in scores) both[id2] = scores[id2] + hits[id2];
+          scores = both;
+        });
+        // Best score first; on a tie the shorter title (a glossary term before an article naming it)
+        return Object.keys(scores || {}).sort(function (a, b) {
+          return scores[b] - scores[a] || docs[a][0].length - docs[b][0].length || a - b;
+        })
+          .slice(0, limit || 10).map(function (id) {
+            var d = docs[id];
+            return { title: d[0], url: d[1], excerpt: d[2], kind: d[3] };
+          });
+      });
+    });
+  }
+
+  window.siteSearch = search;
+
+  Array.prototype.forEach.call(document.querySelectorAll("[data-search]"), function (input) {
+    var list = document.getElementById(input.getAttribute("aria-controls"));
+    var timer = null;
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        var query = input.value;
+        search(query, 10).then(function (results) {
+          if (input.value !== query) return;
+          list.textContent = "";
+          results.forEach(function (r) {
+            var li = document.createElement("li");
+            var a = document.createElement("a");
+            a.href = r.url;
+            a.className = list.getAttribute("data-link-class") || "";
+            a.textContent = r.title;
+            var kind = document.createElement("span");
+            kind.className = list.getAttribute("data-kind-class") || "";
+            kind.textContent = " " + r.kind;
+            li.appendChild(a);
+            li.appendChild(kind);
+            list.appendChild(li);
+          });
+        });
+      }, 120);
+    });
+  });
+})();
+"""
+
+
+def words(text: str) -> list[str]:
+    """Index words in text, normalised the same way as the loader's words()."""
+    text = "".join(c for c in unicodedata.normalize("NFKD", text.lower()) if not unicodedata.combining(c))
+    return [w for w in SPLIT_RE.split(text) if len(w) >= PREFIX_LEN and w not in STOP_WORDS]
+
+
+def documents() -> list[tuple[str, dict]]:
+    """(url, search document) for every builder page that recorded one, sorted by URL."""
+    return sorted((e["url"], e["search"]) for e in all_entries().values() if "search" in e and "url" in e)
+
+
+def build_shards(docs: list[tuple[str, dict]]) -> dict[str, dict]:
+    """Prefix -> {"t": {word: [[doc id, weight], …]}, "d": {doc id: [title, url, excerpt, kind]}}."""
+    postings: dict[str, dict[int, int]] = {}
+    for doc_id, (_, doc) in enumerate(docs):
+        fields = [(doc["title"], WEIGHT_TITLE)] + [(h, WEIGHT_HEADING) for h in doc.get("headings", [])]
+        for text, weight in fields:
+            for word in words(text):
+                per_doc = postings.setdefault(word, {})
+                per_doc[doc_id] = max(per_doc.get(doc_id, 0), weight)
+    shards: dict[str, dict] = {}
+    for word in sorted(postings):
+        shard = shards.setdefault(word[:PREFIX_LEN], {"t": {}, "d": {}})
+        shard["t"][word] = [[doc_id, weight] for doc_id, weight in sorted(postings[word].items())]
+        for doc_id in postings[word]:
+            url, doc = docs[doc_id]
+            shard["d"][str(doc_id)] = [doc["title"], url, doc.get("excerpt", ""), doc.get("kind", "")]
+    return shards
+
+
+def _write_if_changed(path: Path, text: str) -> bool:
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    write_atomic(path, text)
+    return True
+
+
+def main() -> None:
+    docs = documents()
+    shards = build_shards(docs)
+    files: dict[str, str] = {}
+    written = 0
+    total = 0
+    for key, shard in shards.items():
+        text = json.dumps(shard, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        name = f"{key}.{hashlib.sha256(text.encode('utf-8')).hexdigest()[:10]}.json"
+        files[key] = name
+        total += len(text.encode("utf-8"))
+        if not (OUT_DIR / name).exists():
+            write_atomic(OUT_DIR / name, text)
+            written += 1
+    manifest = {"version": INDEX_VERSION, "prefix": PREFIX_LEN, "stop": sorted(STOP_WORDS), "shards": files}
+    written += _write_if_changed(OUT_DIR / "manifest.json", json.dumps(manifest, separators=(",", ":"), sort_keys=True))
+    written += _write_if_changed(OUT_DIR / "search.js", LOADER_JS)
+    live = set(files.values())
+    removed = 0
+    for path in OUT_DIR.iterdir():
+        if SHARD_RE.match(path.name) and path.name not in live:
+            path.unlink()
+            removed += 1
+    largest = max((len(json.dumps(s, separators=(",", ":"))) for s in shards.values()), default=0)
+    print(f"Search: {len(docs)} document(s), {len(shards)} shard(s) ({total // 1024} KiB, largest "
+          f"{largest // 1024} KiB); {written} file(s) written, {removed} stale shard(s) removed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Write public/sitemap.xml from every builder's URLs plus hand-maintained pages. Run from repo root
+after the clean-URL step. Regenerated from scratch each run (no duplicate URLs), streamed to disk,
+with <lastmod> set to the date a page's content hash last changed. Pages .build/sitemap.json has no
+record of (e.g. on a fresh CI checkout) get the date of the last commit to their file in public/.
+Past 50,000 URLs or 50 MB per file it splits into sitemap-N.xml files and sitemap.xml becomes a
+sitemap index."""
+import argparse
+import json
+import os
+import re
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from build_manifest import MANIFEST_DIR, all_entries, content_hash
+from clean_urls import TOP_PAGES
+
+ROOT = Path(__file__).resolve().parent.parent
+PUBLIC = ROOT / "public"
+STATE = MANIFEST_DIR / "sitemap.json"
+BASE = "https://vpnsurf.com"
+# sitemaps.org limits per file
+MAX_URLS = 50_000
+MAX_BYTES = 50 * 1024 * 1024
+PART_RE = re.compile(r"^sitemap-\d+\.xml$")
+
+URLSET_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = "</urlset>\n"
+INDEX_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+INDEX_CLOSE = "</sitemapindex>\n"
+
+
+class SitemapWriter:
+    """Streams <url> entries into sitemap-1.xml, sitemap-2.xml, ... rolling over at the URL/byte limits.
+    close() renames a single part to sitemap.xml, or writes sitemap.xml as an index of the parts."""
+
+    def __init__(self, out_dir: Path, base: str, max_urls: int = MAX_URLS, max_bytes: int = MAX_BYTES):
+        self.out_dir = out_dir
+        self.base = base
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.parts: list[Path] = []
+        self.count = 0
+        self._fh = None
+        self._urls = 0
+        self._bytes = 0
+
+    def _open_part(self) -> None:
+        self._close_part()
+        path = self.out_dir / f"sitemap-{len(self.parts) + 1}.xml.tmp"
+        self.parts.append(path)
+        self._fh = path.open("w", encoding="utf-8")
+        self._fh.write(URLSET_OPEN)
+        self._urls = 0
+        self._bytes = len(URLSET_OPEN.encode("utf-8")) + len(URLSET_CLOSE)
+
+    def _close_part(self) -> None:
+        if self._fh is not None:
+            self._fh.write(URLSET_CLOSE)
+            self._fh.close()
+            self._fh = None
+
+    def add(self, loc: str, lastmod: str | None) -> None:
+        line = f"  <url><loc>{escape(loc)}</loc>" + (f"<lastmod>{lastmod}</lastmod>" if lastmod else "") + "</url>\n"
+        size = len(line.encode("utf-8"))
+        if self._fh is None or self._urls >= self.max_urls or self._bytes + size > self.max_bytes:
+            self._open_part()
+        self._fh.write(line)
+        self._urls += 1
+        self._bytes += size
+        self.count += 1
+
+    def close(self) -> list[Path]:
+        """Finish writing; returns the files now live under out_dir."""
+        if self._fh is None:
+            self._open_part()
+        self._close_part()
+        index_tmp = self.out_dir / "sitemap.xml.tmp"
+        if len(self.parts) == 1:
+            os.replace(self.parts[0], index_tmp)
+            os.replace(index_tmp, self.out_dir / "sitemap.xml")
+            return [self.out_dir / "sitemap.xml"]
+        final = []
+        for tmp in self.parts:
+            path = tmp.with_suffix("")  # drop .tmp
+            os.replace(tmp, path)
+            final.append(path)
+        with index_tmp.open("w", encoding="utf-8") as fh:
+            fh.write(INDEX_OPEN)
+            for path in final:
+                fh.write(f"  <sitemap><loc>{escape(self.base + '/' + path.name)}</loc></sitemap>\n")
+            fh.write(INDEX_CLOSE)
+        os.replace(index_tmp, self.out_dir / "sitemap.xml")
+        return [self.out_dir / "sitemap.xml", *final]
+
+
+def builder_pages() -> dict[str, str]:
+    """URL path -> content hash for every page recorded in the builder manifests. The hash is of the
+    page as rendered, so it does not change when later stages (CSS purge) rewrite the file."""
+    return {entry["url"]: entry["hash"] for entry in all_entries().values() if "url" in entry}
+
+
+def static_pages(state: dict, skip: dict[str, str]):
+    """(url path, content hash, stat) for hand-maintained pages whose URL is not in skip: the home page,
+    the TOP_PAGES folders and articles/<slug>/ folders. Builder-owned folders (glossary/) are never swept,
+    so output a builder no longer claims stays out of the sitemap. Hashes are cached by size and mtime
+    in state so unchanged files are not re-read."""
+    candidates = [PUBLIC / "index.html"] + [PUBLIC / name / "index.html" for name in TOP_PAGES]
+    candidates += sorted((PUBLIC / "articles").glob("*/index.html"))
+    for path in candidates:
+        if not path.is_file():
+            continue
+        rel_dir = path.parent.relative_to(PUBLIC)
+        url = "/" if rel_dir == Path(".") else f"/{rel_dir.as_posix()}/"
+        if url in skip:
+            continue
+        st = path.stat()
+        cached = state.get(url, {})
+        if cached.get("size") == st.st_size and cached.get("mtime") == st.st_mtime_ns and "hash" in cached:
+            yield url, cached["hash"], st
+        else:
+            yield url, content_hash(path.read_bytes()), st
+
+
+def commit_dates() -> dict[str, str]:
+    """URL path -> date (YYYY-MM-DD) of the last commit touching its public/<dir>/index.html, from one
+    `git log` pass; {} outside a git checkout. A shallow clone only knows its newest commit."""
+    try:
+        log = subprocess.run(["git", "log", "--format=%x00%cs", "--name-only", "--", "public"],
+                             cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    dates: dict[str, str] = {}
+    date = ""
+    for line in log.splitlines():
+        if line.startswith("\0"):
+            date = line[1:]
+        elif line.endswith("index.html"):
+            url = "/" + line.removeprefix("public/").removesuffix("index.html")
+            dates.setdefault(url, date)
+    return dates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write sitemap.xml (or a sitemap index) for public/.")
+    parser.add_argument("--base", default=BASE, help=f"site URL prefix for <loc> (default {BASE})")
+    parser.add_argument("--max-urls", type=int, default=MAX_URLS, help="URLs per sitemap file before splitting")
+    args = parser.parse_args()
+    try:
+        state = json.loads(STATE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+    today = datetime.now(timezone.utc).date().isoformat()
+    pages = builder_pages()
+    new_state: dict[str, dict] = {url: {"hash": digest} for url, digest in pages.items()}
+    for url, digest, st in static_pages(state, pages):
+        new_state[url] = {"hash": digest, "size": st.st_size, "mtime": st.st_mtime_ns}
+    base = args.base.rstrip("/")
+    writer = SitemapWriter(PUBLIC, base, max_urls=args.max_urls)
+    committed = commit_dates() if new_state.keys() - state.keys() else {}
+    # Sorted so the output only changes when a URL or its lastmod does
+    for url in sorted(new_state):
+        entry = new_state[url]
+        prev = state.get(url)
+        if prev is None:
+            entry["lastmod"] = committed.get(url, today)
+        else:
+            entry["lastmod"] = prev["lastmod"] if prev.get("hash") == entry["hash"] and "lastmod" in prev else today
+        writer.add(base + url, entry["lastmod"])
+    files = writer.close()
+    # Remove parts left over from a previous, larger sitemap
+    live = {p.name for p in files}
+    for path in PUBLIC.glob("sitemap-*.xml"):
+        if PART_RE.match(path.name) and path.name not in live:
+            path.unlink()
+    MANIFEST_DIR.mkdir(parents=True, exist_ok=True)
+    STATE.write_text(json.dumps(new_state, indent=1, sort_keys=True), encoding="utf-8")
+    changed = sum(1 for url, s in new_state.items() if state.get(url, {}).get("hash") != s["hash"])
+    print(f"Wrote {', '.join(p.name for p in files)}: {writer.count} URL(s), {changed} new or changed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Per-stage build instrumentation for ./build.sh --profile. Run from repo root.
+  build_trace.py start                               forget the previous build's stages
+  build_trace.py run [--cprofile] NAME SCRIPT ARGS…  run a Python stage in this process and record it
+  build_trace.py report                              print a table and write .build/build-trace.json
+Each stage records wall time, CPU time (including worker processes), files read, written and
+removed under the repo (counted with an audit hook, in forked workers too; .pyc imports are left
+out and a temp file renamed into place counts once), bytes in the files it wrote, and peak RSS.
+The report is in Chrome trace format (open it in chrome://tracing or ui.perfetto.dev). --cprofile also dumps .build/profile/NAME.prof
+(view with `python3 -m pstats` or snakeviz)."""
+import argparse
+import cProfile
+import json
+import os
+import runpy
+import sys
+import time
+from pathlib import Path
+
+from build_manifest import MANIFEST_DIR, write_atomic
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows: CPU time of this process only, no RSS
+
+ROOT = Path(__file__).resolve().parent.parent
+EVENTS = MANIFEST_DIR / "trace-events.jsonl"
+TRACE = MANIFEST_DIR / "build-trace.json"
+PROFILE_DIR = MANIFEST_DIR / "profile"
+WRITE_MODES = set("wax+")
+
+
+class FileAudit:
+    """Files opened for reading or writing under ROOT, following renames (tmp -> final) and links.
+    Events go to an append-only log that forked worker processes inherit along with the audit hook,
+    so files written by workers (e.g. compress --jobs) are counted too; totals() replays the log."""
+
+    def __init__(self, log_path: Path):
+        self._root = str(ROOT) + os.sep
+        self._log_path = log_path
+        # Opened before the hook is installed, and os.write is not audited, so logging is never logged
+        self._fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+
+    def _path(self, path) -> str | None:
+        if path is None or isinstance(path, int):
+            return None
+        path = os.path.abspath(os.fsdecode(path))
+        if not path.startswith(self._root) or "__pycache__" in path or path.endswith(".pyc"):
+            return None
+        return path
+
+    def _log(self, *fields: str) -> None:
+        if self._fd < 0:
+            return  # stage finished (audit hooks cannot be removed)
+        os.write(self._fd, ("\0".join(fields) + "\n").encode("utf-8", "surrogateescape"))
+
+    def __call__(self, event: str, args: tuple) -> None:
+        if event == "open":
+            path = self._path(args[0])
+            if path is not None:
+                mode, flags = args[1], args[2]
+                write = (WRITE_MODES & set(mode)) if mode else flags & (os.O_WRONLY | os.O_RDWR)
+                self._log("w" if write else "r", path)
+        elif event in ("os.rename", "os.link"):
+            dst = self._path(args[1])
+            if dst is not None:
+                self._log("m" if event == "os.rename" else "l", self._path(args[0]) or "", dst)
+        elif event == "os.remove":
+            path = self._path(args[0])
+            if path is not None:
+                self._log("x", path)
+
+    def totals(self) -> tuple[set[str], set[str], set[str]]:
+        """(files read, files written and still present, files removed that were not written here)."""
+        fd, self._fd = self._fd, -1
+        os.close(fd)
+        read: set[str] = set()
+        written: set[str] = set()
+        removed: set[str] = set()
+        for line in self._log_path.read_bytes().decode("utf-8", "surrogateescape").splitlines():
+            kind, *paths = line.split("\0")
+            if kind == "r":
+                read.add(paths[0])
+            elif kind == "x":
+                if paths[0] not in written:
+                    removed.add(paths[0])
+                written.discard(paths[0])
+            else:
+                if kind == "m":
+                    written.discard(paths[0])
+                written.add(paths[-1])
+                removed.discard(paths[-1])
+        self._log_path.unlink()
+        return read, {p for p in written if os.path.isfile(p)}, removed
+
+
+def _usage() -> tuple[float, int | None]:
+    """(CPU seconds of this process and its waited-for children, peak RSS in KiB)."""
+    if resource is None:
+        return time.process_time(), None
+    own, children = resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+    rss = max(own.ru_maxrss, children.ru_maxrss)
+    return cpu, rss // 1024 if sys.platform == "darwin" else rss
+
+
+def run_stage(name: str, script: Path, script_args: list[str], profile: bool) -> int:
+    """Run script as __main__ (as `python3 script args` would) and append its record to EVENTS."""
+    EVENTS.parent.mkdir(parents=True, exist_ok=True)
+    audit = FileAudit(EVENTS.with_name(f"trace-{name}.log"))
+    sys.argv = [str(script), *script_args]
+    sys.path[0] = str(script.parent)
+    sys.addaudithook(audit)
+    profiler = cProfile.Profile() if profile else None
+    cpu_before, _ = _usage()
+    started = time.time()
+    start = time.perf_counter()
+    code = 0
+    error: BaseException | None = None
+    try:
+        if profiler is not None:
+            profiler.enable()
+        runpy.run_path(str(script), run_name="__main__")
+    except SystemExit as exc:
+        code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+        error = exc if code else None
+    except BaseException as exc:
+        code, error = 1, exc
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    wall = time.perf_counter() - start
+    cpu_after, rss = _usage()
+    read, written, removed = audit.totals()
+    record = {
+        "name": name,
+        "script": script.relative_to(ROOT).as_posix() if script.is_relative_to(ROOT) else str(script),
+        "start": started,
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu_after - cpu_before, 4),
+        "files_read": len(read),
+        "files_written": len(written),
+        "files_removed": len(removed),
+        "bytes_written": sum(os.path.getsize(p) for p in written),
+        "peak_rss_kib": rss,
+        "exit": code,
+    }
+    if profiler is not None:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(PROFILE_DIR / f"{name}.prof"))
+    with EVENTS.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record) + "\n")
+    if error is not None:
+        raise error
+    return code
+
+
+def load_events() -> list[dict]:
+    try:
+        lines = EVENTS.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return []
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def chrome_trace(events: list[dict]) -> dict:
+    """Stages as complete ("X") events on one track, metrics in args; timestamps in µs from build start."""
+    origin = min((e["start"] for e in events), default=0.0)
+    trace = [{"name": "process_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "build.sh"}}]
+    for e in events:
+        trace.append({
+            "name": e["name"],
+            "cat": "stage",
+            "ph": "X",
+            "pid": 1,
+            "tid": 1,
+            "ts": round((e["start"] - origin) * 1e6),
+            "dur": round(e["wall_s"] * 1e6),
+            "args": {k: v for k, v in e.items() if k not in ("name", "start")},
+        })
+        if e["peak_rss_kib"] is not None:
+            trace.append({"name": "peak RSS (KiB)", "ph": "C", "pid": 1, "ts": round((e["start"] - origin) * 1e6),
+                          "args": {"rss": e["peak_rss_kib"]}})
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+
+def report() -> None:
+    events = load_events()
+    if not events:
+        print("No stages recorded; run ./build.sh --profile.")
+        return
+    print(f"{'stage':<12} {'wall':>8} {'cpu':>8} {'read':>6} {'written':>8} {'removed':>8} {'KiB out':>9} {'peak RSS':>9}")
+    for e in events:
+        rss = f"{e['peak_rss_kib'] // 1024} MiB" if e["peak_rss_kib"] is not None else "-"
+        print(f"{e['name']:<12} {e['wall_s']:>7.2f}s {e['cpu_s']:>7.2f}s {e['files_read']:>6} "
+              f"{e['files_written']:>8} {e['files_removed']:>8} {e['bytes_written'] // 1024:>9} {rss:>9}")
+    print(f"{'total':<12} {sum(e['wall_s'] for e in events):>7.2f}s {sum(e['cpu_s'] for e in events):>7.2f}s")
+    write_atomic(TRACE, json.dumps(chrome_trace(events), indent=1))
+    print(f"Trace written to {TRACE.relative_to(ROOT)} (open in chrome://tracing or ui.perfetto.dev).")
+    if any(PROFILE_DIR.glob("*.prof")):
+        print(f"cProfile dumps in {PROFILE_DIR.relative_to(ROOT)}/ (python3 -m pstats <file>).")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record and report per-stage build metrics.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("start", help="forget stages recorded by the previous build")
+    run = sub.add_parser("run", help="run a Python stage and record it")
+    run.add_argument("--cprofile", action="store_true", help=f"also dump {PROFILE_DIR.relative_to(ROOT)}/NAME.prof")
+    run.add_argument("name", help="stage name in the report")
+    run.add_argument("script", type=Path, help="Python script to run")
+    run.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the script")
+    sub.add_parser("report", help="print the stage table and write the Chrome trace")
+    args = parser.parse_args()
+    if args.command == "start":
+        EVENTS.unlink(missing_ok=True)
+        for path in PROFILE_DIR.glob("*.prof"):
+            path.unlink()
+    elif args.command == "run":
+        sys.exit(run_stage(args.name, args.script.resolve(), args.args, args.cprofile))
+    else:
+        report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Check internal links and asset references in public/. Run from repo root after the build (or as
+its link-check stage). Every HTML page is parsed once, in --jobs worker processes. Each href, src,
+srcset and poster value pointing into the site (relative, root-relative, or an absolute URL on
+--base, such as canonical and prev/next links) is resolved against the clean-URL layout: dir/ is
+dir/index.html, and <path>.html redirect stubs and directory URLs without a trailing slash count
+as redirects. #fragments must match an id on the target page. Reports:
+  broken     links to files that do not exist (or fragments with no matching id)
+  redirects  links that go through a redirect, and redirect stubs that chain or loop
+  orphans    pages no other page links to (the home page excluded)
+Prints the first --limit of each; --strict exits with status 1 if any link is broken."""
+import argparse
+import os
+import posixpath
+import re
+import time
+from pathlib import Path
+from urllib.parse import unquote
+
+from build_parallel import map_chunks
+from clean_urls import STUB_MAX_BYTES
+
+ROOT = Path(__file__).resolve().parent.parent
+PUBLIC = ROOT / "public"
+BASE = "https://vpnsurf.com"
+HOME = "index.html"
+URL_ATTR_RE = re.compile(r"""\s(href|src|srcset|poster)=(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+))""", re.IGNORECASE)
+ID_RE = re.compile(r"""\sid=(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+))""", re.IGNORECASE)
+REFRESH_RE = re.compile(r"""<meta http-equiv="?refresh"? content="?\d+;\s*url=([^"'>]+)""", re.IGNORECASE)
+# Skipped: other sites, mail/phone/script links, inline data, protocol-relative URLs
+EXTERNAL_RE = re.compile(r"^(?:[a-z][a-z0-9+.-]*:|//)", re.IGNORECASE)
+
+# Per-run state shared with page workers (set once per process by _init_worker)
+_SITE: dict = {}
+
+
+def _init_worker(site: dict) -> None:
+    _SITE.clear()
+    _SITE.update(site)
+
+
+def _lookup(path: str, files: set[str]) -> tuple[str, str]:
+    """(status, rel path) for an absolute, not yet normalized URL path; see resolve()."""
+    rel = posixpath.normpath(path).lstrip("/")
+    if rel == ".":
+        rel = ""
+    if path.endswith("/") or posixpath.basename(path) in (".", ".."):
+        index = posixpath.join(rel, HOME)
+        return ("ok" if index in files else "broken"), index
+    if rel in files:
+        return "ok", rel
+    index = posixpath.join(rel, HOME)
+    if index in files:
+        return "slash", index
+    return "broken", rel
+
+
+def resolve(url: str, page_dir: str, files: set[str], base: str, memo: dict) -> tuple[str, str | None, str]:
+    """(status, rel path under public/ or None, fragment) for a URL on a page in page_dir.
+    status: "ok", "slash" (directory without trailing slash, the server redirects), "broken",
+    or "external" (not checked). memo caches lookups by absolute path across calls with the same files."""
+    if base and (url == base or url.startswith(base + "/")):
+        url = url[len(base):] or "/"
+    elif EXTERNAL_RE.match(url):
+        return "external", None, ""
+    url, _, fragment = url.partition("#")
+    path = url.split("?", 1)[0]
+    if not path:
+        return "ok", None, fragment  # same page
+    if "%" in path:
+        path = unquote(path)
+    if not path.startswith("/"):
+        path = f"/{page_dir}/{path}" if page_dir else f"/{path}"
+    hit = memo.get(path)
+    if hit is None:
+        hit = memo[path] = _lookup(path, files)
+    return hit[0], hit[1], fragment
+
+
+def check_chunk(chunk: list[str]) -> list[tuple[str, set[str], list[str], list[tuple[str, str, str]]]]:
+    """Parse and resolve a chunk of pages. Returns [(page, ids, pages linked, problems)]; a problem is
+    (kind, url, target) with kind "broken", "slash", "stub" (target is a redirect stub) or
+    "fragment" (target#fragment, checked against target ids by the caller)."""
+    files, stubs, base = _SITE["files"], _SITE["stubs"], _SITE["base"]
+    memo: dict[str, tuple[str, str]] = {}
+    out = []
+    for rel in chunk:
+        html = (PUBLIC / rel).read_text(encoding="utf-8")
+        page_dir = posixpath.dirname(rel)
+        ids = {"".join(m) for m in ID_RE.findall(html)}
+        linked: set[str] = set()
+        problems: list[tuple[str, str, str]] = []
+        for attr, *values in URL_ATTR_RE.findall(html):
+            value = "".join(values)
+            if attr.lower() == "srcset":
+                urls = [c.split()[0] for c in value.split(",") if c.strip()]
+            else:
+                urls = [value.strip()]
+            for url in urls:
+                status, target, fragment = resolve(url, page_dir, files, base, memo)
+                if status == "external":
+                    continue
+                if status == "broken":
+                    problems.append(("broken", url, target))
+                    continue
+                if status == "slash":
+                    problems.append(("slash", url, target))
+                if target is None:
+                    target = rel
+                if target in stubs:
+                    problems.append(("stub", url, target))
+                if target.endswith(".html") and target != rel:
+                    linked.add(target)
+                if fragment and target.endswith(".html"):
+                    problems.append(("fragment", url, f"{target}#{fragment}"))
+        out.append((rel, ids, sorted(linked), problems))
+    return out
+
+
+def find_stubs(files: set[str], base: str) -> dict[str, str]:
+    """Redirect stub rel path -> rel path of the page it refreshes to ("" if that does not resolve)."""
+    stubs = {}
+    memo: dict[str, tuple[str, str]] = {}
+    for rel in files:
+        if not rel.endswith(".html") or (PUBLIC / rel).stat().st_size >= STUB_MAX_BYTES:
+            continue
+        m = REFRESH_RE.search((PUBLIC / rel).read_text(encoding="utf-8"))
+        if m:
+            status, target, _ = resolve(m.group(1).strip(), posixpath.dirname(rel), files, base, memo)
+            stubs[rel] = target if status in ("ok", "slash") and target else ""
+    return stubs
+
+
+def redirect_chain(stub: str, stubs: dict[str, str]) -> list[str]:
+    """Stubs followed from stub, ending at a page, "" (broken target) or a repeat (loop)."""
+    chain = [stub]
+    while chain[-1] in stubs:
+        target = stubs[chain[-1]]
+        chain.append(target)
+        if target in chain[:-1] or not target:
+            break
+    return chain
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check internal links and asset references in public/.")
+    parser.add_argument("--force", action="store_true", help="accepted for build.sh; every page is always checked")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="worker processes (0 = all cores)")
+    parser.add_argument("--base", default=BASE, help=f"absolute URLs under this prefix are internal (default {BASE})")
+    parser.add_argument("--limit", type=int, default=20, help="examples to print per category (default 20)")
+    parser.add_argument("--strict", action="store_true", help="exit with status 1 if any link is broken")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    base = args.base.rstrip("/")
+    files = set()
+    for dirpath, _, filenames in os.walk(PUBLIC):
+        rel_dir = Path(dirpath).relative_to(PUBLIC).as_posix()
+        for filename in filenames:
+            files.add(filename if rel_dir == "." else f"{rel_dir}/{filename}")
+    stubs = find_stubs(files, base)
+    pages = sorted(f for f in files if f.endswith(".html") and f not in stubs)
+    site = {"files": files, "stubs": stubs, "base": base}
+    ids_by_page: dict[str, set[str]] = {}
+    inbound: dict[str, int] = {page: 0 for page in pages}
+    broken: list[tuple[str, str]] = []
+    via_redirect: list[tuple[str, str, str]] = []
+    fragments: list[tuple[str, str, str]] = []
+    links = 0
+    for page, ids, linked, problems in map_chunks(check_chunk, pages, args.jobs, _init_worker, (site,)):
+        ids_by_page[page] = ids
+        links += len(linked)
+        for target in linked:
+            # A link through a redirect stub still reaches the page at the end of the chain
+            final = redirect_chain(target, stubs)[-1] if target in stubs else target
+            if final in inbound and final != page:
+                inbound[final] += 1
+        for kind, url, target in problems:
+            if kind == "broken":
+                broken.append((page, url))
+            elif kind == "fragment":
+                fragments.append((page, url, target))
+            else:
+                via_redirect.append((page, url, "missing trailing slash" if kind == "slash" else "redirect stub"))
+    for page, url, target in fragments:
+        rel, _, fragment = target.partition("#")
+        final = redirect_chain(rel, stubs)[-1] if rel in stubs else rel
+        if final in ids_by_page and unquote(fragment) not in ids_by_page[final]:
+            broken.append((page, url))
+    chains = [c for c in (redirect_chain(stub, stubs) for stub in sorted(stubs)) if len(c) > 2 or not c[-1]]
+    orphans = sorted(page for page, count in inbound.items() if count == 0 and page != HOME)
+
+    elapsed = time.perf_counter() - start
+    print(f"Links: {len(pages)} page(s), {len(stubs)} redirect stub(s), {links} internal page link(s) "
+          f"checked in {elapsed:.2f}s.")
+    print(f"  {len(broken)} broken, {len(via_redirect)} via redirect, {len(chains)} redirect chain(s) "
+          f"or broken stub(s), {len(orphans)} orphan page(s).")
+    for title, rows in (
+        ("Broken", [f"{page}: {url}" for page, url in broken]),
+        ("Via redirect", [f"{page}: {url} ({why})" for page, url, why in via_redirect]),
+        ("Redirect chains", [" -> ".join(c[:-1]) + f" -> {c[-1] or '(missing)'}" for c in chains]),
+        ("Orphans", orphans),
+    ):
+        if rows:
+            print(f"{title}:")
+            for row in sorted(rows)[:args.limit]:
+                print(f"  {row}")
+            if len(rows) > args.limit:
+                print(f"  … and {len(rows) - args.limit} more")
+    if args.strict and broken:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
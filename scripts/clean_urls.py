@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Clean URLs and redirect stubs for public/. Run from repo root after the injectors.
+Builder pages are already written to <path>/index.html. This moves hand-maintained flat pages
+(faq.html, articles/<slug>.html) into <path>/index.html with an atomic rename, then writes a small
+meta-refresh stub at every old .html URL: for every page in the builder manifests and every
+hand-maintained page folder. Stubs are only rewritten when their content changes."""
+from pathlib import Path
+
+from build_manifest import all_entries, write_atomic
+
+ROOT = Path(__file__).resolve().parent.parent
+PUBLIC = ROOT / "public"
+# Top-level hand-maintained pages served from a folder (every flat page in articles/ is too)
+TOP_PAGES = ("faq",)
+# Link text in stubs: by top-level page, then by section for pages inside it
+LABELS = {"faq": "FAQ", "glossary": "Glossary"}
+SECTION_LABELS = {"articles": "Article", "glossary": "Term"}
+# Stubs are well under this size; the one test for them, shared by every later stage and injector
+STUB_MAX_BYTES = 600
+STUB_MARKER = 'content="0;url='
+
+
+def is_redirect_stub(path: Path) -> bool:
+    """Small meta-refresh page written by this script."""
+    return path.stat().st_size < STUB_MAX_BYTES and STUB_MARKER in path.read_text(encoding="utf-8")
+
+
+def redirect_html(url: str, label: str) -> str:
+    """Stub that sends an old .html URL to url (meta refresh plus a link for crawlers and no-JS users)."""
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        f'<meta http-equiv="refresh" content="0;url={url}"><title>Redirect</title></head>'
+        f'<body><p>Redirecting to <a href="{url}">{label}</a>.</p></body></html>\n'
+    )
+
+
+def _label(rel: str) -> str:
+    """Stub link text for the page at rel ("faq", "articles/why-use-vpn")."""
+    section, _, name = rel.partition("/")
+    if name:
+        return SECTION_LABELS.get(section, "Page")
+    return LABELS.get(section, section.replace("-", " ").title())
+
+
+def flat_pages() -> list[Path]:
+    """Hand-maintained flat pages that should live at <path>/index.html (redirect stubs excluded)."""
+    candidates = [PUBLIC / f"{name}.html" for name in TOP_PAGES]
+    candidates += sorted((PUBLIC / "articles").glob("*.html"))
+    return [p for p in candidates if p.is_file() and p.name != "index.html" and not is_redirect_stub(p)]
+
+
+def main() -> None:
+    moved = 0
+    # rel path without .html (e.g. "articles/why-use-vpn") -> clean URL
+    stubs: dict[str, str] = {}
+    for path in flat_pages():
+        rel = path.relative_to(PUBLIC).with_suffix("").as_posix()
+        target = PUBLIC / rel / "index.html"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        path.replace(target)
+        moved += 1
+        stubs[rel] = f"/{rel}/"
+    for entry in all_entries().values():
+        # stub=False: pages that never had a flat .html URL (e.g. sharded glossary letter pages)
+        if entry.get("url", "/") != "/" and entry.get("stub", True):
+            stubs[entry["url"].strip("/")] = entry["url"]
+    # Hand-maintained pages moved by an earlier build keep their stubs
+    folders = [PUBLIC / name / "index.html" for name in TOP_PAGES] + sorted((PUBLIC / "articles").glob("*/index.html"))
+    for index in folders:
+        if index.is_file():
+            rel = index.parent.relative_to(PUBLIC).as_posix()
+            stubs.setdefault(rel, f"/{rel}/")
+    written = 0
+    for rel, url in sorted(stubs.items()):
+        stub = PUBLIC / f"{rel}.html"
+        text = redirect_html(url, _label(rel))
+        if stub.exists():
+            if not is_redirect_stub(stub):
+                print(f"Not replacing {stub}: it is a page, not a redirect stub")
+                continue
+            if stub.read_text(encoding="utf-8") == text:
+                continue
+        write_atomic(stub, text)
+        written += 1
+    print(f"Clean URLs: {moved} page(s) moved, {written} of {len(stubs)} redirect stub(s) written.")
+
+
+if __name__ == "__main__":
+    main()
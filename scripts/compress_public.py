@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Write precompressed .gz (and .br, if the brotli module is installed) sidecars next to every
+compressible file in public/. Run from repo root as the last build step, so servers and CDNs that
+support precompressed files can send them without compressing on each request.
+Maximum levels (gzip 9, Brotli 11); gzip headers carry no name or mtime, so output is reproducible.
+A sidecar is only rewritten when its source is newer (--force rewrites all). Sidecars that would
+not be smaller than the source are not kept, and orphans of deleted files are removed
+(with any folder that leaves empty).
+--jobs N compresses in N worker processes (0 = one per core)."""
+import argparse
+import gzip
+import os
+from pathlib import Path
+
+from build_parallel import map_chunks
+from sync_assets import remove_orphan
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # gzip only
+
+ROOT = Path(__file__).resolve().parent.parent
+PUBLIC = ROOT / "public"
+EXTENSIONS = {".css", ".html", ".js", ".json", ".map", ".svg", ".txt", ".xml"}
+# Smaller files fit in one packet either way (and redirect stubs are rewritten every build)
+MIN_SIZE = 1024
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def _sidecars() -> list[str]:
+    return [".gz", ".br"] if brotli is not None else [".gz"]
+
+
+def _compress(data: bytes, suffix: str) -> bytes:
+    if suffix == ".br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _is_stale(path: Path, sidecar: Path) -> bool:
+    try:
+        return sidecar.stat().st_mtime_ns < path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return True
+
+
+def compress_chunk(chunk: list[tuple[str, list[str]]]) -> list[tuple[str, int, dict[str, int]]]:
+    """Compress a chunk of (path, sidecar suffixes to write). Returns [(path, size, {suffix: bytes})];
+    a suffix whose output was not smaller than the source is left out and its old sidecar removed."""
+    out = []
+    for name, suffixes in chunk:
+        path = Path(name)
+        data = path.read_bytes()
+        sizes: dict[str, int] = {}
+        for suffix in suffixes:
+            sidecar = path.with_name(path.name + suffix)
+            packed = _compress(data, suffix)
+            if len(packed) >= len(data):
+                sidecar.unlink(missing_ok=True)
+                continue
+            tmp = sidecar.with_name(sidecar.name + ".tmp")
+            tmp.write_bytes(packed)
+            os.replace(tmp, sidecar)
+            sizes[suffix] = len(packed)
+        out.append((name, len(data), sizes))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write .gz/.br sidecars for compressible files in public/.")
+    parser.add_argument("--force", action="store_true", help="recompress every file")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="worker processes (0 = all cores)")
+    parser.add_argument("--top", type=int, default=5, help="largest files to list in the report")
+    args = parser.parse_args()
+    suffixes = _sidecars()
+    pending: list[tuple[str, list[str]]] = []
+    fresh = 0
+    removed = 0
+    for dirpath, _, filenames in os.walk(PUBLIC):
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            if path.suffix in (".gz", ".br"):
+                # Orphan: source deleted, no longer compressible, or now too small
+                source = path.with_suffix("")
+                if (not source.is_file() or source.suffix not in EXTENSIONS
+                        or source.stat().st_size < MIN_SIZE or path.suffix not in suffixes):
+                    remove_orphan(path)  # also drops a page folder a builder emptied
+                    removed += 1
+                continue
+            if path.suffix not in EXTENSIONS or path.stat().st_size < MIN_SIZE:
+                continue
+            todo = [s for s in suffixes if args.force or _is_stale(path, path.with_name(path.name + s))]
+            if todo:
+                pending.append((str(path), todo))
+            else:
+                fresh += 1
+    pending.sort()
+    totals = {s: 0 for s in suffixes}
+    raw_total = 0
+    report: list[tuple[int, str, dict[str, int]]] = []
+    for name, size, sizes in map_chunks(compress_chunk, pending, args.jobs):
+        raw_total += size
+        for suffix, packed in sizes.items():
+            totals[suffix] += packed
+        report.append((size, name, sizes))
+    if brotli is None:
+        print("brotli not installed; writing .gz sidecars only (pip install -r scripts/requirements.txt).")
+    print(f"Compressed {len(pending)} file(s), {fresh} unchanged, {removed} orphaned sidecar(s) removed.")
+    if pending:
+        ratios = ", ".join(
+            f"{s} {totals[s] // 1024} KiB ({100 * totals[s] / raw_total:.1f}% of original)" for s in suffixes
+        )
+        print(f"  {raw_total // 1024} KiB -> {ratios}")
+    for size, name, sizes in sorted(report, reverse=True)[:args.top]:
+        rel = Path(name).relative_to(PUBLIC).as_posix()
+        cells = ", ".join(f"{s} {packed // 1024} KiB" for s, packed in sizes.items())
+        print(f"  {rel}: {size // 1024} KiB -> {cells or 'not compressible'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Content-hash fingerprinting for static assets referenced by pages in public/. Run from repo root
+after the CSS purge and before minification. Every local image, video, script, stylesheet or font
+a page references (src, href, srcset, poster) gets a copy named <name>.<hash>.<ext> next to it
+(hardlinked or reflinked where possible, so no bytes are copied) and the page is rewritten to use it.
+The original names stay in place for links from outside the site (bookmarked or hotlinked images,
+search-engine image results), so each referenced asset is published twice: the copy is only free on
+disk. References to an older fingerprint are moved to the current one, and fingerprinted copies no
+page uses any more are deleted. Cache headers are left to the server or CDN, which Surfer cannot
+configure: one pattern rule on the name (FINGERPRINT_PATTERN) makes these files immutable; see
+docs/BUILD_AND_DEPLOY.md. A public/_headers file written by earlier versions is removed. Asset
+hashes are cached by size and mtime in .build/fingerprints.json (--force rehashes).
+--jobs N rewrites pages in N worker processes (0 = one per core)."""
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import re
+from pathlib import Path
+from urllib.parse import unquote
+
+from build_manifest import MANIFEST_DIR, write_atomic
+from build_parallel import map_chunks
+from clean_urls import is_redirect_stub
+from sync_assets import METHODS, place, remove_orphan
+
+ROOT = Path(__file__).resolve().parent.parent
+PUBLIC = ROOT / "public"
+STATE = MANIFEST_DIR / "fingerprints.json"
+STATE_VERSION = 1
+# Per-file cache rules written by earlier versions (Surfer serves it as a plain file)
+OLD_HEADERS = PUBLIC / "_headers"
+OLD_HEADERS_MARK = "# Written by scripts/fingerprint_assets.py"
+EXTENSIONS = {
+    ".avif", ".css", ".gif", ".ico", ".jpeg", ".jpg", ".js", ".mp4", ".png", ".svg", ".webm", ".webp",
+    ".woff", ".woff2",
+}
+# Source of scripts/purge_css.py, which fingerprints its own output
+EXCLUDE = {"css/tailwind/tailwind.min.css"}
+HASH_LEN = 10
+# name.<hash>.ext, as written here and by purge_css.py and build_search.py
+HASHED_RE = re.compile(rf"^(.+)\.[0-9a-f]{{{HASH_LEN}}}(\.[A-Za-z0-9]+)$")
+# Every fingerprinted URL path matches this, for a single cache rule on the server or CDN
+FINGERPRINT_PATTERN = rf"\.[0-9a-f]{{{HASH_LEN}}}\.[a-z0-9]+$"
+URL_ATTR_RE = re.compile(r"""(\s(?:src|href|srcset|poster)=)(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+))""", re.IGNORECASE)
+
+
+def asset_hash(path: Path, cache: dict[str, list], rel: str) -> str:
+    """First HASH_LEN hex digits of the file's sha256, reusing cache[rel] while size and mtime match."""
+    st = path.stat()
+    cached = cache.get(rel)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return cached[2]
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    cache[rel] = [st.st_size, st.st_mtime_ns, h.hexdigest()[:HASH_LEN]]
+    return cache[rel][2]
+
+
+def fingerprinted_name(name: str, digest: str) -> str:
+    stem, dot, ext = name.rpartition(".")
+    return f"{stem}.{digest}.{ext}" if dot else f"{name}.{digest}"
+
+
+def assets(cache: dict[str, list]) -> dict[str, str]:
+    """Rel path of every asset that can be fingerprinted -> rel path of its fingerprinted copy."""
+    out = {}
+    for dirpath, _, filenames in os.walk(PUBLIC):
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            rel = path.relative_to(PUBLIC).as_posix()
+            if path.suffix.lower() not in EXTENSIONS or rel in EXCLUDE or HASHED_RE.match(filename):
+                continue
+            out[rel] = posixpath.join(posixpath.dirname(rel), fingerprinted_name(filename, asset_hash(path, cache, rel)))
+    return out
+
+
+# Asset map for page workers (set once per process by _init_worker)
+_ASSETS: dict[str, str] = {}
+
+
+def _init_worker(asset_map: dict[str, str]) -> None:
+    _ASSETS.clear()
+    _ASSETS.update(asset_map)
+
+
+def _target(url: str, page_dir: str) -> str | None:
+    """Rel path (under public/) of the asset a local URL points at, or None. A URL naming an older
+    fingerprint resolves to the original, so it moves to the current one."""
+    if not url or url.startswith(("#", "//", "data:")) or ":" in url.split("/", 1)[0]:
+        return None
+    path = unquote(url.split("#", 1)[0].split("?", 1)[0])
+    rel = posixpath.normpath(path.lstrip("/") if path.startswith("/") else posixpath.join(page_dir, path))
+    if rel.startswith("../"):
+        return None
+    if rel in _ASSETS:
+        return rel
+    m = HASHED_RE.match(posixpath.basename(rel))
+    if m:
+        original = posixpath.join(posixpath.dirname(rel), m.group(1) + m.group(2))
+        if original in _ASSETS:
+            return original
+    return None
+
+
+def _rewrite_url(url: str, page_dir: str, used: set[str]) -> str:
+    rel = _target(url, page_dir)
+    if rel is None:
+        return url
+    used.add(rel)
+    # Swap the file name only, keeping the URL's directory part, query and fragment
+    end = min((i for i in (url.find("?"), url.find("#")) if i != -1), default=len(url))
+    head = url[:url.rfind("/", 0, end) + 1]
+    return head + posixpath.basename(_ASSETS[rel]) + url[end:]
+
+
+def rewrite_html(html: str, page_dir: str, used: set[str]) -> str:
+    """html with every local asset reference pointing at the asset's fingerprinted copy."""
+
+    def repl(m: re.Match) -> str:
+        attr = m.group(1)
+        quote = '"' if m.group(2) is not None else "'" if m.group(3) is not None else ""
+        value = next(v for v in m.group(2, 3, 4) if v is not None)
+        if attr.strip().lower().startswith("srcset"):
+            candidates = []
+            for candidate in value.split(","):
+                parts = candidate.strip().split(None, 1)
+                if parts:
+                    parts[0] = _rewrite_url(parts[0], page_dir, used)
+                candidates.append(" ".join(parts))
+            new = ", ".join(candidates)
+        else:
+            new = _rewrite_url(value, page_dir, used)
+        return f"{attr}{quote}{new}{quote}"
+
+    return URL_ATTR_RE.sub(repl, html)
+
+
+def rewrite_chunk(chunk: list[str]) -> list[tuple[str, bool, list[str]]]:
+    """Rewrite a chunk of pages in place. Returns [(path, changed, assets referenced)]."""
+    out = []
+    for name in chunk:
+        path = Path(name)
+        html = path.read_text(encoding="utf-8")
+        used: set[str] = set()
+        new_html = rewrite_html(html, path.parent.relative_to(PUBLIC).as_posix(), used)
+        if new_html != html:
+            write_atomic(path, new_html)
+        out.append((name, new_html != html, sorted(used)))
+    return out
+
+
+def load_state() -> dict:
+    try:
+        data = json.loads(STATE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if data.get("version") == STATE_VERSION else {}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fingerprint assets referenced by pages in public/.")
+    parser.add_argument("--force", action="store_true", help="rehash every asset, ignoring the cached hashes")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="worker processes (0 = all cores)")
+    args = parser.parse_args()
+    state = load_state()
+    cache: dict[str, list] = {} if args.force else state.get("hashes", {})
+    asset_map = assets(cache)
+    pages = []
+    for dirpath, _, filenames in os.walk(PUBLIC):
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            if filename.endswith(".html") and not is_redirect_stub(path):
+                pages.append(str(path))
+    pages.sort()
+    used: set[str] = set()
+    rewritten = 0
+    for _, changed, refs in map_chunks(rewrite_chunk, pages, args.jobs, _init_worker, (asset_map,)):
+        rewritten += changed
+        used.update(refs)
+    methods = list(METHODS)
+    placed = 0
+    for rel in sorted(used):
+        dst = PUBLIC / asset_map[rel]
+        if not dst.exists():
+            place(PUBLIC / rel, dst, methods)
+            placed += 1
+    live = {asset_map[rel] for rel in used}
+    removed = 0
+    for rel in state.get("outputs", []):
+        if rel not in live and (PUBLIC / rel).exists():
+            remove_orphan(PUBLIC / rel)
+            removed += 1
+    hashed = sum(1 for _, _, filenames in os.walk(PUBLIC) for f in filenames if HASHED_RE.match(f))
+    if OLD_HEADERS.is_file() and OLD_HEADERS.read_text(encoding="utf-8").startswith(OLD_HEADERS_MARK):
+        OLD_HEADERS.unlink()
+    write_atomic(STATE, json.dumps({
+        "version": STATE_VERSION,
+        "hashes": {rel: cache[rel] for rel in asset_map},
+        "outputs": sorted(live),
+    }, indent=1, sort_keys=True))
+    print(f"Fingerprints: {len(used)} asset(s) referenced by {len(pages)} page(s); {placed} fingerprinted "
+          f"file(s) written, {removed} stale removed, {rewritten} page(s) rewritten; {hashed} file(s) "
+          f"for the immutable cache rule (paths matching {FINGERPRINT_PATTERN}).")
+
+
+if __name__ == "__main__":
+    main()
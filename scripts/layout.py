@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Shared page layout for the builders (glossary index, term pages, articles).
+Templates are compiled once into literal text and {{name}} blocks, so rendering is a single join.
+The parts that depend only on where a page sits (head assets, nav, mobile nav, footer) are rendered
+once per directory and cached; a page render fills in just its own title, meta and content.
+Slot markers for integrations (<!--slot:NAME-->) are part of the layout; see integrations/page_hooks.py."""
+import posixpath
+import re
+from functools import lru_cache
+
+BLOCK_RE = re.compile(r"\{\{([a-z_]+)\}\}")
+# Top-level sections in nav and footer: label -> directory under public/ ("." is the home page)
+NAV_LINKS = (("Home", "."), ("Blog", "articles"), ("FAQ", "faq"), ("Glossary", "glossary"))
+
+
+class Template:
+    """Template text with {{name}} blocks, split once into literals and block names.
+    render() joins literals with the given blocks; blocks not given render as ""."""
+
+    def __init__(self, text: str):
+        parts = BLOCK_RE.split(text)
+        self._literals = parts[0::2]
+        self._names = parts[1::2]
+        self.names = frozenset(self._names)
+
+    def render(self, **blocks: str) -> str:
+        unknown = blocks.keys() - self.names
+        if unknown:
+            raise ValueError(f"unknown template block(s): {', '.join(sorted(unknown))}")
+        out = [self._literals[0]]
+        for name, literal in zip(self._names, self._literals[1:]):
+            out.append(blocks.get(name, ""))
+            out.append(literal)
+        return "".join(out)
+
+
+BASE = Template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <title>{{title}}</title>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1, shrink-to-fit=no">
+    <meta name="description" content="{{description}}">
+    <link rel="canonical" href="{{canonical}}">
+{{head_assets}}{{head_extra}}</head>
+<body class="antialiased bg-body text-body font-body">
+    <div class="">
+      <section class="bg-gradient-to-r from-neutral-950 via-neutral-900 to-neutral-950" x-data="{ mobileNavOpen: false }">
+        <div class="container px-4 mx-auto">
+{{nav}}          <!--slot:ad_top-->
+{{content}}        </div>
+{{mobile_nav}}      </section>
+
+{{footer}}      <!--slot:ad_bottom-->
+    </div>
+{{scripts}}    <!--slot:body_end-->
+</body>
+</html>
+''')
+
+HEAD_ASSETS = Template('''    <link rel="preconnect" href="https://fonts.gstatic.com">
+    <link href="https://fonts.cdnfonts.com/css/inter?styles=135009,135005,135007,135002,135000" rel="stylesheet" />
+    <link rel="stylesheet" href="{{root}}css/tailwind/tailwind.min.css">
+    <link rel="icon" type="image/png" sizes="32x32" href="{{root}}favicon.png">
+    <script src="https://cdn.jsdelivr.net/npm/alpinejs@3.13.3/dist/cdn.min.js" defer></script>
+''')
+
+NAV = Template('''          <nav class="flex justify-between items-center py-8">
+            <a href="{{home}}" class="text-xl font-semibold text-transparent bg-clip-text bg-gradient-to-r from-gray-100 to-gray-300">VPNsurf.com</a>
+            <div class="lg:hidden">
+              <button x-on:click="mobileNavOpen = !mobileNavOpen" class="block hover:text-white text-neutral-300 focus:outline-none transition-colors duration-200">
+                <svg xmlns="http://www.w3.org/2000/svg" class="h-6 w-6" fill="currentColor" viewbox="0 0 20 20"><path d="M0 3h20v2H0V3zm0 6h20v2H0V9zm0 6h20v2H0v-2z"></path></svg>
+              </button>
+            </div>
+            <ul class="hidden lg:flex ml-auto mr-8 items-center w-auto space-x-8">
+{{items}}            </ul>
+            <a class="hidden lg:block px-4 py-2 text-sm font-semibold text-neutral-950 bg-white hover:bg-neutral-100 rounded-full transition-all duration-200 hover:shadow-lg" href="#">Get Started</a>
+          </nav>
+''')
+NAV_ITEM = Template('''              <li><a class="text-sm hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="{{href}}">{{label}}</a></li>
+''')
+
+MOBILE_NAV = Template('''        <div :class="{'block': mobileNavOpen, 'hidden': !mobileNavOpen}" class="hidden fixed top-0 left-0 bottom-0 w-5/6 max-w-sm z-50">
+          <div x-on:click="mobileNavOpen = !mobileNavOpen" class="fixed inset-0 bg-neutral-950 opacity-75 filter blur-3xl"></div>
+          <nav class="relative flex flex-col py-6 px-6 w-full h-full bg-neutral-900 border-r border-neutral-800 overflow-y-auto">
+            <div class="flex items-center mb-12">
+              <a href="{{home}}" class="mr-auto text-lg font-semibold text-white">VPNsurf.com</a>
+              <button x-on:click="mobileNavOpen = !mobileNavOpen"><svg xmlns="http://www.w3.org/2000/svg" class="h-6 w-6 text-neutral-400" fill="none" viewbox="0 0 24 24" stroke="currentColor"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12"></path></svg></button>
+            </div>
+            <ul>
+{{items}}            </ul>
+          </nav>
+        </div>
+''')
+MOBILE_NAV_ITEM = Template('''              <li class="mb-1"><a class="block p-4 text-sm font-semibold hover:bg-neutral-800 hover:text-white rounded-lg text-neutral-300" href="{{href}}">{{label}}</a></li>
+''')
+
+FOOTER = Template('''      <footer class="py-20 bg-gradient-to-r from-neutral-950 via-neutral-900 to-neutral-950">
+        <div class="container px-4 mx-auto">
+          <div class="flex flex-wrap -mx-4 mb-8 lg:mb-16">
+            <div class="w-full lg:w-1/3 px-4 mb-12 lg:mb-0">
+              <a class="flex items-center text-white text-xl leading-none font-semibold" href="{{home}}"><span class="text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-300 to-gray-100">VPNsurf.com</span></a>
+              <p class="mt-5 mb-6 max-w-xs text-neutral-300 leading-relaxed">Private, fast VPN for everyday browsing. No logs, no hassle.</p>
+              <div class="text-sm text-neutral-300 space-y-2">
+                <p><a href="mailto:info@vpnsurf.com" class="hover:text-white transition-colors duration-200">info@vpnsurf.com</a></p>
+                <p><a href="tel:+18552892773" class="hover:text-white transition-colors duration-200">1-855-289-2773</a></p>
+                <p><a href="tel:+18552892773" class="hover:text-white transition-colors duration-200">1-855-BUY-ASSET</a></p>
+              </div>
+            </div>
+            <div class="w-full lg:w-2/3 px-4">
+              <div class="flex flex-wrap justify-between">
+                <div class="w-1/2 lg:w-1/4 mb-8 lg:mb-0">
+                  <h3 class="mb-6 text-lg font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-200 to-gray-300">Site</h3>
+                  <ul class="text-sm">
+{{items}}                  </ul>
+                </div>
+                <div class="w-1/2 lg:w-1/4 mb-8 lg:mb-0">
+                  <h3 class="mb-6 text-lg font-medium text-transparent bg-clip-text bg-gradient-to-r from-gray-100 via-gray-200 to-gray-300">Legal</h3>
+                  <ul class="text-sm">
+                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="#">Privacy</a></li>
+                    <li><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="#">Terms</a></li>
+                  </ul>
+                </div>
+              </div>
+            </div>
+          </div>
+          <div class="border-t border-neutral-700 pt-8">
+            <p class="lg:text-center text-sm text-neutral-400">© VPNsurf.com. All rights reserved.</p>
+          </div>
+        </div>
+      </footer>
+''')
+FOOTER_ITEM = Template('''                    <li class="mb-4"><a class="hover:text-white font-medium text-neutral-300 transition-colors duration-200" href="{{href}}">{{label}}</a></li>
+''')
+
+
+def href_to(target_dir: str, page_dir: str) -> str:
+    """Relative link from a page in page_dir to target_dir/ (both relative to public/), e.g. "../"."""
+    rel = posixpath.relpath(target_dir, page_dir)
+    return "./" if rel == "." else rel + "/"
+
+
+def chrome(page_dir: str) -> dict[str, str]:
+    """Head assets, nav, mobile nav and footer for pages in page_dir (e.g. "glossary/vpn-tunnel")."""
+    return _chrome(tuple((label, href_to(target, page_dir)) for label, target in NAV_LINKS))
+
+
+@lru_cache(maxsize=None)
+def _chrome(links: tuple[tuple[str, str], ...]) -> dict[str, str]:
+    """Rendered once per distinct set of links, i.e. once per section and depth (all term pages share one)."""
+    home = links[0][1]
+    return {
+        "head_assets": HEAD_ASSETS.render(root=home),
+        "nav": NAV.render(home=home, items="".join(NAV_ITEM.render(href=h, label=t) for t, h in links)),
+        "mobile_nav": MOBILE_NAV.render(
+            home=home, items="".join(MOBILE_NAV_ITEM.render(href=h, label=t) for t, h in links)
+        ),
+        "footer": FOOTER.render(home=home, items="".join(FOOTER_ITEM.render(href=h, label=t) for t, h in links)),
+    }
+
+
+def render_page(page_path: str, **blocks: str) -> str:
+    """Full page for public/{page_path} (e.g. "articles/why-use-vpn/index.html"). blocks: title,
+    description, canonical (already escaped), content, and optionally head_extra and scripts."""
+    return BASE.render(**chrome(posixpath.dirname(page_path) or "."), **blocks)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Media index: format, pixel dimensions, byte size and content hash of every asset
+scripts/sync_assets.py can publish (source/pictures, source/videos, banner ads, favicon). Run from repo
+root to refresh it and print a summary, or call media_index() from a builder. Dimensions come from
+the file header (PNG, GIF, JPEG, WebP, AVIF/HEIF, SVG, ICO, BMP), so nothing is decoded. Records
+are cached in .build/media.json and reused while a file's size and mtime match (--force rereads all).
+Builders use it for intrinsic width/height and for content hashes without re-reading files."""
+import argparse
+import hashlib
+import json
+import re
+import struct
+from pathlib import Path
+
+from build_manifest import MANIFEST_DIR, write_atomic
+from sync_assets import source_files
+
+ROOT = Path(__file__).resolve().parent.parent
+INDEX = MANIFEST_DIR / "media.json"
+INDEX_VERSION = 1
+# Index as of this process's last media_index() or use_index() call, for dimensions()
+_index: dict[str, dict] | None = None
+# Header bytes read for sniffing; JPEG is walked segment by segment past this
+HEAD_BYTES = 64 * 1024
+SVG_TAG_RE = re.compile(r"<svg\b[^>]*>", re.IGNORECASE)
+SVG_ATTR_RE = re.compile(r"""\s(width|height|viewBox)\s*=\s*["']([^"']*)["']""", re.IGNORECASE)
+SVG_LENGTH_RE = re.compile(r"^\s*([0-9.]+)\s*(?:px)?\s*$")
+# JPEG start-of-frame markers (not DHT C4, JPG C8 or DAC CC)
+JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _jpeg_size(fh) -> tuple[int, int] | None:
+    fh.seek(2)
+    while True:
+        marker = fh.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+            continue  # markers without a length
+        length = fh.read(2)
+        if len(length) < 2:
+            return None
+        if marker[1] in JPEG_SOF:
+            data = fh.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack(">HH", data[1:5])
+            return width, height
+        fh.seek(struct.unpack(">H", length)[0] - 2, 1)
+
+
+def _svg_size(head: bytes) -> tuple[int, int] | None:
+    tag = SVG_TAG_RE.search(head.decode("utf-8", "replace"))
+    if tag is None:
+        return None
+    attrs = {name.lower(): value for name, value in SVG_ATTR_RE.findall(tag.group())}
+    width, height = (SVG_LENGTH_RE.match(attrs.get(k, "")) for k in ("width", "height"))
+    if width and height:
+        return round(float(width.group(1))), round(float(height.group(1)))
+    box = attrs.get("viewbox", "").replace(",", " ").split()
+    if len(box) == 4:
+        return round(float(box[2])), round(float(box[3]))
+    return None
+
+
+def _ico_size(head: bytes) -> tuple[int, int] | None:
+    """Largest image in an ICO directory (a 0 byte means 256 px)."""
+    count = struct.unpack("<H", head[4:6])[0]
+    entries = [(head[6 + 16 * i] or 256, head[7 + 16 * i] or 256) for i in range(count) if 8 + 16 * i <= len(head)]
+    return max(entries, key=lambda s: s[0] * s[1]) if entries else None
+
+
+def _isobmff_size(head: bytes) -> tuple[int, int] | None:
+    """Image spatial extents ("ispe") of an AVIF/HEIF file: the largest, i.e. the primary image."""
+    sizes = []
+    start = head.find(b"ispe")
+    while start != -1 and start + 16 <= len(head):
+        sizes.append(struct.unpack(">II", head[start + 8:start + 16]))
+        start = head.find(b"ispe", start + 4)
+    return max(sizes, key=lambda s: s[0] * s[1]) if sizes else None
+
+
+def sniff(path: Path) -> tuple[str, int | None, int | None]:
+    """(format, width, height) from the file header; unknown formats use the file extension and
+    have no dimensions."""
+    with path.open("rb") as fh:
+        head = fh.read(HEAD_BYTES)
+        size = None
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            fmt, size = "png", struct.unpack(">II", head[16:24])
+        elif head[:6] in (b"GIF87a", b"GIF89a"):
+            fmt, size = "gif", struct.unpack("<HH", head[6:10])
+        elif head.startswith(b"\xff\xd8"):
+            fmt, size = "jpeg", _jpeg_size(fh)
+        elif head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            fmt, chunk = "webp", head[12:16]
+            if chunk == b"VP8 " and len(head) >= 30:
+                w, h = struct.unpack("<HH", head[26:30])
+                size = w & 0x3FFF, h & 0x3FFF
+            elif chunk == b"VP8L" and len(head) >= 25:
+                bits = int.from_bytes(head[21:25], "little")
+                size = (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            elif chunk == b"VP8X" and len(head) >= 30:
+                size = int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+        elif head[4:8] == b"ftyp" and head[8:12] in (b"avif", b"avis", b"heic", b"heix", b"mif1"):
+            fmt, size = ("avif" if head[8:11] == b"avi" else "heif"), _isobmff_size(head)
+        elif head[4:8] == b"ftyp":
+            fmt = "mp4"
+        elif head.startswith(b"\x1a\x45\xdf\xa3"):
+            fmt = "webm"
+        elif head[:4] == b"\x00\x00\x01\x00" and len(head) >= 8:
+            fmt, size = "ico", _ico_size(head)
+        elif head[:2] == b"BM" and len(head) >= 26:
+            fmt, size = "bmp", struct.unpack("<ii", head[18:26])
+            size = abs(size[0]), abs(size[1])
+        elif b"<svg" in head[:4096]:
+            fmt, size = "svg", _svg_size(head)
+        else:
+            fmt = path.suffix.lower().lstrip(".") or "unknown"
+    return (fmt, *size) if size else (fmt, None, None)
+
+
+def _file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_index() -> dict[str, dict]:
+    """public/-relative path -> {"size", "mtime_ns", "format", "width", "height", "hash"}, as last written."""
+    try:
+        data = json.loads(INDEX.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data.get("media", {}) if data.get("version") == INDEX_VERSION else {}
+
+
+def media_index(force: bool = False) -> dict[str, dict]:
+    """The index for the current source files, re-reading only files whose size or mtime changed
+    (all with force). Rewrites .build/media.json when anything changed."""
+    cached = {} if force else load_index()
+    index: dict[str, dict] = {}
+    for rel, src in sorted(source_files().items()):
+        st = src.stat()
+        record = cached.get(rel)
+        if record is None or record["size"] != st.st_size or record["mtime_ns"] != st.st_mtime_ns:
+            fmt, width, height = sniff(src)
+            record = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "format": fmt,
+                      "width": width, "height": height, "hash": _file_hash(src)}
+        index[rel] = record
+    global _index
+    if index != cached:
+        write_atomic(INDEX, json.dumps({"version": INDEX_VERSION, "media": index}, indent=1, sort_keys=True))
+    _index = index
+    return index
+
+
+def use_index(index: dict[str, dict]) -> None:
+    """Serve dimensions() from an index refreshed elsewhere. Builders pass the parent's index to
+    worker processes through this, so workers never re-scan or rewrite .build/media.json."""
+    global _index
+    _index = index
+
+
+def dimensions(rel: str) -> tuple[int, int] | None:
+    """(width, height) of public/{rel} (e.g. "pictures/x.png"), or None if unknown. The first call in
+    a process brings the index up to date unless media_index() or use_index() already ran."""
+    if _index is None:
+        media_index()
+    record = _index.get(rel)
+    if record is None or not record.get("width"):
+        return None
+    return record["width"], record["height"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh and summarize the media index.")
+    parser.add_argument("--force", action="store_true", help="reread every file, ignoring the cached index")
+    parser.add_argument("--list", action="store_true", help="print one line per file")
+    args = parser.parse_args()
+    index = media_index(args.force)
+    by_format: dict[str, list[int]] = {}
+    for rel, record in index.items():
+        totals = by_format.setdefault(record["format"], [0, 0])
+        totals[0] += 1
+        totals[1] += record["size"]
+        if args.list:
+            dims = f"{record['width']}x{record['height']}" if record["width"] else "-"
+            print(f"  {rel}: {record['format']} {dims} {record['size'] // 1024} KiB {record['hash'][:10]}")
+    print(f"Media index: {len(index)} file(s) in {INDEX.relative_to(ROOT)}.")
+    for fmt, (count, size) in sorted(by_format.items()):
+        print(f"  {fmt}: {count} file(s), {size // 1024} KiB")
+
+
+if __name__ == "__main__":
+    main()
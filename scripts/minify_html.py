@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Minify every HTML page in public/ in place. Run from repo root after the CSS purge (pages final).
+Whitespace runs between and inside tags collapse to one character (a newline if the run had one, so
+later line-based passes still find their markup), comments are dropped (IE conditional comments are
+kept), and attribute values that need no quotes lose them. <pre>, <textarea>, <script> (JSON-LD
+included) and <style> are copied verbatim, and whitespace is never removed outright, so spacing
+between inline elements renders as before. Redirect stubs are left alone. Output is idempotent; a
+page whose size and mtime match the last run is not re-read (--force minifies all).
+--jobs N minifies in N worker processes (0 = one per core). Reports bytes saved per section."""
+import argparse
+import json
+import os
+import re
+from pathlib import Path
+
+from build_manifest import MANIFEST_DIR, write_atomic
+from build_parallel import map_chunks
+from clean_urls import is_redirect_stub
+
+ROOT = Path(__file__).resolve().parent.parent
+PUBLIC = ROOT / "public"
+STATE = MANIFEST_DIR / "minify.json"
+STATE_VERSION = 1
+
+TOKEN_RE = re.compile(
+    r"""(?P<raw><(?P<raw_tag>pre|textarea|script|style)\b(?:"[^"]*"|'[^']*'|[^'">])*>.*?</(?P=raw_tag)\s*>)"""
+    r"|(?P<comment><!--.*?-->)"
+    r"""|(?P<tag><[A-Za-z][^\s/>]*(?:"[^"]*"|'[^']*'|[^'">])*>)"""
+    r"|(?P<text>[^<]+|<)",
+    re.DOTALL | re.IGNORECASE,
+)
+ATTR_RE = re.compile(r"""\s+([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?""")
+# HTML whitespace only: a no-break space (U+00A0) is content
+SPACE_RE = re.compile(r"[ \t\n\r\f]+")
+# Values written without quotes: a conservative subset of what HTML allows, never ending in "/"
+# (href=../x/> is valid, but reads like a self-closing tag to anything less careful than a browser)
+UNQUOTED_RE = re.compile(r"^[A-Za-z0-9_.:/#?%+-]*[A-Za-z0-9_.:#?%+-]$")
+
+
+def _space(m: re.Match) -> str:
+    return "\n" if "\n" in m.group() else " "
+
+
+def _tag(tag: str) -> str:
+    """Start tag with single spaces between attributes and quotes dropped where not needed."""
+    name = re.match(r"<[^\s/>]+", tag).group()
+    self_closing = tag.endswith("/>")
+    attrs = [(m.group(1), m.group(2) if m.group(2) is not None else m.group(3) if m.group(3) is not None else m.group(4))
+             for m in ATTR_RE.finditer(tag, len(name))]
+    out = [name]
+    for i, (attr, value) in enumerate(attrs):
+        if value is None:
+            out.append(f" {attr}")
+        elif UNQUOTED_RE.match(value) and not (self_closing and i == len(attrs) - 1):
+            # The last value of <x … /> keeps its quotes, or the slash would be read as part of it
+            out.append(f" {attr}={value}")
+        elif '"' in value:
+            out.append(f" {attr}='{value}'")
+        else:
+            out.append(f' {attr}="{value}"')
+    out.append("/>" if self_closing else ">")
+    return "".join(out)
+
+
+def minify(html: str) -> str:
+    out = []
+    for m in TOKEN_RE.finditer(html):
+        kind = m.lastgroup
+        if kind == "raw":
+            out.append(m.group())
+        elif kind == "comment":
+            if m.group().startswith(("<!--[if", "<!--<![endif]")):
+                out.append(m.group())
+        elif kind == "tag":
+            out.append(_tag(m.group()))
+        else:
+            out.append(SPACE_RE.sub(_space, m.group()))
+    return "".join(out).lstrip()
+
+
+def minify_chunk(chunk: list[str]) -> list[tuple[str, int, int, int, int]]:
+    """Minify a chunk of paths in place. Returns [(path, bytes before, bytes after, size, mtime_ns)]."""
+    out = []
+    for name in chunk:
+        path = Path(name)
+        html = path.read_text(encoding="utf-8")
+        small = minify(html)
+        if small != html:
+            write_atomic(path, small)
+        st = path.stat()
+        out.append((name, len(html.encode("utf-8")), len(small.encode("utf-8")), st.st_size, st.st_mtime_ns))
+    return out
+
+
+def load_state() -> dict[str, list[int]]:
+    """rel path -> [size, mtime_ns] of each page as the last run left it."""
+    try:
+        data = json.loads(STATE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data.get("files", {}) if data.get("version") == STATE_VERSION else {}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Minify HTML pages in public/ in place.")
+    parser.add_argument("--force", action="store_true", help="minify every page, ignoring the last run's state")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="worker processes (0 = all cores)")
+    args = parser.parse_args()
+    state = {} if args.force else load_state()
+    new_state: dict[str, list[int]] = {}
+    pending: list[str] = []
+    for dirpath, _, filenames in os.walk(PUBLIC):
+        for filename in filenames:
+            if not filename.endswith(".html"):
+                continue
+            path = Path(dirpath) / filename
+            rel = path.relative_to(PUBLIC).as_posix()
+            st = path.stat()
+            cached = state.get(rel)
+            if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                new_state[rel] = cached
+            elif not is_redirect_stub(path):
+                pending.append(str(path))
+    pending.sort()
+    changed = 0
+    # Section -> [pages, bytes before, bytes after] for the pages checked this run
+    sections: dict[str, list[int]] = {}
+    for name, before, after, size, mtime in map_chunks(minify_chunk, pending, args.jobs):
+        rel = Path(name).relative_to(PUBLIC).as_posix()
+        new_state[rel] = [size, mtime]
+        changed += before != after
+        totals = sections.setdefault(rel.split("/", 1)[0] if "/" in rel else "(top level)", [0, 0, 0])
+        totals[0] += 1
+        totals[1] += before
+        totals[2] += after
+    write_atomic(STATE, json.dumps({"version": STATE_VERSION, "files": new_state}, sort_keys=True))
+    print(f"Minified {changed} of {len(pending)} page(s) checked, {len(new_state) - len(pending)} unchanged.")
+    for section, (count, before, after) in sorted(sections.items(), key=lambda s: s[1][2] - s[1][1]):
+        saved = before - after
+        print(f"  {section}: {count} page(s), {before // 1024} KiB -> {after // 1024} KiB "
+              f"(-{saved // 1024} KiB, {100 * saved / before if before else 0:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
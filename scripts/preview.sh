@@ -1,10 +1,16 @@
 #!/usr/bin/env bash
 # Serve public/ on localhost for quick preview before deploy.
 # Run from repo root after ./build.sh. Ctrl+C to stop.
+# --watch rebuilds on every change to source/, scripts/ or integrations/ and reloads open tabs
+# (scripts/watch.py; other options are passed to it, e.g. --port 8080 or --poll).
 set -e
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
 cd "$REPO_ROOT"
+if [ "${1:-}" = "--watch" ]; then
+  shift
+  exec python3 scripts/watch.py "$@"
+fi
 if [ ! -d public ]; then
   echo "Error: public/ not found. Run ./build.sh first." >&2
   exit 1
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Purge public/css/tailwind/tailwind.min.css down to the classes the site uses, and inline each
+page's above-the-fold subset. Run from repo root after the clean-URL step (pages in final place).
+Every page linking the Tailwind stylesheet is scanned for class names (class="…", Alpine
+:class="{'name': …}", and data-*-class="…" attributes that page scripts copy into className;
+arbitrary variants such as [&_p]:leading-[1.75] included). Rules whose classes are all in use go
+to css/tailwind/tailwind.<hash>.css; the rules for classes in the first FOLD_BYTES of <body> (plus
+element rules), measured on minified markup with asset fingerprints
+stripped so later stages do not move the fold, are inlined as <style data-critical>, and the full
+stylesheet is loaded without blocking render. tailwind.min.css stays as the source. Re-running
+rewrites pages to the current hash, so pages skipped by incremental builds are updated too; pages
+already current (minified ones included) are not rewritten."""
+import hashlib
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from minify_html import minify
+
+ROOT = Path(__file__).resolve().parent.parent
+PUBLIC = ROOT / "public"
+CSS_DIR = PUBLIC / "css" / "tailwind"
+SOURCE_CSS = CSS_DIR / "tailwind.min.css"
+# Body markup treated as above the fold: nav, top banner, heading and hero on our templates
+FOLD_BYTES = 8192
+
+CLASS_ATTR_RE = re.compile(r'\sclass=(?:"([^"]*)"|([^\s"\'=<>`]+))')
+# Classes a page's script assigns at runtime, e.g. data-link-class="…" (see scripts/build_search.py)
+DATA_CLASS_RE = re.compile(r'\sdata-[\w-]+-class=(?:"([^"]*)"|([^\s"\'=<>`]+))')
+ALPINE_CLASS_RE = re.compile(r'(?:x-bind)?:class="([^"]*)"')
+QUOTED_RE = re.compile(r"'([^']*)'")
+# Original stylesheet link, or one this script wrote on a previous run (quotes optional: minified pages)
+LINK_RE = re.compile(
+    r'^([ \t]*)<link rel="?stylesheet"? href="?((?:\.\./)*)css/tailwind/(tailwind\.(?:min|[0-9a-f]{10})\.css)"?[^>]*>'
+    r"(?:<noscript>.*?</noscript>)?\n",
+    re.MULTILINE,
+)
+CRITICAL_RE = re.compile(r"^[ \t]*<style data-critical>(.*?)</style>\n", re.MULTILINE | re.DOTALL)
+HASHED_RE = re.compile(r"^tailwind\.[0-9a-f]{10}\.css$")
+SELECTOR_CLASS_RE = re.compile(r"\.((?:\\[0-9a-fA-F]{1,6} ?|\\.|[\w-])+)")
+NOT_RE = re.compile(r":not\([^)]*\)")
+# name.<hash>.ext asset URLs written by scripts/fingerprint_assets.py
+FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{10}(\.[A-Za-z0-9]+)(?=[\s\"'>?#,)])")
+
+
+def _unescape(ident: str) -> str:
+    """CSS identifier escapes to text: \\32xl -> 2xl, \\[\\&_p\\]\\: -> [&_p]:."""
+    ident = re.sub(r"\\([0-9a-fA-F]{1,6}) ?", lambda m: chr(int(m.group(1), 16)), ident)
+    return re.sub(r"\\(.)", r"\1", ident)
+
+
+def page_classes(html: str) -> set[str]:
+    """Class names used in html, from class and data-*-class attributes and Alpine :class object keys."""
+    classes: set[str] = set()
+    for m in (*CLASS_ATTR_RE.finditer(html), *DATA_CLASS_RE.finditer(html)):
+        classes.update((m.group(1) or m.group(2) or "").split())
+    for m in ALPINE_CLASS_RE.finditer(html):
+        for quoted in QUOTED_RE.findall(m.group(1)):
+            classes.update(quoted.split())
+    return classes
+
+
+def _split_selectors(prelude: str) -> list[str]:
+    """Split a selector list on top-level commas (not those inside :is(…) or [attr=…])."""
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(prelude):
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(prelude[start:i])
+            start = i + 1
+    parts.append(prelude[start:])
+    return parts
+
+
+def _matching_end(css: str, open_at: int) -> int:
+    depth = 0
+    for i in range(open_at, len(css)):
+        if css[i] == "{":
+            depth += 1
+        elif css[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(css)
+
+
+def parse_css(css: str) -> list[tuple]:
+    """Minified CSS to nodes: ("rule", [(selector, required classes)], body), ("media", prelude, nodes)
+    for @media/@supports, ("raw", text) for other at-rules (kept as they are)."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    nodes: list[tuple] = []
+    pos = 0
+    while True:
+        brace = css.find("{", pos)
+        if brace == -1:
+            break
+        prelude = css[pos:brace].strip()
+        if prelude.startswith("@"):
+            end = _matching_end(css, brace)
+            if prelude.startswith(("@media", "@supports")):
+                nodes.append(("media", prelude, parse_css(css[brace + 1:end])))
+            else:
+                nodes.append(("raw", css[pos:end + 1].strip()))
+        else:
+            end = css.find("}", brace)
+            selectors = [
+                (sel, frozenset(_unescape(c) for c in SELECTOR_CLASS_RE.findall(NOT_RE.sub("", sel))))
+                for sel in _split_selectors(prelude)
+            ]
+            nodes.append(("rule", selectors, css[brace + 1:end]))
+        pos = end + 1
+    return nodes
+
+
+def render_css(nodes: list[tuple], used: set[str] | frozenset[str]) -> str:
+    """Nodes back to minified CSS, keeping selectors whose classes are all in used."""
+    out = []
+    for node in nodes:
+        if node[0] == "rule":
+            kept = [sel for sel, required in node[1] if required <= used]
+            if kept:
+                out.append(f"{','.join(kept)}{{{node[2]}}}")
+        elif node[0] == "media":
+            inner = render_css(node[2], used)
+            if inner:
+                out.append(f"{node[1]}{{{inner}}}")
+        else:
+            out.append(node[1])
+    return "".join(out)
+
+
+def fold_html(html: str) -> str:
+    """The first FOLD_BYTES of <body> markup, taken the same before and after the minify and
+    fingerprint stages: whitespace collapsed and name.<hash>.ext URLs back to name.ext."""
+    html = FINGERPRINT_RE.sub(r"\1", minify(html))
+    start = html.find("<body")
+    return html[max(start, 0):max(start, 0) + FOLD_BYTES]
+
+
+def rewrite_page(html: str, critical: str, href: str) -> str:
+    """Inline critical CSS and load href without blocking render, replacing any previous run's markup.
+    A page that already has this critical CSS and stylesheet is returned as is (it may be minified)."""
+    old_critical = CRITICAL_RE.search(html)
+    link = LINK_RE.search(html)
+    if old_critical and link and old_critical.group(1) == critical and f"css/tailwind/{link.group(3)}" == href:
+        return html
+    html = CRITICAL_RE.sub("", html)
+
+    def repl(m: re.Match) -> str:
+        indent, prefix = m.group(1), m.group(2)
+        url = prefix + href
+        return (
+            f"{indent}<style data-critical>{critical}</style>\n"
+            f'{indent}<link rel="stylesheet" href="{url}" media="print" onload="this.media=\'all\'">'
+            f'<noscript><link rel="stylesheet" href="{url}"></noscript>\n'
+        )
+
+    return LINK_RE.sub(repl, html, count=1)
+
+
+def main() -> None:
+    if not SOURCE_CSS.exists():
+        print(f"No {SOURCE_CSS.relative_to(ROOT)}; skipping CSS purge.")
+        return
+    source = SOURCE_CSS.read_text(encoding="utf-8")
+    nodes = parse_css(source)
+    # Keep /*! … */ license banners in the stylesheet (not in the inlined copy)
+    banner = "".join(re.findall(r"/\*!.*?\*/", source, flags=re.DOTALL))
+    pages: dict[Path, str] = {}
+    used: set[str] = set()
+    for dirpath, _, filenames in os.walk(PUBLIC):
+        for filename in filenames:
+            if not filename.endswith(".html"):
+                continue
+            path = Path(dirpath) / filename
+            html = path.read_text(encoding="utf-8")
+            if LINK_RE.search(html):
+                pages[path] = html
+                used |= page_classes(html)
+    if not pages:
+        print("No pages link the Tailwind stylesheet; skipping CSS purge.")
+        return
+
+    purged = banner + render_css(nodes, used)
+    name = f"tailwind.{hashlib.sha256(purged.encode('utf-8')).hexdigest()[:10]}.css"
+    out_path = CSS_DIR / name
+    if not out_path.exists():
+        tmp = out_path.with_suffix(".css.tmp")
+        tmp.write_text(purged, encoding="utf-8")
+        os.replace(tmp, out_path)
+    for path in CSS_DIR.iterdir():
+        if HASHED_RE.match(path.name) and path.name != name:
+            path.unlink()
+
+    # Templates repeat, so most pages share a fold class set
+    critical_for = lru_cache(maxsize=None)(lambda fold: render_css(nodes, fold))
+    updated = 0
+    critical_bytes = 0
+    for path, html in sorted(pages.items()):
+        critical = critical_for(frozenset(page_classes(fold_html(CRITICAL_RE.sub("", html)))))
+        critical_bytes += len(critical)
+        new_html = rewrite_page(html, critical, f"css/tailwind/{name}")
+        if new_html != html:
+            path.write_text(new_html, encoding="utf-8")
+            updated += 1
+    print(
+        f"CSS: {SOURCE_CSS.stat().st_size // 1024} KiB -> {len(purged) // 1024} KiB in {name}; "
+        f"{len(used)} class(es) in use; critical CSS avg {critical_bytes // len(pages) // 1024} KiB "
+        f"inline; {updated} of {len(pages)} page(s) updated."
+    )
+
+
+if __name__ == "__main__":
+    main()
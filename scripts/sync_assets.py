@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Sync static assets from source/ into public/ (banner ads, pictures, videos, favicon). Run from repo root
+after the pages are written (builders and injectors). Banner ads, pictures and videos are published
+only when a page, stylesheet, script or JSON/XML file in public/ references them (pictures/x.png,
+also under a fingerprinted name); copies of unreferenced ones are removed from public/, so they are
+never deployed; --all publishes every file. A file is only placed when the public copy is missing
+or differs in size or mtime (--checksum compares content instead of trusting mtimes, e.g. on a
+fresh CI checkout). New files are reflinked (copy-on-write clone) or hardlinked where the
+filesystem allows, and copied otherwise, always via a temporary name and rename. Files synced by an earlier run whose source was deleted
+are removed; files in public/ that this script never placed (hand-added pages, .gitkeep) are left
+alone. Dotfiles are skipped, as `cp -r source/x/*` did. --dry-run prints what would change."""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from urllib.parse import unquote
+
+from build_manifest import MANIFEST_DIR, write_atomic
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # no reflinks (Windows)
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCE = ROOT / "source"
+PUBLIC = ROOT / "public"
+STATE = MANIFEST_DIR / "assets.json"
+STATE_VERSION = 1
+# source/ path -> public/ path (directories are synced recursively)
+SYNC = (
+    ("banner_ads", "banner-ads"),
+    ("pictures", "pictures"),
+    ("videos", "videos"),
+    ("favicon.png", "favicon.png"),
+)
+# public/ folders whose files are published only when referenced
+REFERENCED_ONLY = ("banner-ads", "pictures", "videos")
+# Files scanned for references
+TEXT_EXTENSIONS = {".css", ".html", ".js", ".json", ".webmanifest", ".xml"}
+ASSET_REF_RE = re.compile(rf"""(?:{"|".join(map(re.escape, REFERENCED_ONLY))})/[^\s"'()<>?#,\\]+""")
+# name.<hash>.ext as written by scripts/fingerprint_assets.py -> name.ext
+FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{10}(?=\.[A-Za-z0-9]+$)")
+# Linux ioctl that clones a file's extents (Btrfs, XFS, bcachefs; ext4 refuses it)
+FICLONE = 0x40049409
+METHODS = ("reflink", "link", "copy")
+
+
+def source_files() -> dict[str, Path]:
+    """public/-relative path -> source file for every asset to sync."""
+    files: dict[str, Path] = {}
+    for src_name, dst_name in SYNC:
+        src = SOURCE / src_name
+        if src.is_file():
+            files[dst_name] = src
+            continue
+        for dirpath, dirnames, filenames in os.walk(src):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            rel_dir = Path(dst_name) / Path(dirpath).relative_to(src)
+            for filename in filenames:
+                if not filename.startswith("."):
+                    files[(rel_dir / filename).as_posix()] = Path(dirpath) / filename
+    return files
+
+
+def referenced_assets() -> set[str]:
+    """public/-relative paths (e.g. "pictures/x.png") of REFERENCED_ONLY files named by any text file
+    in public/, in relative, root-relative or absolute URLs."""
+    refs: set[str] = set()
+    for dirpath, dirnames, filenames in os.walk(PUBLIC):
+        if dirpath == str(PUBLIC):
+            dirnames[:] = [d for d in dirnames if d not in REFERENCED_ONLY]
+        for filename in filenames:
+            if os.path.splitext(filename)[1] not in TEXT_EXTENSIONS:
+                continue
+            text = Path(dirpath, filename).read_text(encoding="utf-8", errors="replace")
+            for ref in ASSET_REF_RE.findall(text):
+                refs.add(FINGERPRINT_RE.sub("", unquote(ref)))
+    return refs
+
+
+def load_state() -> set[str]:
+    """public/-relative paths placed by the previous run."""
+    try:
+        data = json.loads(STATE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return set()
+    return set(data.get("files", [])) if data.get("version") == STATE_VERSION else set()
+
+
+def _file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def is_current(src: Path, dst: Path, checksum: bool) -> bool:
+    """True if dst already holds src: same inode, or same size and mtime (or content, with checksum)."""
+    try:
+        d = dst.stat()
+    except FileNotFoundError:
+        return False
+    s = src.stat()
+    if (s.st_dev, s.st_ino) == (d.st_dev, d.st_ino):
+        return True
+    if s.st_size != d.st_size:
+        return False
+    if s.st_mtime_ns == d.st_mtime_ns:
+        return True
+    return checksum and _file_hash(src) == _file_hash(dst)
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    if fcntl is None:
+        raise OSError("reflinks not supported on this platform")
+    with src.open("rb") as fs, dst.open("wb") as fd:
+        fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+    shutil.copystat(src, dst)
+
+
+def place(src: Path, dst: Path, methods: list[str]) -> str:
+    """Put src at dst with the first method in methods that works, via a temporary name.
+    A method that fails is dropped from methods so later files do not retry it."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(dst.name + ".tmp")
+    for method in list(methods):
+        tmp.unlink(missing_ok=True)
+        try:
+            if method == "reflink":
+                _reflink(src, tmp)
+            elif method == "link":
+                os.link(src, tmp)
+            else:
+                shutil.copy2(src, tmp)
+        except OSError:
+            if method == "copy":
+                raise
+            methods.remove(method)
+            continue
+        os.replace(tmp, dst)
+        return method
+    raise OSError(f"no way to place {dst}")
+
+
+def remove_orphan(dst: Path) -> None:
+    """Delete dst and any directories under public/ it leaves empty."""
+    dst.unlink(missing_ok=True)
+    parent = dst.parent
+    while parent != PUBLIC and parent.is_dir() and not any(parent.iterdir()):
+        parent.rmdir()
+        parent = parent.parent
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync banner ads, pictures, videos and favicon into public/.")
+    parser.add_argument("--dry-run", "-n", action="store_true", help="list what would change, write nothing")
+    parser.add_argument("--checksum", action="store_true", help="compare content when mtimes differ")
+    parser.add_argument("--mode", choices=("auto",) + METHODS, default="auto",
+                        help="how to place files: auto tries reflink, then hardlink, then copy")
+    parser.add_argument("--all", action="store_true", help="publish every file, referenced or not")
+    args = parser.parse_args()
+    methods = list(METHODS) if args.mode == "auto" else [args.mode]
+    if "copy" not in methods:
+        methods.append("copy")
+    available = source_files()
+    state = load_state()
+    files = available
+    unreferenced: list[str] = []
+    if not args.all:
+        refs = referenced_assets()
+        files = {rel: src for rel, src in available.items()
+                 if rel.split("/", 1)[0] not in REFERENCED_ONLY or rel in refs}
+        # Copies of unreferenced files: ones this script placed, or identical ones (e.g. committed)
+        unreferenced = sorted(
+            rel for rel, src in available.items()
+            if rel not in files and (PUBLIC / rel).is_file() and (rel in state or is_current(src, PUBLIC / rel, True))
+        )
+    orphans = sorted(state - available.keys())
+    counts = {method: 0 for method in METHODS}
+    placed_bytes = 0
+    unchanged = 0
+    for rel, src in sorted(files.items()):
+        dst = PUBLIC / rel
+        if is_current(src, dst, args.checksum):
+            unchanged += 1
+            continue
+        placed_bytes += src.stat().st_size
+        if args.dry_run:
+            print(f"  {'update' if dst.exists() else 'add'} {rel}")
+            continue
+        counts[place(src, dst, methods)] += 1
+    unpublished_bytes = 0
+    for rel in unreferenced:
+        unpublished_bytes += (PUBLIC / rel).stat().st_size
+        if args.dry_run:
+            print(f"  unpublish {rel}")
+        else:
+            remove_orphan(PUBLIC / rel)
+    removed = 0
+    for rel in orphans:
+        dst = PUBLIC / rel
+        if not dst.is_file():
+            continue
+        removed += 1
+        if args.dry_run:
+            print(f"  remove {rel}")
+        else:
+            remove_orphan(dst)
+    if args.dry_run:
+        print(f"Assets (dry run): {len(files) - unchanged} file(s) to place ({placed_bytes // 1024} KiB), "
+              f"{unchanged} unchanged, {removed} orphan(s) and {len(unreferenced)} unreferenced file(s) "
+              f"({unpublished_bytes // 1024} KiB) to remove.")
+        return
+    write_atomic(STATE, json.dumps({"version": STATE_VERSION, "files": sorted(files)}, indent=1))
+    print(f"Assets: {counts['reflink']} reflinked, {counts['link']} hardlinked, {counts['copy']} copied "
+          f"({placed_bytes // 1024} KiB), {unchanged} unchanged, {removed} orphan(s) removed.")
+    if not args.all:
+        skipped = available.keys() - files.keys()
+        skipped_bytes = sum(available[rel].stat().st_size for rel in skipped)
+        print(f"  {len(files)} of {len(available)} file(s) published; {len(skipped)} unreferenced not deployed "
+              f"({skipped_bytes // 1024} KiB), {len(unreferenced)} removed from public/ "
+              f"({unpublished_bytes // 1024} KiB).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Aho–Corasick matcher over all glossary term names, built once per build.
+Scans a definition in a single pass instead of one regex per term, with the same rules the
+glossary has always used: case-insensitive, whole words only (regex \\b semantics),
+longest match first, no overlapping links, and never a link from a term to itself."""
+from collections import deque
+
+
+def _fold(s: str) -> str:
+    """Lowercase char by char, keeping length so match offsets map back onto the original text."""
+    return "".join(c if len(low := c.lower()) != 1 else low for c in s)
+
+
+def _is_word(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _at_boundary(text: str, i: int) -> bool:
+    """Same test as regex \\b: word-ness differs on either side of position i."""
+    left = i > 0 and _is_word(text[i - 1])
+    right = i < len(text) and _is_word(text[i])
+    return left != right
+
+
+class TermLinker:
+    """Multi-pattern matcher for term names. terms are given in priority order (longest first);
+    when two terms match exactly the same span, the earlier one wins."""
+
+    def __init__(self, terms: list[str]):
+        self.terms = list(terms)
+        self._lengths = [len(t) for t in self.terms]
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        self._by_name: dict[str, list[int]] = {}
+        for idx, term in enumerate(self.terms):
+            self._by_name.setdefault(term, []).append(idx)
+            if term:
+                self._add(_fold(term), idx)
+        self._link()
+
+    def _add(self, pattern: str, idx: int) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(idx)
+
+    def _link(self) -> None:
+        """Breadth-first failure links; each node's outputs include those of its failure chain."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def matches(self, text: str) -> list[tuple[int, int, int]]:
+        """Every whole-word occurrence of every term in text as (start, end, term_index),
+        overlapping ones included."""
+        folded = _fold(text)
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        found: list[tuple[int, int, int]] = []
+        node = 0
+        for i, ch in enumerate(folded):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            if not _at_boundary(text, end):
+                continue
+            for idx in out[node]:
+                start = end - lengths[idx]
+                if _at_boundary(text, start):
+                    found.append((start, end, idx))
+        return found
+
+    def find(self, text: str, exclude: str | None = None) -> list[tuple[int, int, str]]:
+        """Non-overlapping links for text, longest first at each position, skipping the term
+        named exclude. Returns [(start, end, term)] sorted by start."""
+        skip = set(self._by_name.get(exclude, ())) if exclude is not None else set()
+        candidates = [m for m in self.matches(text) if m[2] not in skip]
+        candidates.sort(key=lambda m: (m[0], m[0] - m[1], m[2]))
+        kept: list[tuple[int, int, str]] = []
+        last_end = 0
+        for start, end, idx in candidates:
+            if start < last_end:
+                continue
+            kept.append((start, end, self.terms[idx]))
+            last_end = end
+        return kept
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Watch mode: serve public/ with live reload and rebuild on change. Run from repo root (or
+`./scripts/preview.sh --watch`). Runs the affected build steps once at start, then watches source/,
+scripts/ and integrations/ (inotify on Linux, polling elsewhere or with --poll). A change reruns only
+the steps it affects: a glossary edit the glossary builder, an article edit the article builder,
+a new picture the article builder and asset sync, and so on. The builders are incremental, so only
+pages whose inputs changed are rewritten; the asset sync publishes only the files pages reference. Open tabs reload after each successful rebuild
+(HTML responses get a small EventSource script). CSS purge, sitemap and precompression are left to
+./build.sh; pages in preview load the full Tailwind stylesheet."""
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import subprocess
+import sys
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PUBLIC = ROOT / "public"
+WATCH_DIRS = ("source", "scripts", "integrations")
+# Build steps in run order: name -> script (all take no arguments except the builders' --jobs)
+STEPS = {
+    "glossary": "scripts/build_glossary.py",
+    "articles": "scripts/build_articles.py",
+    "sync": "scripts/sync_assets.py",
+    "clean_urls": "scripts/clean_urls.py",
+    "search": "scripts/build_search.py",
+}
+BUILDERS = ("glossary", "articles")
+# Changed path (relative to the repo root) -> steps to rerun; first matching prefix wins
+RULES = (
+    ("source/articles/vpnsurf_vpn_glossary_100_terms.md", ("glossary",)),
+    ("source/articles/", ("articles",)),
+    ("source/pictures/", ("sync", "articles")),
+    ("source/", ("sync",)),
+    ("scripts/build_glossary.py", ("glossary",)),
+    ("scripts/term_linker.py", ("glossary",)),
+    ("scripts/build_articles.py", ("articles",)),
+    ("scripts/build_images.py", ("articles",)),
+    ("scripts/media_index.py", ("articles",)),
+    ("scripts/sync_assets.py", ("sync",)),
+    ("scripts/clean_urls.py", ("clean_urls",)),
+    ("scripts/build_search.py", ("search",)),
+    ("scripts/", BUILDERS),
+    ("integrations/", BUILDERS),
+)
+# Quiet period after the last event before rebuilding (editors write several events per save)
+DEBOUNCE = 0.2
+RELOAD_PATH = "/__livereload"
+RELOAD_SCRIPT = (
+    f'<script>new EventSource("{RELOAD_PATH}").onmessage = function () {{ location.reload(); }};</script>\n'
+).encode("utf-8")
+
+
+def _ignored(name: str) -> bool:
+    """Editor swap/backup files, temporaries written by the build, bytecode."""
+    return (name.startswith((".", "#")) or name.endswith(("~", ".tmp", ".swp", ".pyc"))
+            or name == "__pycache__")
+
+
+def affected_steps(paths: set[Path]) -> list[str]:
+    """Build steps to rerun for the changed paths, in STEPS order."""
+    wanted: set[str] = set()
+    for path in paths:
+        try:
+            rel = path.relative_to(ROOT).as_posix()
+        except ValueError:
+            continue
+        for prefix, steps in RULES:
+            if rel == prefix or (prefix.endswith("/") and rel.startswith(prefix)):
+                wanted.update(steps)
+                break
+    if wanted & set(BUILDERS):
+        wanted.update(("sync", "clean_urls", "search"))  # newly referenced assets, redirect stubs, search index
+    return [name for name in STEPS if name in wanted]
+
+
+class PollingWatcher:
+    """Detects changes by comparing (mtime, size) of every file under the roots."""
+
+    def __init__(self, roots: list[Path], interval: float = 0.5):
+        self.roots = roots
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for root in self.roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if not _ignored(d)]
+                for filename in filenames:
+                    if _ignored(filename):
+                        continue
+                    path = Path(dirpath) / filename
+                    try:
+                        st = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def changes(self, timeout: float) -> set[Path]:
+        """Changed, added or removed paths, waiting up to timeout for the first one."""
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            old, self._snapshot = self._snapshot, snapshot
+            changed = {p for p in old.keys() | snapshot.keys() if old.get(p) != snapshot.get(p)}
+            if changed or time.monotonic() >= deadline:
+                return changed
+            time.sleep(min(self.interval, max(0.0, deadline - time.monotonic())))
+
+
+class InotifyWatcher:
+    """Linux inotify via libc (no third-party module). Raises OSError where inotify is unavailable."""
+
+    IN_MODIFY = 0x2
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_ISDIR = 0x40000000
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, roots: list[Path]):
+        try:
+            self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            init = self._libc.inotify_init1
+        except (AttributeError, OSError) as exc:
+            raise OSError("inotify not available") from exc
+        self._fd = init(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        for root in roots:
+            self._add_tree(root)
+
+    def _add_tree(self, root: Path) -> None:
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not _ignored(d)]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), self.MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {dirpath} "
+                              "(raise fs.inotify.max_user_watches or use --poll)")
+            self._dirs[wd] = Path(dirpath)
+
+    def changes(self, timeout: float) -> set[Path]:
+        """Paths named by events that arrive within timeout (new directories are watched too)."""
+        changed: set[Path] = set()
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return changed
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = os.fsdecode(data[offset:offset + length].split(b"\0", 1)[0])
+            offset += length
+            if wd not in self._dirs or not name or _ignored(name):
+                continue
+            path = self._dirs[wd] / name
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and path.is_dir():
+                    self._add_tree(path)
+                    changed.update(p for p in path.rglob("*") if p.is_file())
+                continue
+            changed.add(path)
+        return changed
+
+
+def make_watcher(roots: list[Path], poll: bool, interval: float) -> PollingWatcher | InotifyWatcher:
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except OSError as exc:
+            print(f"inotify unavailable ({exc}); polling every {interval}s.")
+    return PollingWatcher(roots, interval)
+
+
+class Reloader:
+    """Generation counter that live-reload connections wait on."""
+
+    def __init__(self):
+        self.generation = 0
+        self._cond = threading.Condition()
+
+    def bump(self) -> None:
+        with self._cond:
+            self.generation += 1
+            self._cond.notify_all()
+
+    def wait(self, seen: int, timeout: float) -> int:
+        with self._cond:
+            self._cond.wait_for(lambda: self.generation != seen, timeout)
+            return self.generation
+
+
+class PreviewHandler(SimpleHTTPRequestHandler):
+    """Serves public/, adds the reload script to HTML and streams reload events on RELOAD_PATH."""
+
+    reloader: Reloader
+
+    def log_message(self, format: str, *args) -> None:
+        pass  # the rebuild log is what matters in watch mode
+
+    def do_GET(self) -> None:
+        if self.path == RELOAD_PATH:
+            self._events()
+            return
+        path = Path(self.translate_path(self.path))
+        if path.is_dir() and self.path.split("?", 1)[0].endswith("/"):
+            path = path / "index.html"
+        if path.suffix != ".html" or not path.is_file():
+            super().do_GET()
+            return
+        body = path.read_bytes()
+        end = body.rfind(b"</body>")
+        body = body[:end] + RELOAD_SCRIPT + body[end:] if end != -1 else body + RELOAD_SCRIPT
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _events(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        seen = self.reloader.generation
+        try:
+            while True:
+                generation = self.reloader.wait(seen, timeout=15)
+                # A comment line keeps idle connections open through proxies
+                self.wfile.write(b"data: reload\n\n" if generation != seen else b": ping\n\n")
+                self.wfile.flush()
+                seen = generation
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def run_steps(steps: list[str], jobs: int) -> bool:
+    """Run the steps in order; stop at the first failure."""
+    for name in steps:
+        cmd = [sys.executable, STEPS[name]]
+        if name in BUILDERS:
+            cmd += ["--jobs", str(jobs)]
+        if subprocess.run(cmd, cwd=ROOT).returncode != 0:
+            print(f"{STEPS[name]} failed; fix it and save again.")
+            return False
+    return True
+
+
+def serve(port: int, reloader: Reloader) -> ThreadingHTTPServer:
+    handler = partial(type("Handler", (PreviewHandler,), {"reloader": reloader}), directory=str(PUBLIC))
+    server = ThreadingHTTPServer(("localhost", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve public/ with live reload and rebuild on change.")
+    parser.add_argument("--port", type=int, default=8000, help="preview port (default 8000)")
+    parser.add_argument("--poll", action="store_true", help="poll for changes instead of using inotify")
+    parser.add_argument("--interval", type=float, default=0.5, help="polling interval in seconds")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="worker processes for the builders")
+    args = parser.parse_args()
+    run_steps(list(STEPS), args.jobs)
+    reloader = Reloader()
+    serve(args.port, reloader)
+    watcher = make_watcher([ROOT / d for d in WATCH_DIRS], args.poll, args.interval)
+    print(f"Serving public/ at http://localhost:{args.port} with live reload; watching "
+          f"{', '.join(WATCH_DIRS)} ({type(watcher).__name__}). Ctrl+C to stop.")
+    try:
+        while True:
+            changed = watcher.changes(timeout=3600)
+            if not changed:
+                continue
+            while True:
+                more = watcher.changes(timeout=DEBOUNCE)
+                if not more:
+                    break
+                changed |= more
+            if ROOT / "scripts" / "watch.py" in changed:
+                print("scripts/watch.py changed; restart watch mode to use it.")
+            steps = affected_steps(changed)
+            if not steps:
+                continue
+            names = ", ".join(sorted(p.relative_to(ROOT).as_posix() for p in changed)[:3])
+            more_note = f" and {len(changed) - 3} more" if len(changed) > 3 else ""
+            print(f"Changed: {names}{more_note} -> {', '.join(steps)}")
+            start = time.perf_counter()
+            if run_steps(steps, args.jobs):
+                reloader.bump()
+                print(f"Rebuilt in {time.perf_counter() - start:.2f}s; reloading open tabs.")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()